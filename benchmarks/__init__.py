@@ -0,0 +1 @@
+"""Benchmarks of flowslice on deterministically generated projects."""
@@ -0,0 +1,164 @@
+"""Deterministic generator of synthetic projects for the benchmarks.
+
+A generated project looks like this:
+
+    app/__init__.py     re-exports the entry function of the first
+                        `reexport_fanout` modules
+    app/mod_<k>.py      `functions` functions of `function_length` statements;
+                        each function calls the same function of the next
+                        module, forming call chains `call_depth` modules long
+    main.py             calls every re-exported entry function
+
+The same spec always produces the same files, so timings of different
+flowslice versions on the same spec can be compared.
+"""
+
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from flowslice.core.models import SliceCriterion, SliceDirection
+
+
+@dataclass(frozen=True)
+class ProjectSpec:
+    """Shape of a synthetic project."""
+
+    modules: int = 20  # Modules in the app package
+    functions: int = 5  # Functions per module
+    function_length: int = 20  # Statements per function body
+    call_depth: int = 3  # Modules per call chain (1: functions make no calls)
+    reexport_fanout: int = 5  # Modules whose entry function app/__init__.py re-exports
+    comprehension_density: float = 0.2  # Share of statements that are comprehensions
+    seed: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the spec as a JSON-serializable dict."""
+        return asdict(self)
+
+
+# Named sizes for the benchmark runner
+PRESETS = {
+    "small": ProjectSpec(modules=5, functions=3, function_length=10, reexport_fanout=3),
+    "medium": ProjectSpec(),
+    "large": ProjectSpec(modules=100, functions=10, function_length=40, reexport_fanout=20),
+}
+
+
+class GeneratedProject(NamedTuple):
+    """A generated project and the criteria to slice it with."""
+
+    root: Path
+    files: list[Path]
+    criteria: list[SliceCriterion]  # Criteria inside app modules (no cross-file calls needed)
+    entry_criteria: list[SliceCriterion]  # Criteria in main.py, which call into app
+
+
+def _function_body(
+    rng: random.Random, length: int, density: float, callee: str
+) -> tuple[list[str], list[tuple[int, str]]]:
+    """Generate the statements of a function taking `value`.
+
+    Returns:
+        The body lines (indented) and, per assignment, its line offset in
+        the body and the assigned variable
+    """
+    lines = []
+    assigned: list[tuple[int, str]] = []
+    names = ["value"]
+    for index in range(length):
+        target = f"v{index}"
+        left, right = rng.choice(names), rng.choice(names)
+        if rng.random() < density:
+            kind = rng.randrange(3)
+            if kind == 0:
+                expr = f"[item + {left} for item in range({right} % 7)]"
+            elif kind == 1:
+                expr = f"{{key: key * {left} for key in range({right} % 5)}}"
+            else:
+                expr = f"sum(item for item in range({left} % 9) if item > {right} % 3)"
+        elif index % 4 == 3:
+            lines.append(f"    for step in range({left} % 3):")
+            lines.append(f"        {left} = {left} + step")
+            expr = f"{left} * {rng.randint(2, 9)}"
+        else:
+            expr = f"{left} + {right} * {rng.randint(1, 9)}"
+        lines.append(f"    {target} = {expr}")
+        assigned.append((len(lines) - 1, target))
+        names.append(target)
+    result = names[-1]
+    if callee:
+        lines.append(f"    {result} = {callee}({result})")
+    lines.append(f"    return {result}")
+    return lines, assigned
+
+
+def generate_project(spec: ProjectSpec, root: Path) -> GeneratedProject:
+    """Write a synthetic project.
+
+    Args:
+        spec: Shape of the project
+        root: Directory to write it to (created if needed)
+
+    Returns:
+        The project's files and slicing criteria
+    """
+    rng = random.Random(spec.seed)
+    package = root / "app"
+    package.mkdir(parents=True, exist_ok=True)
+    files = []
+    criteria = []
+
+    for module in range(spec.modules):
+        next_module = module + 1
+        calls_next = next_module < spec.modules and next_module % max(spec.call_depth, 1) != 0
+        path = package / f"mod_{module}.py"
+        lines = ['"""Generated module."""', ""]
+        if calls_next:
+            imported = ", ".join(f"func_{next_module}_{f}" for f in range(spec.functions))
+            lines += [f"from app.mod_{next_module} import {imported}", ""]
+        for function in range(spec.functions):
+            callee = f"func_{next_module}_{function}" if calls_next else ""
+            body, assigned = _function_body(
+                rng, spec.function_length, spec.comprehension_density, callee
+            )
+            lines += ["", f"def func_{module}_{function}(value):"]
+            first_line = len(lines) + 1
+            lines += body
+            # A variable in the middle of the function: both slices are non-trivial
+            offset, variable = assigned[len(assigned) // 2]
+            for direction in (SliceDirection.BACKWARD, SliceDirection.FORWARD):
+                criteria.append(SliceCriterion(str(path), first_line + offset, variable, direction))
+            lines.append("")
+        path.write_text("\n".join(lines) + "\n")
+        files.append(path)
+
+    exported = list(range(min(spec.reexport_fanout, spec.modules)))
+    init_lines = ['"""Generated package."""', ""]
+    init_lines += [f"from app.mod_{module} import func_{module}_0" for module in exported]
+    init = package / "__init__.py"
+    init.write_text("\n".join(init_lines) + "\n")
+    files.append(init)
+
+    main_lines = ['"""Generated entry point."""', ""]
+    if exported:
+        names = ", ".join(f"func_{module}_0" for module in exported)
+        main_lines += [f"from app import {names}", ""]
+    main_lines += ["", "def main(data):", "    total = 0"]
+    for module in exported:
+        main_lines.append(f"    part_{module} = func_{module}_0(data)")
+        main_lines.append(f"    total = total + part_{module}")
+    main_lines += ["    return total", "", "", "result = main(1)", ""]
+    main = root / "main.py"
+    main.write_text("\n".join(main_lines))
+    files.append(main)
+
+    total_line = main_lines.index("    return total") + 1
+    data_line = main_lines.index("def main(data):") + 1
+    entry_criteria = [
+        SliceCriterion(str(main), total_line, "total", SliceDirection.BACKWARD),
+        SliceCriterion(str(main), data_line, "data", SliceDirection.FORWARD),
+        SliceCriterion(str(main), total_line, "total", SliceDirection.BOTH),
+    ]
+    return GeneratedProject(root, files, criteria, entry_criteria)
@@ -0,0 +1,249 @@
+"""Run the flowslice benchmarks and record the timings as JSON.
+
+Usage:
+    python -m benchmarks.run [--preset small|medium|large] [--repeat N]
+                             [--modules N] [--functions N] [--function-length N]
+                             [--call-depth N] [--reexport-fanout N]
+                             [--comprehension-density X] [--seed N]
+                             [--output results.json] [--compare baseline.json]
+                             [--threshold 1.25]
+
+Every benchmark is run `repeat` times on a freshly generated project.
+Slicing benchmarks create a new Slicer for every run, so parsing and
+indexing are included; "warm" variants reuse one slicer, whose caches
+are filled by an untimed first run.
+
+With --compare, the median of every benchmark is compared with the one
+recorded in an earlier results file, and the exit status is 1 if any
+benchmark got slower than --threshold times the baseline.
+"""
+
+import argparse
+import io
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Iterable
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import flowslice
+from benchmarks.generator import PRESETS, GeneratedProject, ProjectSpec, generate_project
+from flowslice.core.cache import ParseCache
+from flowslice.core.import_resolver import ImportResolver
+from flowslice.core.models import SliceCriterion, SliceDirection, SliceResult
+from flowslice.core.slicer import Slicer
+from flowslice.formatters.dot import DotFormatter
+from flowslice.formatters.graph import GraphFormatter
+from flowslice.formatters.json import JSONFormatter
+from flowslice.formatters.tree import TreeFormatter
+
+Benchmark = Callable[[], int]  # Runs once, returns the number of nodes or items produced
+
+
+def _slice_all(slicer: Slicer, criteria: Iterable[SliceCriterion]) -> int:
+    nodes = 0
+    for criterion in criteria:
+        result = slicer.slice(
+            criterion.file_path, criterion.line, criterion.variable, criterion.direction
+        )
+        nodes += len(result.backward_slice) + len(result.forward_slice)
+    return nodes
+
+
+def _with_direction(
+    criteria: list[SliceCriterion], direction: SliceDirection
+) -> list[SliceCriterion]:
+    return [replace(criterion, direction=direction) for criterion in criteria]
+
+
+def build_benchmarks(project: GeneratedProject) -> dict[str, Benchmark]:
+    """Get the benchmarks of a generated project, by name."""
+    root = str(project.root)
+    # Every other criterion is a forward one; keep one criterion per variable
+    local = project.criteria[::2]
+    benchmarks: dict[str, Benchmark] = {}
+
+    for direction in SliceDirection:
+        criteria = _with_direction(local, direction)
+        benchmarks[f"slice.{direction.value}"] = lambda criteria=criteria: _slice_all(
+            Slicer(root, enable_cross_file=False), criteria
+        )
+
+    warm = Slicer(root, enable_cross_file=False)
+    warm_criteria = _with_direction(local, SliceDirection.BOTH)
+    _slice_all(warm, warm_criteria)
+    benchmarks["slice.both.warm"] = lambda: _slice_all(warm, warm_criteria)
+
+    benchmarks["slice_many.both"] = lambda: sum(
+        len(result.backward_slice) + len(result.forward_slice)
+        for result in Slicer(root, enable_cross_file=False).slice_many(warm_criteria)
+    )
+
+    for criterion in project.entry_criteria:
+        name = f"cross_file.{criterion.direction.value}"
+        benchmarks[name] = lambda criterion=criterion: _slice_all(Slicer(root), [criterion])
+
+    def resolve_imports() -> int:
+        parse_cache = ParseCache()
+        resolver = ImportResolver(project.root, parse_cache)
+        return sum(len(resolver.get_imports(path)) for path in project.files)
+
+    benchmarks["resolve.imports"] = resolve_imports
+
+    results = list(Slicer(root).slice_many(project.entry_criteria))
+    results += list(Slicer(root, enable_cross_file=False).slice_many(warm_criteria[:20]))
+    formatters: dict[str, Callable[[SliceResult, SliceDirection], str]] = {
+        "tree": TreeFormatter().format,
+        "graph": GraphFormatter().format,
+        "json": JSONFormatter().format,
+        "dot": DotFormatter().format,
+    }
+    for name, format_result in formatters.items():
+        benchmarks[f"format.{name}"] = lambda format_result=format_result: sum(
+            len(format_result(result, SliceDirection.BOTH)) for result in results
+        )
+
+    def write_ndjson() -> int:
+        out = io.StringIO()
+        JSONFormatter.write_ndjson(results, out)
+        return len(out.getvalue())
+
+    benchmarks["format.ndjson"] = write_ndjson
+    return benchmarks
+
+
+def run_benchmarks(
+    spec: ProjectSpec, repeat: int = 5, only: Optional[list[str]] = None
+) -> dict[str, Any]:
+    """Generate a project and time every benchmark on it.
+
+    Args:
+        spec: Shape of the generated project
+        repeat: Timed runs per benchmark
+        only: Names of the benchmarks to run (default: all)
+
+    Returns:
+        The results, ready to be dumped as JSON
+    """
+    with tempfile.TemporaryDirectory(prefix="flowslice-bench-") as directory:
+        project = generate_project(spec, Path(directory))
+        benchmarks = build_benchmarks(project)
+        timings = {}
+        for name, benchmark in benchmarks.items():
+            if only and name not in only:
+                continue
+            times = []
+            items = 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                items = benchmark()
+                times.append(time.perf_counter() - start)
+            timings[name] = {
+                "min": min(times),
+                "median": statistics.median(times),
+                "mean": statistics.fmean(times),
+                "runs": repeat,
+                "items": items,
+            }
+        lines = sum(len(path.read_text().splitlines()) for path in project.files)
+
+    return {
+        "flowslice_version": flowslice.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "spec": spec.to_dict(),
+        "project": {"files": len(project.files), "lines": lines},
+        "benchmarks": timings,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> bool:
+    """Print the median of every benchmark against a baseline.
+
+    Returns:
+        Whether no benchmark is slower than threshold times its baseline
+    """
+    if results["spec"] != baseline["spec"]:
+        print("Warning: the baseline was run on a different project spec", file=sys.stderr)
+    ok = True
+    print(f"{'benchmark':<24} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name, timing in results["benchmarks"].items():
+        before = baseline["benchmarks"].get(name)
+        if before is None:
+            print(f"{name:<24} {'-':>10} {timing['median']:>10.4f} {'new':>7}")
+            continue
+        ratio = timing["median"] / before["median"] if before["median"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  SLOWER"
+            ok = False
+        print(
+            f"{name:<24} {before['median']:>10.4f} {timing['median']:>10.4f} {ratio:>6.2f}x{flag}"
+        )
+    return ok
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parse the runner's command line."""
+    parser = argparse.ArgumentParser(description="Run the flowslice benchmarks")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="medium")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark")
+    parser.add_argument("--modules", type=int)
+    parser.add_argument("--functions", type=int)
+    parser.add_argument("--function-length", type=int)
+    parser.add_argument("--call-depth", type=int)
+    parser.add_argument("--reexport-fanout", type=int)
+    parser.add_argument("--comprehension-density", type=float)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--only", action="append", help="run only this benchmark (repeatable)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare with the results in this JSON file")
+    parser.add_argument(
+        "--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmarks from the command line.
+
+    Returns:
+        Exit status: 1 if a comparison found a regression, else 0
+    """
+    args = parse_args(argv)
+    overrides = {
+        name: getattr(args, name)
+        for name in (
+            "modules",
+            "functions",
+            "function_length",
+            "call_depth",
+            "reexport_fanout",
+            "comprehension_density",
+            "seed",
+        )
+        if getattr(args, name) is not None
+    }
+    spec = replace(PRESETS[args.preset], **overrides)
+    results = run_benchmarks(spec, args.repeat, args.only)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    elif not args.compare:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        return 0 if compare(results, baseline, args.threshold) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Time the startup of the flowslice command line against a budget.
+
+Usage:
+    python -m benchmarks.startup [--repeat N] [--help-budget SECONDS]
+                                 [--slice-budget SECONDS] [--output results.json]
+
+Each command is run `repeat` times in a fresh interpreter. What is
+compared with the budget is the median overhead over starting a bare
+interpreter (`python -c pass`), so the budgets hold on slower machines
+too. The exit status is 1 if a command is over its budget.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import flowslice
+
+# Default budgets, in seconds over a bare interpreter's startup; about twice
+# what an idle machine takes, so that a busy one does not fail them
+HELP_BUDGET = 0.2
+SLICE_BUDGET = 0.5
+
+TRIVIAL_SOURCE = "x = 1\ny = x + 1\n"
+
+
+def _time_command(args: list[str], repeat: int, cwd: str, env: dict[str, str]) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            cwd=cwd,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summarize(times: list[float], baseline: float, budget: float) -> dict[str, Any]:
+    """Compare the median overhead of a command's runs with its budget.
+
+    Args:
+        times: Seconds each run took
+        baseline: Median seconds a bare interpreter takes to start
+        budget: Seconds the command may take over the baseline
+
+    Returns:
+        The command's timings; "ok" is False if it is over its budget
+    """
+    overhead = statistics.median(times) - baseline
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "overhead": overhead,
+        "budget": budget,
+        "runs": len(times),
+        "ok": overhead <= budget,
+    }
+
+
+def run_startup(
+    repeat: int = 10, help_budget: float = HELP_BUDGET, slice_budget: float = SLICE_BUDGET
+) -> dict[str, Any]:
+    """Time `flowslice --help` and a trivial slice.
+
+    Args:
+        repeat: Runs per command
+        help_budget: Seconds `--help` may take over a bare interpreter
+        slice_budget: Seconds a trivial slice may take over a bare interpreter
+
+    Returns:
+        The results, ready to be dumped as JSON; "ok" is False if a command
+        is over its budget
+    """
+    # The interpreters must import this flowslice, installed or not
+    env = dict(os.environ, FLOWSLICE_CACHE_DIR="")
+    package_root = str(Path(flowslice.__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, env.get("PYTHONPATH")]))
+
+    with tempfile.TemporaryDirectory(prefix="flowslice-startup-") as directory:
+        Path(directory, "trivial.py").write_text(TRIVIAL_SOURCE)
+        commands = {
+            "help": (["-m", "flowslice.cli.main", "--help"], help_budget),
+            "slice": (["-m", "flowslice.cli.main", "trivial.py:2:y", "backward"], slice_budget),
+        }
+        baseline = statistics.median(_time_command(["-c", "pass"], repeat, directory, env))
+        timings = {
+            name: summarize(_time_command(args, repeat, directory, env), baseline, budget)
+            for name, (args, budget) in commands.items()
+        }
+
+    return {
+        "flowslice_version": flowslice.__version__,
+        "python": sys.version.split()[0],
+        "interpreter": baseline,
+        "commands": timings,
+        "ok": all(timing["ok"] for timing in timings.values()),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Time the command line's startup.
+
+    Returns:
+        Exit status: 1 if a command is over its budget, else 0
+    """
+    parser = argparse.ArgumentParser(description="Time the startup of the flowslice CLI")
+    parser.add_argument("--repeat", type=int, default=10, help="runs per command")
+    parser.add_argument("--help-budget", type=float, default=HELP_BUDGET)
+    parser.add_argument("--slice-budget", type=float, default=SLICE_BUDGET)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_startup(args.repeat, args.help_budget, args.slice_budget)
+    print(f"{'command':<8} {'median':>8} {'overhead':>9} {'budget':>8}")
+    for name, timing in results["commands"].items():
+        flag = "" if timing["ok"] else "  OVER BUDGET"
+        print(
+            f"{name:<8} {timing['median']:>8.4f} {timing['overhead']:>9.4f}"
+            f" {timing['budget']:>8.4f}{flag}"
+        )
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    return 0 if results["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,18 +5,57 @@ Trace where your variables come from and where they go.
 
 __version__ = "1.0.0"
 
-from flowslice.core.models import SliceDirection, SliceResult
-from flowslice.core.slicer import Slicer
-from flowslice.formatters.graph import GraphFormatter
-from flowslice.formatters.json import JSONFormatter
-from flowslice.formatters.tree import TreeFormatter
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from flowslice.core.models import (
+        ExpansionLimits,
+        SliceCriterion,
+        SliceDirection,
+        SliceResult,
+        SliceStats,
+    )
+    from flowslice.core.slicer import Slicer
+    from flowslice.formatters.graph import GraphFormatter
+    from flowslice.formatters.json import JSONFormatter
+    from flowslice.formatters.tree import TreeFormatter
+
+# Exported name -> module defining it. They are imported on first use, so
+# that the command line only pays for the modules it needs.
+_EXPORTS = {
+    "Slicer": "flowslice.core.slicer",
+    "ExpansionLimits": "flowslice.core.models",
+    "SliceCriterion": "flowslice.core.models",
+    "SliceDirection": "flowslice.core.models",
+    "SliceResult": "flowslice.core.models",
+    "SliceStats": "flowslice.core.models",
+    "TreeFormatter": "flowslice.formatters.tree",
+    "JSONFormatter": "flowslice.formatters.json",
+    "GraphFormatter": "flowslice.formatters.graph",
+}
 
 __all__ = [
     "Slicer",
+    "ExpansionLimits",
+    "SliceCriterion",
     "SliceDirection",
     "SliceResult",
+    "SliceStats",
     "TreeFormatter",
     "JSONFormatter",
     "GraphFormatter",
     "__version__",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value  # Later lookups do not go through __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
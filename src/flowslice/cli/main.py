@@ -1,27 +1,186 @@
-"""Command-line interface for flowslice."""
+"""Command-line interface for flowslice.
 
+Git hooks and editors run flowslice many times in a row, so startup time
+matters: the slicer, the server and process pool machinery and the
+formatters are only imported once a command needs them.
+"""
+
+import argparse
+import os
 import sys
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Union
+from typing import TYPE_CHECKING, NoReturn, Optional, TextIO
+
+from flowslice.cli.output import FORMATS, format_stats, record_results, write_results
+from flowslice.core.models import SliceCriterion, SliceDirection, SliceResult
+
+if TYPE_CHECKING:
+    from flowslice.core.slicer import Slicer
 
-from flowslice.core.models import SliceDirection
-from flowslice.core.slicer import Slicer
-from flowslice.formatters.dot import DotFormatter
-from flowslice.formatters.graph import GraphFormatter
-from flowslice.formatters.json import JSONFormatter
-from flowslice.formatters.tree import TreeFormatter
 
+class _ArgumentParser(argparse.ArgumentParser):
+    """Argument parser reporting errors like the rest of the CLI."""
 
-def main() -> None:
-    """CLI entry point for flowslice."""
-    if len(sys.argv) < 2:
-        print_usage()
+    def error(self, message: str) -> NoReturn:
+        print(f"Error: {message}")
+        print("Run 'flowslice --help' for usage")
         sys.exit(1)
 
-    # Parse input
-    criterion = sys.argv[1]
-    direction_str = sys.argv[2] if len(sys.argv) > 2 else "both"
-    format_str = sys.argv[3] if len(sys.argv) > 3 else "tree"
+
+USAGE = """\
+flowslice [options] <file>:<line>:<variable>... [direction] [format]
+       flowslice [options] --criteria-file <file> [direction] [format]
+       flowslice serve [--socket <path>]"""
+
+EPILOG = """\
+formats:
+  tree        Classic tree view (default)
+  graph       Grouped DAG view showing convergence/divergence
+  json        Machine-readable JSON output
+  ndjson      One JSON record per line: target, nodes, statistics
+  dot         Graphviz DOT graph (pipe to `dot -Tpng > slice.png`)
+
+environment:
+  FLOWSLICE_CACHE_DIR    Analysis cache directory (default:
+                         $XDG_CACHE_HOME/flowslice or ~/.cache/flowslice,
+                         empty to disable)
+  FLOWSLICE_SEARCH_PATH  More directories of installed packages to follow
+                         imports into (separated like PATH)
+  FLOWSLICE_SOCKET       Server socket (default: flowslice.sock in
+                         $XDG_RUNTIME_DIR, else in the temp directory)
+
+examples:
+  flowslice main.py:1251:skipped both
+  flowslice main.py:1251:skipped backward graph
+  flowslice example.py:26:result forward json
+  flowslice --criteria-file criteria.txt backward json
+  flowslice --criteria-file - --jobs 8 < criteria.txt
+  flowslice a.py:3:x b.py:9:y backward json -o slices.json
+  flowslice main.py:1251:skipped - -f ndjson < more_criteria.txt
+  flowslice --connect main.py:1251:skipped backward
+  flowslice --stats main.py:1251:skipped backward
+"""
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser, which also generates the --help text."""
+    parser = _ArgumentParser(
+        prog="flowslice",
+        usage=USAGE,
+        description="flowslice - Dataflow Slicing for Python",
+        epilog=EPILOG,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "arguments",
+        nargs="*",
+        metavar="argument",
+        help="criteria <file>:<line>:<variable> (- reads more from stdin), then the"
+        " direction: backward, forward or both (default: both), then the format"
+        " (default: tree); or 'serve' to start a server",
+    )
+    parser.add_argument(
+        "-d",
+        "--direction",
+        metavar="<dir>",
+        help="slicing direction, instead of the positional one",
+    )
+    parser.add_argument(
+        "-f", "--format", metavar="<format>", help="output format, instead of the positional one"
+    )
+    parser.add_argument(
+        "-o", "--output", metavar="<file>", help="write the results to <file> instead of stdout"
+    )
+
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument(
+        "--criteria-file",
+        action="append",
+        default=[],
+        metavar="<file>",
+        help="slice every <file>:<line>:<variable> listed in <file> (one per line,"
+        " - for stdin; repeatable)",
+    )
+    batch.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="slice in N worker processes (0: one per CPU)",
+    )
+
+    server = parser.add_argument_group("server mode")
+    server.add_argument(
+        "--connect",
+        action="store_true",
+        help="send the slice to a server started with 'flowslice serve' (slices locally"
+        " if no server is running)",
+    )
+    server.add_argument(
+        "--socket", metavar="<path>", help="server socket (default: $FLOWSLICE_SOCKET)"
+    )
+
+    parser.add_argument_group("installed packages").add_argument(
+        "--site-packages",
+        action="store_true",
+        help="follow imports into this interpreter's site-packages",
+    )
+    parser.add_argument_group("diagnostics").add_argument(
+        "--stats",
+        action="store_true",
+        help="print per-phase timings and counters of every slice to stderr",
+    )
+    return parser
+
+
+def split_arguments(arguments: list[str], has_criteria_file: bool) -> tuple[list[str], list[str]]:
+    """Split positional arguments into criteria and the trailing direction and format.
+
+    Criteria come first and contain a colon. The first argument is always
+    a criterion unless criteria are read from a file, so that a malformed
+    criterion is reported as such.
+
+    Args:
+        arguments: The positional arguments.
+        has_criteria_file: Whether --criteria-file is given.
+
+    Returns:
+        The criteria texts ("-" reads criteria from stdin) and the rest.
+    """
+    count = 0
+    for argument in arguments:
+        if argument != "-" and ":" not in argument and (count or has_criteria_file):
+            break
+        count += 1
+    return arguments[:count], arguments[count:]
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """CLI entry point for flowslice.
+
+    Args:
+        argv: The command-line arguments (default: sys.argv[1:]).
+    """
+    parser = build_parser()
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+    if args.arguments[:1] == ["serve"]:
+        run_server(args.socket)
+        return
+    if args.jobs < 0:
+        parser.error("argument -j/--jobs: must be a number of processes (0 for one per CPU)")
+
+    texts, words = split_arguments(args.arguments, bool(args.criteria_file))
+    if not texts and not args.criteria_file:
+        parser.print_help()
+        sys.exit(1)
+    if len(words) > 2:
+        print(f"Error: Unexpected argument '{words[2]}'")
+        print("Criteria come first, then the direction and the format")
+        sys.exit(1)
+    direction_str = args.direction or (words[0] if words else "both")
+    format_str = args.format or (words[1] if len(words) > 1 else "tree")
 
     # Parse direction
     try:
@@ -33,64 +192,259 @@ def main() -> None:
 
     # Parse format
     format_str = format_str.lower()
-    if format_str not in ("tree", "graph", "json", "dot"):
+    if format_str not in FORMATS:
         print(f"Error: Invalid format '{format_str}'")
-        print("Valid formats: tree, graph, json, dot")
+        print("Valid formats: tree, graph, json, ndjson, dot")
         sys.exit(1)
 
-    # Parse criterion (file:line:variable)
+    # Criteria given as arguments, then those of each criteria file (- for stdin)
+    criteria = []
+    for text in texts:
+        if text == "-":
+            criteria += read_criteria("-", direction)
+            continue
+        try:
+            criteria.append(SliceCriterion.parse(text, direction))
+        except ValueError:
+            print(f"Error: Invalid format '{text}'. Use <file>:<line>:<variable>")
+            print("Example: main.py:42:result")
+            sys.exit(1)
+    for criteria_file in args.criteria_file:
+        criteria += read_criteria(criteria_file, direction)
+
+    # Check files exist
+    for file_path in sorted({criterion.file_path for criterion in criteria}):
+        if not Path(file_path).exists():
+            print(f"Error: File '{file_path}' not found")
+            sys.exit(1)
+
+    # Several results are printed one per line (JSON) or separated by blank lines
+    batch = bool(args.criteria_file) or len(texts) > 1 or "-" in texts
+    search_paths = get_search_paths(args.site_packages)
+    if args.output is None:
+        write_slices(sys.stdout, criteria, direction, format_str, batch, search_paths, args)
+        return
+
     try:
-        file_path, line_str, variable = criterion.split(":")
-        line = int(line_str)
-    except ValueError:
-        print("Error: Invalid format. Use <file>:<line>:<variable>")
-        print("Example: main.py:42:result")
+        out = open(args.output, "w", encoding="utf-8")
+    except OSError as e:
+        print(f"Error: Cannot write output file '{args.output}': {e.strerror}")
         sys.exit(1)
+    with out:
+        if format_str in ("tree", "graph"):
+            from flowslice.formatters.colors import Colors
+
+            Colors.disable()  # No escape codes in files, even if stdout is a terminal
+        write_slices(out, criteria, direction, format_str, batch, search_paths, args)
+
+
+def write_slices(
+    out: TextIO,
+    criteria: list[SliceCriterion],
+    direction: SliceDirection,
+    format_str: str,
+    batch: bool,
+    search_paths: list[str],
+    args: argparse.Namespace,
+) -> None:
+    """Slice the criteria and write the results as they are computed.
+
+    With --connect the criteria are sliced by the server if one is running.
+
+    Args:
+        out: File object to write the results to.
+        criteria: The criteria to slice.
+        direction: Direction of slicing.
+        format_str: Output format name.
+        batch: Whether several results may be written.
+        search_paths: Directories of installed packages to follow imports into.
+        args: The parsed command line, for --connect, --socket, --jobs and --stats.
+    """
+    if args.connect and run_client(
+        args.socket, criteria, direction, format_str, batch, search_paths, args.stats, out
+    ):
+        return
+
+    slicer = create_slicer(search_paths)
+    slicer.collect_stats = args.stats
+    if len(criteria) > 1:
+        from flowslice.core.parallel import slice_parallel
+
+        results: Iterator[SliceResult] = slice_parallel(slicer, criteria, args.jobs)
+    else:
+        results = slicer.slice_many(criteria)
+
+    sliced: list[SliceResult] = []
+    if args.stats:
+        results = record_results(results, sliced)
+    write_results(results, direction, format_str, batch, out)
 
-    # Check file exists
-    if not Path(file_path).exists():
-        print(f"Error: File '{file_path}' not found")
+    # Stats go to stderr, so they never mix with machine-readable output
+    for result in sliced:
+        print(format_stats(result), file=sys.stderr)
+
+
+def read_criteria(criteria_file: str, direction: SliceDirection) -> list[SliceCriterion]:
+    """Read criteria listed in a file, one <file>:<line>:<variable> per line.
+
+    Blank lines and lines starting with # are ignored.
+
+    Args:
+        criteria_file: Path to the criteria file, or "-" to read from stdin.
+        direction: Direction of slicing for every criterion.
+
+    Returns:
+        The criteria, in file order.
+    """
+    try:
+        if criteria_file == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(criteria_file) as f:
+                lines = f.read().splitlines()
+    except OSError as e:
+        print(f"Error: Cannot read criteria file '{criteria_file}': {e.strerror}")
+        sys.exit(1)
+
+    criteria = []
+    for line_number, text in enumerate(lines, start=1):
+        if not text.strip() or text.lstrip().startswith("#"):
+            continue
+        try:
+            criteria.append(SliceCriterion.parse(text, direction))
+        except ValueError:
+            print(f"Error: Invalid criterion on line {line_number}: '{text.strip()}'")
+            print("Use <file>:<line>:<variable>, e.g. main.py:42:result")
+            sys.exit(1)
+    return criteria
+
+
+def create_slicer(search_paths: Optional[list[str]] = None) -> "Slicer":
+    """Create a slicer using the on-disk cache configured by the environment."""
+    from flowslice.core.slicer import Slicer
+
+    return Slicer(cache_dir=get_cache_dir(), search_paths=search_paths)
+
+
+def default_cache_dir() -> str:
+    """Get the per-user cache directory: $XDG_CACHE_HOME/flowslice or ~/.cache/flowslice."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "flowslice")
+
+
+def get_cache_dir() -> Optional[str]:
+    """Get the on-disk cache directory configured by the environment.
+
+    Returns:
+        FLOWSLICE_CACHE_DIR if set, None if it is set but empty (the cache
+        is disabled), else the per-user cache directory
+    """
+    cache_dir = os.environ.get("FLOWSLICE_CACHE_DIR")
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    return os.path.abspath(cache_dir) if cache_dir else None
+
+
+def get_search_paths(site_packages: bool) -> list[str]:
+    """Get the directories of installed packages that imports are followed into.
+
+    Args:
+        site_packages: Whether to add the site-packages of the running interpreter.
+
+    Returns:
+        The directories listed in FLOWSLICE_SEARCH_PATH, then site-packages if requested.
+    """
+    search_paths = [
+        os.path.abspath(path)
+        for path in os.environ.get("FLOWSLICE_SEARCH_PATH", "").split(os.pathsep)
+        if path
+    ]
+    if site_packages:
+        import sysconfig
+
+        paths = sysconfig.get_paths()
+        for name in ("purelib", "platlib"):
+            if paths[name] not in search_paths:
+                search_paths.append(paths[name])
+    return search_paths
+
+
+def run_server(socket_path: Optional[str] = None) -> None:
+    """Run the slicing server in the foreground until it is shut down.
+
+    Args:
+        socket_path: Path of the socket to listen on (default: see default_socket_path()).
+    """
+    from flowslice.cli.server import default_socket_path, serve
+
+    socket_path = socket_path or default_socket_path()
+    print(f"flowslice server listening on {socket_path}", flush=True)
+    try:
+        serve(socket_path, get_cache_dir())
+    except OSError as e:
+        print(f"Error: {e}")
         sys.exit(1)
+    except KeyboardInterrupt:
+        pass
 
-    # Perform slicing
-    slicer = Slicer()
-    result = slicer.slice(file_path, line, variable, direction)
-
-    # Select formatter
-    formatter: Union[GraphFormatter, JSONFormatter, DotFormatter, TreeFormatter]
-    if format_str == "graph":
-        formatter = GraphFormatter()
-    elif format_str == "json":
-        formatter = JSONFormatter()
-    elif format_str == "dot":
-        formatter = DotFormatter()
-    else:  # tree (default)
-        formatter = TreeFormatter()
-
-    # Format and print result
-    output = formatter.format(result, direction)
-    print(output)
-
-
-def print_usage() -> None:
-    """Print usage information."""
-    print("flowslice - Dataflow Slicing for Python")
-    print("\nUsage:")
-    print("  flowslice <file>:<line>:<variable> [direction] [format]")
-    print("\nArguments:")
-    print("  file        Path to Python file to analyze")
-    print("  line        Line number where variable appears")
-    print("  variable    Name of variable to trace")
-    print("  direction   Slicing direction: backward, forward, or both (default: both)")
-    print("  format      Output format: tree, graph, or json (default: tree)")
-    print("\nFormats:")
-    print("  tree        Classic tree view (default)")
-    print("  graph       Grouped DAG view showing convergence/divergence")
-    print("  json        Machine-readable JSON output")
-    print("\nExamples:")
-    print("  flowslice main.py:1251:skipped both")
-    print("  flowslice main.py:1251:skipped backward graph")
-    print("  flowslice example.py:26:result forward json")
+
+def run_client(
+    socket_path: Optional[str],
+    criteria: list[SliceCriterion],
+    direction: SliceDirection,
+    format_str: str,
+    batch: bool,
+    search_paths: Optional[list[str]] = None,
+    stats: bool = False,
+    out: Optional[TextIO] = None,
+) -> bool:
+    """Forward a slice to a running server and print its output.
+
+    Args:
+        socket_path: Path of the server's socket (default: see default_socket_path()).
+        criteria: The criteria to slice.
+        direction: Direction of slicing.
+        format_str: Output format name.
+        batch: Whether the criteria come from a criteria file.
+        search_paths: Directories of installed packages to follow imports into.
+        stats: Whether to print the timings and counters of every slice to stderr.
+        out: File object to write the output to (default: stdout).
+
+    Returns:
+        False if no server could be reached, so the caller should slice locally.
+        Errors of a reached server are printed and exit.
+    """
+    from flowslice.cli.server import ServerUnavailableError, default_socket_path, send_request
+
+    socket_path = socket_path or default_socket_path()
+    request = {
+        "command": "slice",
+        "root": os.getcwd(),
+        "direction": direction.value,
+        "format": format_str,
+        "batch": batch,
+        "search_paths": search_paths or [],
+        "stats": stats,
+        "criteria": [
+            {"file": c.file_path, "line": c.line, "variable": c.variable} for c in criteria
+        ],
+    }
+    try:
+        response = send_request(socket_path, request)
+    except ServerUnavailableError:
+        print(f"Warning: No flowslice server at {socket_path}, slicing locally", file=sys.stderr)
+        return False
+    except (OSError, ValueError) as e:
+        print(f"Error: flowslice server at {socket_path} failed: {e}")
+        sys.exit(1)
+
+    if not response.get("ok"):
+        print(f"Error: {response.get('error')}")
+        sys.exit(1)
+    print(response["output"], file=out or sys.stdout)
+    if "stats" in response:
+        print(response["stats"], file=sys.stderr)
+    return True
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+"""Formatting of slice results for the command line and the server.
+
+Only the formatter of the chosen format is imported.
+"""
+
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, TextIO, Union
+
+from flowslice.core.models import SliceDirection, SliceResult
+
+if TYPE_CHECKING:
+    from flowslice.formatters.dot import DotFormatter
+    from flowslice.formatters.graph import GraphFormatter
+    from flowslice.formatters.json import JSONFormatter
+    from flowslice.formatters.tree import TreeFormatter
+
+FORMATS = ("tree", "graph", "json", "ndjson", "dot")
+
+Formatter = Union["GraphFormatter", "JSONFormatter", "DotFormatter", "TreeFormatter"]
+
+
+def get_formatter(format_str: str) -> Formatter:
+    """Get the formatter for a validated format name, importing only its module."""
+    if format_str == "graph":
+        from flowslice.formatters.graph import GraphFormatter
+
+        return GraphFormatter()
+    elif format_str in ("json", "ndjson"):
+        from flowslice.formatters.json import JSONFormatter
+
+        return JSONFormatter()
+    elif format_str == "dot":
+        from flowslice.formatters.dot import DotFormatter
+
+        return DotFormatter()
+    from flowslice.formatters.tree import TreeFormatter
+
+    return TreeFormatter()  # tree (default)
+
+
+def format_results(
+    results: Iterable[SliceResult], direction: SliceDirection, format_str: str, batch: bool
+) -> Iterator[str]:
+    """Format results one by one, ready to be printed.
+
+    In batch mode JSON results are printed one per line and other formats
+    are separated by blank lines.
+
+    Args:
+        results: The results to format.
+        direction: Which direction(s) to display.
+        format_str: Output format name.
+        batch: Whether the results come from a criteria file.
+
+    Yields:
+        The text to print for each result.
+    """
+    if format_str in ("json", "ndjson"):
+        from flowslice.formatters.json import JSONFormatter
+
+        json_formatter = JSONFormatter()
+        for result in results:
+            yield json_formatter.format(result, direction, indent=None if batch else 2)
+        return
+    formatter = get_formatter(format_str)
+    for index, result in enumerate(results):
+        if index:
+            yield "\n" + formatter.format(result, direction)
+        else:
+            yield formatter.format(result, direction)
+
+
+def write_results(
+    results: Iterable[SliceResult],
+    direction: SliceDirection,
+    format_str: str,
+    batch: bool,
+    out: TextIO,
+) -> None:
+    """Write results to a file object as they are computed.
+
+    JSON and NDJSON are written node by node rather than formatted into a
+    string first, and every result is flushed before the next is computed.
+
+    Args:
+        results: The results to write.
+        direction: Which direction(s) to display.
+        format_str: Output format name.
+        batch: Whether the results come from a criteria file.
+        out: File object to write to.
+    """
+    if format_str in ("json", "ndjson"):
+        from flowslice.formatters.json import JSONFormatter
+
+        if format_str == "ndjson":
+            JSONFormatter.write_ndjson(results, out, direction)
+            return
+        for result in results:
+            JSONFormatter.write(result, out, direction, indent=None if batch else 2)
+            out.write("\n")
+            out.flush()
+        return
+    for output in format_results(results, direction, format_str, batch):
+        out.write(output + "\n")
+        out.flush()
+
+
+def record_results(
+    results: Iterable[SliceResult], recorded: list[SliceResult]
+) -> Iterator[SliceResult]:
+    """Pass results through as they are computed, appending each to a list."""
+    for result in results:
+        recorded.append(result)
+        yield result
+
+
+def format_stats(result: SliceResult) -> str:
+    """Format the timings and counters of a result collected with collect_stats.
+
+    Args:
+        result: The result.
+
+    Returns:
+        One line per phase (in milliseconds) and per counter, under the criterion.
+    """
+    lines = [f"Stats for {result.target_file}:{result.target_line}:{result.target_variable}"]
+    stats = result.stats
+    if stats is None:
+        return "\n".join([*lines, "  (not collected)"])
+    for phase, seconds in stats.timings.items():
+        lines.append(f"  {phase + ' (ms)':<24} {seconds * 1000:>10.2f}")
+    for counter, value in stats.counters.items():
+        lines.append(f"  {counter:<24} {value:>10}")
+    return "\n".join(lines)
@@ -0,0 +1,237 @@
+"""Resident slicing server with a warm cache, and the client that talks to it.
+
+The server listens on a Unix socket. Each connection carries one request,
+a JSON object on a single line, and gets one JSON response line back:
+
+    {"command": "slice", "root": "/project", "direction": "both", "format": "tree",
+     "batch": false, "search_paths": [], "stats": false,
+     "criteria": [{"file": "main.py", "line": 42, "variable": "x"}]}
+    -> {"ok": true, "output": "..."}
+
+With "stats": true, the response also carries the formatted timings and
+counters of every slice in "stats".
+
+Other commands are "stats" (cache counters) and "shutdown". Failed requests,
+including those the slicer fails on unexpectedly, get
+{"ok": false, "error": "..."}. Parsed modules, symbol tables, import
+maps and def-use indexes stay in memory between requests and are
+invalidated by mtime, like in a single run.
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from flowslice.cli.output import FORMATS, format_stats, record_results, write_results
+from flowslice.core.cache import ParseCache
+from flowslice.core.disk_cache import DiskCache
+from flowslice.core.models import SliceCriterion, SliceDirection, SliceResult
+from flowslice.core.slicer import Slicer
+
+
+def default_socket_path() -> str:
+    """Get the socket path from FLOWSLICE_SOCKET, or a per-user default.
+
+    The default is in $XDG_RUNTIME_DIR, which only its user can access, and
+    falls back to a per-user name in the temporary directory.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        default = os.path.join(runtime_dir, "flowslice.sock")
+    else:
+        default = os.path.join(tempfile.gettempdir(), f"flowslice-{os.getuid()}.sock")
+    return os.environ.get("FLOWSLICE_SOCKET", default)
+
+
+class ServerUnavailableError(ConnectionError):
+    """No server could be connected to on a socket."""
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answer one JSON request line per connection."""
+
+    server: "SliceServer"
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            response = self.server.dispatch(request)
+        except (KeyError, TypeError, ValueError) as e:
+            response = {"ok": False, "error": f"Invalid request: {e}"}
+        except Exception as e:  # Anything else the slicer raised; still answer the client
+            response = {"ok": False, "error": f"Internal error: {type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class SliceServer(socketserver.UnixStreamServer):
+    """Serve slice requests from one process, keeping all caches warm.
+
+    Requests are handled one at a time. One slicer is kept per project root
+    and list of search paths; all of them share a single parse cache.
+    """
+
+    def __init__(self, socket_path: str, cache_dir: Optional[str] = None):
+        """Bind the server to a Unix socket.
+
+        Args:
+            socket_path: Path of the socket to listen on.
+            cache_dir: Directory of the persistent on-disk cache (disabled if omitted).
+        """
+        disk_cache = DiskCache(cache_dir) if cache_dir else None
+        self.parse_cache = ParseCache(disk_cache=disk_cache)
+        self.slicers: dict[tuple[str, tuple[str, ...]], Slicer] = {}
+        self.running = True
+        # Only the user may connect; the socket is created with these permissions by bind()
+        umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+    def serve_until_shutdown(self) -> None:
+        """Handle requests until a shutdown request arrives."""
+        while self.running:
+            self.handle_request()
+
+    def dispatch(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Answer a request.
+
+        Args:
+            request: The decoded request.
+
+        Returns:
+            The response to send back.
+        """
+        command = request.get("command", "slice")
+        if command == "slice":
+            try:
+                results: list[SliceResult] = []
+                response = {"ok": True, "output": self.handle_slice(request, results)}
+                if request.get("stats"):
+                    response["stats"] = "\n".join(format_stats(result) for result in results)
+                return response
+            except (OSError, SyntaxError) as e:
+                return {"ok": False, "error": str(e)}
+        elif command == "stats":
+            return {"ok": True, "cache": self.parse_cache.cache_info()._asdict()}
+        elif command == "shutdown":
+            self.running = False
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown command '{command}'"}
+
+    def handle_slice(
+        self, request: dict[str, Any], results: Optional[list[SliceResult]] = None
+    ) -> str:
+        """Slice the criteria of a request and format the results.
+
+        Args:
+            request: The decoded slice request.
+            results: List to append the results to, e.g. to report their stats.
+
+        Returns:
+            The formatted output, as the CLI would print it.
+
+        Raises:
+            KeyError, TypeError, ValueError: If the request is malformed.
+            OSError, SyntaxError: If a file cannot be read or parsed.
+        """
+        direction = SliceDirection(request.get("direction", "both"))
+        format_str = request.get("format", "tree")
+        if format_str not in FORMATS:
+            raise ValueError(f"Invalid format '{format_str}'")
+        criteria = [
+            SliceCriterion(item["file"], int(item["line"]), item["variable"], direction)
+            for item in request["criteria"]
+        ]
+
+        search_paths = [str(path) for path in request.get("search_paths", [])]
+        slicer = self.slicer_for(request.get("root", "."), search_paths)
+        batch = bool(request.get("batch", False))
+        out = io.StringIO()
+        # Slicers are shared between requests, so stats are only switched on for this one
+        slicer.collect_stats = bool(request.get("stats", False))
+        try:
+            sliced = slicer.slice_many(criteria)
+            if results is not None:
+                sliced = record_results(sliced, results)
+            write_results(sliced, direction, format_str, batch, out)
+        finally:
+            slicer.collect_stats = False
+        return out.getvalue().removesuffix("\n")  # The client prints it with a newline
+
+    def slicer_for(self, root: str, search_paths: Optional[list[str]] = None) -> Slicer:
+        """Get the slicer for a project root, sharing the server's parse cache."""
+        key = (root, tuple(search_paths or []))
+        if key not in self.slicers:
+            self.slicers[key] = Slicer(
+                root, parse_cache=self.parse_cache, search_paths=search_paths
+            )
+        return self.slicers[key]
+
+
+def serve(socket_path: str, cache_dir: Optional[str] = None) -> None:
+    """Run a server until it is asked to shut down.
+
+    A stale socket file left behind by a server that is no longer running is
+    replaced.
+
+    Args:
+        socket_path: Path of the socket to listen on.
+        cache_dir: Directory of the persistent on-disk cache (disabled if omitted).
+
+    Raises:
+        OSError: If another server is already listening on the socket.
+    """
+    if Path(socket_path).exists():
+        try:
+            send_request(socket_path, {"command": "stats"}, timeout=1.0)
+        except OSError:
+            os.unlink(socket_path)
+        else:
+            raise OSError(f"A flowslice server is already listening on {socket_path}")
+
+    with SliceServer(socket_path, cache_dir) as server:
+        try:
+            server.serve_until_shutdown()
+        finally:
+            os.unlink(socket_path)
+
+
+def send_request(
+    socket_path: str, request: dict[str, Any], timeout: Optional[float] = None
+) -> dict[str, Any]:
+    """Send one request to a server and wait for its response.
+
+    Args:
+        socket_path: Path of the server's socket.
+        request: The request to send.
+        timeout: Seconds to wait for the server (default: no limit).
+
+    Returns:
+        The decoded response.
+
+    Raises:
+        ServerUnavailableError: If no server is listening on the socket.
+        OSError: If the connection fails once established.
+        ValueError: If the response is not valid JSON.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        try:
+            client.connect(socket_path)
+        except OSError as e:
+            raise ServerUnavailableError(f"No flowslice server at {socket_path}: {e}") from e
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("Server closed the connection without a response")
+    response: dict[str, Any] = json.loads(line)
+    return response
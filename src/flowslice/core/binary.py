@@ -0,0 +1,357 @@
+"""Compact binary file format for slice results, read through mmap.
+
+A file holds any number of slice results:
+
+- a header (HEADER) with the counts and the offset of each section;
+- a slice table (SLICE), one entry per result: its target, its nodes and
+  its worklist iterations;
+- a record table (RECORD), one fixed-width entry per node, with its file,
+  function, variable, operation, code and context as string ids;
+- the dependency ids of all nodes;
+- a string table: offsets into a block of UTF-8 data, sorted by their
+  bytes so that a string's id can be found by binary search.
+
+All integers are little-endian. The reader maps the file and decodes only
+what it is asked for: filtering nodes by file or function compares ids and
+builds only the matching nodes.
+"""
+
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple, Optional, Union
+
+from flowslice.core.columnar import BACKWARD, FORWARD, StringTable
+from flowslice.core.models import SliceNode, SliceResult
+
+MAGIC = b"FLSL"
+VERSION = 2
+
+# magic, version, record size, node, slice, dependency and string counts,
+# then the offsets of the slice table, record table, dependency ids,
+# string offsets and string data
+HEADER = struct.Struct("<4sHHIIIIQQQQQ")
+# target file, target line, target variable, first node, node count, iterations
+SLICE = struct.Struct("<iiiiii")
+# slice, direction, file, line, function, variable, operation, code,
+# context (-1 if none), first dependency, dependency count
+RECORD = struct.Struct("<ib3xiiiiiiiii")
+_ID = struct.Struct("<i")
+_OFFSET = struct.Struct("<Q")  # String data may exceed 4 GiB like any section
+
+NO_STRING = -1
+
+
+class Record(NamedTuple):
+    """A node as stored in the record table."""
+
+    slice: int
+    direction: int  # BACKWARD or FORWARD
+    file: int
+    line: int
+    function: int
+    variable: int
+    operation: int
+    code: int
+    context: int  # NO_STRING if the node has no context
+    first_dependency: int
+    dependency_count: int
+
+
+class BinaryFormatError(ValueError):
+    """Raised when a file is not a slice result file of a supported version."""
+
+
+def write_results(results: Iterable[SliceResult], path: Union[str, Path]) -> int:
+    """Write slice results to a binary result file.
+
+    Args:
+        results: The results to write; they are only iterated once
+        path: Path of the file to write (replaced if it exists)
+
+    Returns:
+        Number of results written
+    """
+    strings = StringTable()
+    add_string = strings.add
+    slices: list[tuple[int, int, int, int, int, int]] = []
+    records: list[Record] = []
+    dependencies: list[int] = []
+    for index, result in enumerate(results):
+        first = len(records)
+        for direction, nodes in (
+            (BACKWARD, result.backward_slice),
+            (FORWARD, result.forward_slice),
+        ):
+            for node in nodes:
+                records.append(
+                    Record(
+                        index,
+                        direction,
+                        add_string(node.file),
+                        node.line,
+                        add_string(node.function),
+                        add_string(node.variable),
+                        add_string(node.operation),
+                        add_string(node.code),
+                        add_string(node.context) if node.context is not None else NO_STRING,
+                        len(dependencies),
+                        len(node.dependencies),
+                    )
+                )
+                dependencies.extend(add_string(name) for name in node.dependencies)
+        slices.append(
+            (
+                add_string(result.target_file),
+                result.target_line,
+                add_string(result.target_variable),
+                first,
+                len(records) - first,
+                result.iterations,
+            )
+        )
+
+    # Ids are assigned in sorted order, so the reader can look strings up by bisection
+    encoded = [string.encode("utf-8") for string in strings.strings]
+    order = sorted(range(len(encoded)), key=encoded.__getitem__)
+    new_ids = [0] * len(order)
+    for new_id, old_id in enumerate(order):
+        new_ids[old_id] = new_id
+
+    def remap(string_id: int) -> int:
+        return new_ids[string_id] if string_id != NO_STRING else NO_STRING
+
+    slice_table = b"".join(
+        SLICE.pack(new_ids[file_id], line, new_ids[variable_id], first, count, iterations)
+        for file_id, line, variable_id, first, count, iterations in slices
+    )
+    record_table = b"".join(
+        RECORD.pack(
+            record.slice,
+            record.direction,
+            new_ids[record.file],
+            record.line,
+            new_ids[record.function],
+            new_ids[record.variable],
+            new_ids[record.operation],
+            new_ids[record.code],
+            remap(record.context),
+            record.first_dependency,
+            record.dependency_count,
+        )
+        for record in records
+    )
+    dependency_ids = b"".join(_ID.pack(new_ids[string_id]) for string_id in dependencies)
+    string_offsets = [0]
+    for old_id in order:
+        string_offsets.append(string_offsets[-1] + len(encoded[old_id]))
+    offset_table = b"".join(_OFFSET.pack(offset) for offset in string_offsets)
+
+    sections = [slice_table, record_table, dependency_ids, offset_table]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+    offsets.append(position)  # String data
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        RECORD.size,
+        len(records),
+        len(slices),
+        len(dependencies),
+        len(encoded),
+        *offsets,
+    )
+
+    # Written to a temporary file first, so readers never map a partial file
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(header)
+            for section in sections:
+                f.write(section)
+            for old_id in order:
+                f.write(encoded[old_id])
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return len(slices)
+
+
+class ResultReader:
+    """Read a binary result file through a memory map.
+
+    Strings are decoded when they are first needed and nodes are only built
+    for the records that are asked for. Use as a context manager, or call
+    close(), to unmap the file.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Open and map a result file.
+
+        Args:
+            path: Path of the file
+
+        Raises:
+            OSError: If the file cannot be read
+            BinaryFormatError: If it is not a result file of a supported version
+        """
+        with open(path, "rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:  # Empty file
+                raise BinaryFormatError(f"{path} is not a flowslice result file") from error
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise BinaryFormatError(f"{path} is not a flowslice result file")
+        (
+            magic,
+            version,
+            record_size,
+            self.node_count,
+            self.slice_count,
+            self._dependency_count,
+            self.string_count,
+            self._slices_offset,
+            self._records_offset,
+            self._dependencies_offset,
+            self._string_offsets_offset,
+            self._string_data_offset,
+        ) = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise BinaryFormatError(f"{path} is not a flowslice result file of version {VERSION}")
+        self._strings: dict[int, str] = {}
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def __enter__(self) -> "ResultReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.slice_count
+
+    def _string_bytes(self, string_id: int) -> bytes:
+        position = self._string_offsets_offset + string_id * _OFFSET.size
+        start, end = struct.unpack_from("<QQ", self._map, position)
+        data = self._string_data_offset
+        return self._map[data + start : data + end]
+
+    def string(self, string_id: int) -> str:
+        """Get the string with an id."""
+        string = self._strings.get(string_id)
+        if string is None:
+            string = self._strings[string_id] = self._string_bytes(string_id).decode("utf-8")
+        return string
+
+    def string_id(self, string: str) -> Optional[int]:
+        """Get the id of a string, or None if the file does not contain it."""
+        wanted = string.encode("utf-8")
+        low, high = 0, self.string_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._string_bytes(middle) < wanted:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.string_count and self._string_bytes(low) == wanted:
+            return low
+        return None
+
+    def target(self, index: int) -> tuple[str, int, str]:
+        """Get the (file, line, variable) criterion of a result."""
+        file_id, line, variable_id, _, _, _ = self._slice(index)
+        return self.string(file_id), line, self.string(variable_id)
+
+    def _slice(self, index: int) -> tuple[int, int, int, int, int, int]:
+        if not 0 <= index < self.slice_count:
+            raise IndexError(f"result index {index} out of range")
+        return SLICE.unpack_from(self._map, self._slices_offset + index * SLICE.size)
+
+    def result(self, index: int) -> SliceResult:
+        """Rebuild a whole result."""
+        file_id, line, variable_id, first, count, iterations = self._slice(index)
+        result = SliceResult(
+            self.string(file_id), line, self.string(variable_id), iterations=iterations
+        )
+        for record in self._records(first, first + count):
+            node = self._node(record)
+            if record.direction == BACKWARD:
+                result.backward_slice.append(node)
+            else:
+                result.forward_slice.append(node)
+        return result
+
+    def results(self) -> Iterator[SliceResult]:
+        """Rebuild every result, in file order."""
+        for index in range(self.slice_count):
+            yield self.result(index)
+
+    def nodes(
+        self,
+        file: Optional[str] = None,
+        function: Optional[str] = None,
+        result: Optional[int] = None,
+    ) -> Iterator[tuple[int, SliceNode]]:
+        """Get the nodes matching every given filter, without building the others.
+
+        Args:
+            file: Only nodes in this file
+            function: Only nodes in this function
+            result: Only nodes of the result with this index
+
+        Yields:
+            (result index, node) in file order
+        """
+        start, end = 0, self.node_count
+        if result is not None:
+            _, _, _, start, count, _ = self._slice(result)
+            end = start + count
+        file_id = function_id = None
+        if file is not None:
+            file_id = self.string_id(file)
+            if file_id is None:
+                return
+        if function is not None:
+            function_id = self.string_id(function)
+            if function_id is None:
+                return
+        for record in self._records(start, end):
+            if file_id is not None and record.file != file_id:
+                continue
+            if function_id is not None and record.function != function_id:
+                continue
+            yield record.slice, self._node(record)
+
+    def _records(self, start: int, end: int) -> Iterator[Record]:
+        # Unpacked one at a time: an exported view of the map would keep close() from unmapping it
+        for index in range(start, end):
+            position = self._records_offset + index * RECORD.size
+            yield Record._make(RECORD.unpack_from(self._map, position))
+
+    def _node(self, record: Record) -> SliceNode:
+        position = self._dependencies_offset + record.first_dependency * _ID.size
+        dependency_ids = struct.unpack_from(f"<{record.dependency_count}i", self._map, position)
+        return SliceNode(
+            file=self.string(record.file),
+            line=record.line,
+            function=self.string(record.function),
+            code=self.string(record.code),
+            variable=self.string(record.variable),
+            operation=self.string(record.operation),
+            dependencies=[self.string(string_id) for string_id in dependency_ids],
+            context=self.string(record.context) if record.context != NO_STRING else None,
+        )
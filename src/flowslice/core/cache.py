@@ -0,0 +1,277 @@
+"""Shared, size-bounded cache of parsed Python modules."""
+
+import ast
+import errno
+import os
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, NamedTuple, Optional, Union
+
+from flowslice.core.disk_cache import DiskCache
+from flowslice.core.hooks import CACHE_HIT, FILE_PARSED, Hooks
+
+
+class CacheInfo(NamedTuple):
+    """Counters describing the state of a ParseCache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+    parses: int
+
+
+class CacheEntry:
+    """A source file together with its AST and analyses derived from it.
+
+    This is the one record of a file's content every layer reads: the raw
+    bytes, the decoded source and lines, and the AST, which is parsed on
+    first access to ``tree``. Derived data (symbol tables, def-use
+    indexes, ...) is stored in ``derived`` so it is invalidated and evicted
+    together with the AST. ``facts`` holds the serializable form of derived
+    data, which is what the disk cache stores.
+    """
+
+    def __init__(self, file_path: Path, mtime: float, data: bytes, cache: "ParseCache"):
+        self.file_path = file_path
+        self.mtime = mtime
+        self.data = data
+        # Decoded like a text-mode read, with universal newlines
+        source = data.decode("utf-8")
+        if "\r" in source:
+            source = source.replace("\r\n", "\n").replace("\r", "\n")
+        self.source = source
+        self.size = len(data)  # Used for the byte budget
+        self.derived: dict[str, Any] = {}
+        self.facts: dict[str, Any] = {}
+        self.dirty = False  # True when facts changed since they were loaded or stored
+        # The version of the file this entry replaced, kept so that analyses can
+        # be updated incrementally; dropped once they have been
+        self.previous: Optional[CacheEntry] = None
+        self._tree: Optional[ast.Module] = None
+        self._lines: Optional[list[str]] = None
+        self._key: Optional[str] = None
+        self._cache = cache
+
+    @property
+    def lines(self) -> list[str]:
+        """The source lines, without line endings (shared; do not modify)."""
+        if self._lines is None:
+            self._lines = self.source.split("\n")
+        return self._lines
+
+    @property
+    def tree(self) -> ast.Module:
+        """The parsed AST, parsed on first access.
+
+        Raises:
+            SyntaxError: If the file contains invalid Python syntax
+        """
+        if self._tree is None:
+            self._tree = ast.parse(self.source, filename=str(self.file_path))
+            self._cache.parses += 1
+            if self._cache.hooks.active:
+                self._cache.hooks.emit(FILE_PARSED, self.file_path)
+        return self._tree
+
+    @property
+    def key(self) -> str:
+        """Disk cache key of this exact file content."""
+        if self._key is None:
+            self._key = DiskCache.key(self.file_path, self.data)
+        return self._key
+
+    def set_fact(self, name: str, value: Any) -> None:
+        """Record a serializable fact to be persisted with persist()."""
+        self.facts[name] = value
+        self.dirty = True
+
+
+class ParseCache:
+    """LRU cache of parsed modules keyed by path and validated by mtime.
+
+    One instance is shared between the Slicer and its ImportResolver so each
+    file is parsed and held in memory only once. The cache is bounded by an
+    entry count and/or a byte budget measured in source bytes; the least
+    recently used entries are evicted first.
+
+    Inside a snapshot() each path is stat'ed at most once, so every layer
+    can look files up through the cache without repeating system calls.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = 512,
+        max_bytes: Optional[int] = None,
+        disk_cache: Optional[DiskCache] = None,
+        hooks: Optional[Hooks] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached modules (None for unbounded).
+            max_bytes: Maximum total source size in bytes (None for unbounded).
+            disk_cache: Persistent cache of per-file facts, consulted on a miss.
+            hooks: Hooks told about parses and cache hits (default: a new,
+                empty registry); slicers using this cache share it.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk_cache = disk_cache
+        self.hooks = hooks if hooks is not None else Hooks()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.parses = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._snapshot_depth = 0
+        self._mtimes: dict[str, Optional[float]] = {}  # Paths stat'ed in the current snapshot
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, file_path: object) -> bool:
+        return str(file_path) in self._entries
+
+    def get_entry(self, file_path: Path) -> CacheEntry:
+        """Get the cache entry for a file, reading it if missing or stale.
+
+        On a miss the file is read but not parsed; facts stored in the disk
+        cache for the same content are loaded into the new entry. An entry
+        replacing a stale one keeps it as ``previous``.
+
+        Args:
+            file_path: Path to the Python file
+
+        Returns:
+            The up-to-date cache entry
+
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        file_str = str(file_path)
+        current_mtime = self.mtime(file_path)
+        if current_mtime is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), file_str)
+
+        entry = self._entries.get(file_str)
+        if entry is not None and entry.mtime == current_mtime:
+            self.hits += 1
+            self._entries.move_to_end(file_str)
+            if self.hooks.active:
+                self.hooks.emit(CACHE_HIT, ("parse", file_path))
+            return entry
+
+        self.misses += 1
+        with open(file_path, "rb") as f:
+            data = f.read()
+
+        stale, entry = entry, CacheEntry(file_path, current_mtime, data, self)
+        if stale is not None:
+            stale.previous = None
+            entry.previous = stale
+        if self.disk_cache is not None:
+            facts = self.disk_cache.load(entry.key)
+            if facts is not None:
+                entry.facts = facts
+                if self.hooks.active:
+                    self.hooks.emit(CACHE_HIT, ("disk", file_path))
+        self._store(file_str, entry)
+        return entry
+
+    def get(self, file_path: Path) -> ast.Module:
+        """Get the parsed AST for a file (see get_entry).
+
+        Raises:
+            OSError: If the file cannot be read
+            SyntaxError: If the file contains invalid Python syntax
+        """
+        return self.get_entry(file_path).tree
+
+    def mtime(self, path: Union[str, Path]) -> Optional[float]:
+        """Get a path's mtime, or None if it does not exist.
+
+        Inside a snapshot the result is remembered until the snapshot ends.
+        """
+        path_str = str(path)
+        if path_str in self._mtimes:
+            return self._mtimes[path_str]
+        try:
+            mtime: Optional[float] = os.stat(path_str).st_mtime
+        except OSError:
+            mtime = None
+        if self._snapshot_depth:
+            self._mtimes[path_str] = mtime
+        return mtime
+
+    @contextmanager
+    def snapshot(self) -> Iterator[None]:
+        """Treat the file system as unchanged while the block runs.
+
+        Snapshots can be nested; mtimes are forgotten when the outermost ends.
+        """
+        self._snapshot_depth += 1
+        try:
+            yield
+        finally:
+            self._snapshot_depth -= 1
+            if not self._snapshot_depth:
+                self._mtimes.clear()
+
+    def persist(self, entry: CacheEntry) -> None:
+        """Write an entry's facts to the disk cache if they changed."""
+        if self.disk_cache is not None and entry.dirty:
+            self.disk_cache.store(entry.key, entry.facts)
+            entry.dirty = False
+
+    def lookup(self, file_path: Path) -> Optional[CacheEntry]:
+        """Get a cached entry without checking freshness or counting a hit.
+
+        Args:
+            file_path: Path to the Python file
+
+        Returns:
+            The cached entry, or None if the file is not cached
+        """
+        return self._entries.get(str(file_path))
+
+    def invalidate(self, file_path: Path) -> None:
+        """Drop a file from the cache."""
+        entry = self._entries.pop(str(file_path), None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Report hit, miss and eviction counters and the current size."""
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, len(self._entries), self._bytes, self.parses
+        )
+
+    def _store(self, file_str: str, entry: CacheEntry) -> None:
+        """Insert an entry and evict least recently used ones over budget."""
+        old = self._entries.pop(file_str, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[file_str] = entry
+        self._bytes += entry.size
+
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while len(self._entries) > 1 and self._over_budget():
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def _over_budget(self) -> bool:
+        if self.max_entries is not None and len(self._entries) > self.max_entries:
+            return True
+        return self.max_bytes is not None and self._bytes > self.max_bytes
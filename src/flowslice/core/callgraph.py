@@ -0,0 +1,539 @@
+"""Whole-program call graph.
+
+The calls made in a module are collected once per file content, together
+with the function and class each call is made in, and persisted like the
+other per-file facts. They are resolved into edges from call sites to the
+called functions with the module's import map and the symbol tables of
+the modules it calls into, and the edges are kept until one of those
+changes.
+
+Calls to plain names, to functions of imported modules (``module.func``),
+to methods through ``self``/``cls`` (including inherited ones) or through
+their class, and to classes (their ``__init__``) are resolved. Calls on
+other objects are not, as that would take type inference.
+"""
+
+import ast
+import math
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+from flowslice.core.cache import CacheEntry, ParseCache
+from flowslice.core.defuse import get_func_name
+from flowslice.core.disk_cache import DiskCache
+from flowslice.core.import_resolver import ImportResolver
+from flowslice.core.module_index import ModuleIndex
+from flowslice.core.symbols import CLASS, FunctionNode, SymbolTable, get_symbol_table
+
+MODULE_SCOPE = "<module>"  # Caller of calls made at the top level of a module
+MAX_BASES = 16  # Classes visited when looking a method up through base classes
+
+_NO_IMPORTS: dict[str, tuple[Path, str]] = {}
+
+
+class CallEdge(NamedTuple):
+    """A call site and the function it calls."""
+
+    caller_path: str  # File making the call
+    caller: str  # Qualified name of the calling function (MODULE_SCOPE at top level)
+    line: int
+    name: str  # Display name of the call, as in CallFact.name (e.g. "self.save")
+    callee_path: str  # File defining the called function
+    callee: str  # Qualified name of the called function (e.g. "Store.save")
+    bound: bool  # Whether the instance or class is passed as first argument
+
+
+class CallSites(NamedTuple):
+    """The calls made in a module, before resolution."""
+
+    # (caller, line, display name, dotted callee, enclosing class or "") per call
+    sites: list[tuple[str, int, str, str, str]]
+    bases: dict[str, list[str]]  # Class qualified name -> dotted names of its bases
+
+
+def _dotted_name(node: ast.expr) -> Optional[str]:
+    """Get "a.b.c" for a chain of attributes on a name, else None."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        base = _dotted_name(node.value)
+        return f"{base}.{node.attr}" if base is not None else None
+    return None
+
+
+def collect_call_sites(tree: ast.AST) -> CallSites:
+    """Collect the calls made in a module in one pass.
+
+    Args:
+        tree: The module AST
+
+    Returns:
+        The module's call sites, with qualified names as in its symbol table,
+        and the bases of its classes
+    """
+    sites = []
+    bases = {}
+    pending: list[tuple[ast.AST, str, str, str]] = [(tree, "", MODULE_SCOPE, "")]
+    while pending:
+        node, prefix, caller, owner = pending.pop()
+        if isinstance(node, ast.ClassDef):
+            qualname = prefix + node.name
+            bases[qualname] = [
+                name for name in (_dotted_name(base) for base in node.bases) if name is not None
+            ]
+            prefix, caller, owner = qualname + ".", qualname, qualname
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            qualname = prefix + node.name
+            prefix, caller = qualname + ".<locals>.", qualname
+        elif isinstance(node, ast.Call):
+            dotted = _dotted_name(node.func)
+            if dotted is not None:
+                sites.append((caller, node.lineno, get_func_name(node.func), dotted, owner))
+        children = list(ast.iter_child_nodes(node))
+        pending.extend((child, prefix, caller, owner) for child in reversed(children))
+    return CallSites(sites, bases)
+
+
+def get_call_sites(entry: CacheEntry) -> CallSites:
+    """Get the call sites of a module, cached next to its AST and persisted with its facts.
+
+    Args:
+        entry: Parse cache entry of the module
+
+    Returns:
+        The module's call sites
+
+    Raises:
+        SyntaxError: If the module has to be parsed and is not valid Python
+    """
+    sites: Optional[CallSites] = entry.derived.get("calls")
+    if sites is None:
+        facts = entry.facts.get("calls")
+        if facts is None:
+            sites = collect_call_sites(entry.tree)
+            entry.set_fact("calls", ([list(site) for site in sites.sites], sites.bases))
+        else:
+            stored_sites, bases = facts
+            sites = CallSites([tuple(site) for site in stored_sites], bases)
+        entry.derived["calls"] = sites
+    return sites
+
+
+class _Lookups:
+    """The symbol tables, import maps and submodules an edge resolution consulted."""
+
+    def __init__(self, graph: "CallGraph"):
+        self.graph = graph
+        self.tables: dict[str, Optional[SymbolTable]] = {}
+        self.imports: dict[str, dict[str, tuple[Path, str]]] = {}
+        self.submodules: dict[tuple[str, str], Optional[Path]] = {}
+
+    def table(self, path: str) -> Optional[SymbolTable]:
+        if path not in self.tables:
+            self.tables[path] = self.graph._symbols(path)
+        return self.tables[path]
+
+    def imports_of(self, path: str) -> dict[str, tuple[Path, str]]:
+        if path not in self.imports:
+            self.imports[path] = self.graph._imports(path)
+        return self.imports[path]
+
+    def submodule(self, name: str, package_init: str) -> Optional[Path]:
+        if (name, package_init) not in self.submodules:
+            self.submodules[name, package_init] = self.graph._submodule(name, package_init)
+        return self.submodules[name, package_init]
+
+    def unchanged(self) -> bool:
+        """Check that every lookup would still give the same result."""
+        graph = self.graph
+        return (
+            all(graph._symbols(path) is table for path, table in self.tables.items())
+            and all(graph._imports(path) is imports for path, imports in self.imports.items())
+            and all(
+                graph._submodule(name, init) == path
+                for (name, init), path in self.submodules.items()
+            )
+        )
+
+
+class CallGraph:
+    """Call edges of a project, resolved per file and reused across slices.
+
+    Edges of a file are resolved the first time they are needed and kept in
+    the parse cache next to its AST. build() resolves every file of the
+    project, parsing files in parallel, and indexes the edges by callee for
+    callers() queries.
+    """
+
+    def __init__(
+        self,
+        parse_cache: ParseCache,
+        import_resolver: Optional[ImportResolver] = None,
+        root_path: Optional[Path] = None,
+    ):
+        """Initialize the call graph.
+
+        Args:
+            parse_cache: Parse cache holding the files' facts
+            import_resolver: Resolves imports; without one, only calls to
+                functions of the same module are resolved
+            root_path: Project root that build() walks when there is no import resolver
+        """
+        self.parse_cache = parse_cache
+        self.import_resolver = import_resolver
+        self.root_path = root_path
+        self._key = "callgraph"
+        if import_resolver is not None:
+            self._key += f":{import_resolver.configuration}"
+        self._callers: Optional[dict[tuple[str, str], list[CallEdge]]] = None
+
+    def edges(self, file_path: Path) -> dict[tuple[int, str], CallEdge]:
+        """Get the resolved calls made in a file.
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            The file's call edges by (line, display name of the call)
+
+        Raises:
+            OSError: If the file cannot be read
+            SyntaxError: If the file has to be parsed and is invalid
+        """
+        entry = self.parse_cache.get_entry(file_path)
+        cached = entry.derived.get(self._key)
+        if cached is not None and cached[1].unchanged():
+            edges: dict[tuple[int, str], CallEdge] = cached[0]
+            return edges
+
+        path = str(file_path)
+        sites = get_call_sites(entry)
+        lookups = _Lookups(self)
+        lookups.tables[path] = get_symbol_table(entry)
+        edges = {}
+        for caller, line, name, dotted, owner in sites.sites:
+            if (line, name) in edges:
+                continue
+            callee = self._resolve_call(path, dotted, owner, lookups)
+            if callee is not None:
+                edges[line, name] = CallEdge(path, caller, line, name, *callee)
+        entry.derived[self._key] = (edges, lookups)
+        return edges
+
+    def edge(self, file_path: Path, line: int, name: str) -> Optional[CallEdge]:
+        """Get the edge of a call, or None if the called function is unknown.
+
+        Args:
+            file_path: Path to the file making the call
+            line: Line of the call
+            name: Display name of the call, as in CallFact.name
+
+        Returns:
+            The call's edge, if it could be resolved
+        """
+        try:
+            return self.edges(file_path).get((line, name))
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            return None
+
+    def function(self, edge: CallEdge) -> Optional[FunctionNode]:
+        """Get the definition of the function an edge calls."""
+        table = self._symbols(edge.callee_path)
+        return table.function(edge.callee) if table is not None else None
+
+    def callees(self, file_path: Path, qualname: str) -> list[CallEdge]:
+        """Get the calls a function makes (calls of nested functions excluded).
+
+        Args:
+            file_path: Path to the file defining the function
+            qualname: Qualified name of the function, or MODULE_SCOPE
+
+        Returns:
+            Its resolved calls, by line
+        """
+        try:
+            edges = self.edges(file_path)
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            return []
+        return sorted(
+            (edge for edge in edges.values() if edge.caller == qualname),
+            key=lambda edge: (edge.line, edge.name),
+        )
+
+    def callers(self, file_path: Path, qualname: str) -> list[CallEdge]:
+        """Get the calls of a function from anywhere in the project.
+
+        The project is resolved with build() on first use; call build()
+        again to take later edits into account.
+
+        Args:
+            file_path: Path to the file defining the function
+            qualname: Qualified name of the function (e.g. "Store.save")
+
+        Returns:
+            The calls to the function, by file and line
+        """
+        if self._callers is None:
+            self.build()
+        assert self._callers is not None
+        return list(self._callers.get((os.path.abspath(file_path), qualname), []))
+
+    def build(self, files: Optional[Iterable[Path]] = None, jobs: Optional[int] = None) -> int:
+        """Resolve the calls of every file of the project and index them by callee.
+
+        Files whose call sites and symbol table are not known yet (in memory
+        or in the on-disk cache) are parsed in worker processes. Files
+        unchanged since an earlier build are not resolved again.
+
+        Args:
+            files: Files to include (default: every Python file under the roots)
+            jobs: Number of worker processes (default: one per CPU; 1 parses in
+                this process)
+
+        Returns:
+            Number of edges in the graph
+        """
+        callers: dict[tuple[str, str], list[CallEdge]] = {}
+        count = 0
+        with self.parse_cache.snapshot():
+            paths = list(files) if files is not None else list(self._project_files())
+            for path in self._collect_facts(paths, jobs):
+                try:
+                    edges = self.edges(path)
+                except (OSError, SyntaxError, UnicodeDecodeError):
+                    continue
+                self.parse_cache.persist(self.parse_cache.get_entry(path))
+                for edge in edges.values():
+                    key = (os.path.abspath(edge.callee_path), edge.callee)
+                    callers.setdefault(key, []).append(edge)
+                count += len(edges)
+        self._callers = callers
+        return count
+
+    def _project_files(self) -> Iterable[Path]:
+        if self.import_resolver is not None:
+            return self.import_resolver.module_index.files()
+        if self.root_path is not None:
+            return ModuleIndex([self.root_path], self.parse_cache).files()
+        return []
+
+    def _collect_facts(self, paths: list[Path], jobs: Optional[int]) -> list[Path]:
+        """Make sure the facts edges are resolved from are known, parsing in parallel.
+
+        Returns:
+            The paths, in order
+        """
+        missing = []
+        for path in paths:
+            try:
+                facts = self.parse_cache.get_entry(path).facts
+            except (OSError, UnicodeDecodeError):
+                continue
+            if "calls" not in facts or "symbols" not in facts:
+                missing.append(str(path))
+
+        jobs = jobs or os.cpu_count() or 1
+        if jobs == 1 or len(missing) < 2:
+            return paths
+
+        disk_cache = self.parse_cache.disk_cache
+        resolver = self.import_resolver
+        initargs = (
+            [str(root) for root in resolver.module_index.roots] if resolver else None,
+            [str(path) for path in resolver.module_index.search_paths] if resolver else [],
+            str(disk_cache.cache_dir) if disk_cache is not None else None,
+        )
+        # A few chunks per worker evens out files of different sizes
+        chunk_size = max(1, math.ceil(len(missing) / (jobs * 4)))
+        chunks = [
+            missing[start : start + chunk_size] for start in range(0, len(missing), chunk_size)
+        ]
+        # Imported here: the process pool machinery is slow to import and rarely needed
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        context = multiprocessing.get_context()
+        with ProcessPoolExecutor(jobs, context, _init_worker, initargs) as executor:
+            for results in executor.map(_collect_chunk, chunks):
+                for file_name, key, facts in results:
+                    try:
+                        entry = self.parse_cache.get_entry(Path(file_name))
+                    except (OSError, UnicodeDecodeError):
+                        continue
+                    if entry.key != key:
+                        continue  # Changed since the worker read it
+                    for name, value in facts.items():
+                        if name not in entry.facts:
+                            entry.set_fact(name, value)
+                    self.parse_cache.persist(entry)
+        return paths
+
+    def _resolve_call(
+        self, path: str, dotted: str, owner: str, lookups: _Lookups
+    ) -> Optional[tuple[str, str, bool]]:
+        """Resolve a call to (callee path, callee qualified name, bound)."""
+        parts = dotted.split(".")
+        if parts[0] in ("self", "cls") and len(parts) == 2:
+            if not owner:
+                return None
+            method = self._find_method(path, owner, parts[1], lookups)
+            return (*method, True) if method is not None else None
+
+        definition = self._definition(path, parts, lookups)
+        if definition is None:
+            if len(parts) < 2:
+                return None
+            # A method inherited by a class, called through the class
+            owner_class = self._definition(path, parts[:-1], lookups)
+            if owner_class is None or not self._is_class(owner_class, lookups):
+                return None
+            method = self._find_method(*owner_class, parts[-1], lookups)
+            return (*method, False) if method is not None else None
+
+        if self._is_class(definition, lookups):
+            init = self._find_method(*definition, "__init__", lookups)
+            return (*init, True) if init is not None else None
+        return (*definition, False)
+
+    def _definition(
+        self, path: str, parts: list[str], lookups: _Lookups
+    ) -> Optional[tuple[str, str]]:
+        """Resolve a dotted name used in a module to (path, qualified name) of its definition."""
+        imports = lookups.imports_of(path)
+        # The longest imported prefix, e.g. "pkg.mod" of "pkg.mod.func"
+        for end in range(len(parts), 0, -1):
+            prefix = ".".join(parts[:end])
+            if prefix in imports:
+                target, original = imports[prefix]
+                return self._definition_in(str(target), original, parts[end:], lookups)
+        return self._qualified(path, parts, lookups)
+
+    def _definition_in(
+        self, target: str, original: str, rest: list[str], lookups: _Lookups
+    ) -> Optional[tuple[str, str]]:
+        """Resolve the attribute path `rest` of a name imported from a module."""
+        table = lookups.table(target)
+        if table is None:
+            return None
+        if original in table or original in table.callables:
+            return self._qualified(target, [original, *rest], lookups)
+        # The imported name is a module: "import pkg.mod" or "from pkg import mod"
+        if not rest:
+            return None
+        module = target
+        if os.path.basename(target) == "__init__.py" and "." not in original:
+            submodule = lookups.submodule(original, target)
+            if submodule is not None:
+                module = str(submodule)
+        return self._qualified(module, rest, lookups)
+
+    def _qualified(
+        self, path: str, parts: list[str], lookups: _Lookups
+    ) -> Optional[tuple[str, str]]:
+        """Look a name or dotted path up among the definitions of a module."""
+        table = lookups.table(path)
+        if table is None:
+            return None
+        if len(parts) == 1 and parts[0] in table.callables:
+            return (path, table.callables[parts[0]])
+        qualname = ".".join(parts)
+        return (path, qualname) if qualname in table else None
+
+    def _is_class(self, definition: tuple[str, str], lookups: _Lookups) -> bool:
+        table = lookups.table(definition[0])
+        return table is not None and table[definition[1]].kind == CLASS
+
+    def _find_method(
+        self, path: str, class_qualname: str, method: str, lookups: _Lookups
+    ) -> Optional[tuple[str, str]]:
+        """Find a method of a class or, breadth first, of its base classes."""
+        pending = [(path, class_qualname)]
+        visited: set[tuple[str, str]] = set()
+        while pending and len(visited) < MAX_BASES:
+            class_path, qualname = pending.pop(0)
+            if (class_path, qualname) in visited:
+                continue
+            visited.add((class_path, qualname))
+            table = lookups.table(class_path)
+            if table is None:
+                continue
+            symbol = table.get(f"{qualname}.{method}")
+            if symbol is not None and symbol.kind != CLASS:
+                return (class_path, symbol.qualname)
+            for base in self._sites(class_path).bases.get(qualname, []):
+                definition = self._definition(class_path, base.split("."), lookups)
+                if definition is not None and self._is_class(definition, lookups):
+                    pending.append(definition)
+        return None
+
+    def _symbols(self, path: str) -> Optional[SymbolTable]:
+        try:
+            return get_symbol_table(self.parse_cache.get_entry(Path(path)))
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            return None
+
+    def _imports(self, path: str) -> dict[str, tuple[Path, str]]:
+        if self.import_resolver is None:
+            return _NO_IMPORTS
+        try:
+            return self.import_resolver.get_imports(Path(path))
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            return _NO_IMPORTS
+
+    def _submodule(self, name: str, package_init: str) -> Optional[Path]:
+        if self.import_resolver is None:
+            return None
+        return self.import_resolver.resolve_import(name, Path(package_init))
+
+    def _sites(self, path: str) -> CallSites:
+        try:
+            return get_call_sites(self.parse_cache.get_entry(Path(path)))
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            return CallSites([], {})
+
+
+# Parse cache and import resolver used by the current worker process
+_worker_cache: Optional[ParseCache] = None
+_worker_resolver: Optional[ImportResolver] = None
+
+
+def _init_worker(
+    roots: Optional[list[str]], search_paths: list[str], cache_dir: Optional[str]
+) -> None:
+    """Set up the worker's parse cache and, if imports are resolved, its import resolver."""
+    global _worker_cache, _worker_resolver
+    _worker_cache = ParseCache(disk_cache=DiskCache(cache_dir) if cache_dir else None)
+    _worker_resolver = None
+    if roots:
+        _worker_resolver = ImportResolver(
+            Path(roots[0]),
+            _worker_cache,
+            extra_roots=[Path(root) for root in roots[1:]],
+            search_paths=[Path(path) for path in search_paths],
+        )
+
+
+def _collect_chunk(paths: list[str]) -> list[tuple[str, str, dict[str, Any]]]:
+    """Compute the call sites, symbol table and import map of files in a worker.
+
+    Returns:
+        (path, content key, facts) per file that could be parsed
+    """
+    if _worker_cache is None:
+        raise RuntimeError("Worker process was not initialized")
+    results = []
+    with _worker_cache.snapshot():
+        for path in paths:
+            try:
+                entry = _worker_cache.get_entry(Path(path))
+                get_call_sites(entry)
+                get_symbol_table(entry)
+                if _worker_resolver is not None:
+                    _worker_resolver.get_imports(Path(path))
+            except (OSError, SyntaxError, UnicodeDecodeError):
+                continue
+            _worker_cache.persist(entry)
+            results.append((path, entry.key, entry.facts))
+    return results
@@ -0,0 +1,183 @@
+"""Columnar export of slice results.
+
+The nodes of any number of slices are laid out as parallel arrays, one
+entry per node, with file, function, variable and operation names
+replaced by ids into one shared string table. The arrays are stdlib
+``array.array`` buffers with fixed-width items, so they can be handed to
+NumPy or Arrow without converting node objects one by one.
+"""
+
+from array import array
+from collections.abc import Iterable
+from typing import Any, Optional
+
+from flowslice.core.models import SliceNode, SliceResult
+
+BACKWARD = 0  # Value of the direction column for backward slice nodes
+FORWARD = 1  # Value of the direction column for forward slice nodes
+
+# Integer columns, with their array typecodes (all 4 bytes wide but direction)
+COLUMNS = (
+    ("slice", "i"),  # Index of the result the node belongs to
+    ("direction", "b"),  # BACKWARD or FORWARD
+    ("file", "i"),
+    ("line", "i"),
+    ("function", "i"),
+    ("variable", "i"),
+    ("operation", "i"),
+)
+
+
+class StringTable:
+    """Strings numbered in the order they are first added."""
+
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    def add(self, string: str) -> int:
+        """Get the id of a string, adding it if it is new."""
+        string_id = self._ids.get(string)
+        if string_id is None:
+            string_id = self._ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
+
+    def __getitem__(self, string_id: int) -> str:
+        return self.strings[string_id]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+class SliceColumns:
+    """Nodes of many slice results as parallel arrays.
+
+    Each node has one entry in every column of COLUMNS. Its dependencies
+    are stored like an Arrow list column: the ids of node i are
+    ``dependency_ids[dependency_offsets[i]:dependency_offsets[i + 1]]``.
+    Code and context are not exported; code can be read back from the file
+    and line.
+    """
+
+    def __init__(self) -> None:
+        self.strings = StringTable()
+        self.columns: dict[str, array] = {name: array(code) for name, code in COLUMNS}
+        self.dependency_offsets = array("i", [0])
+        self.dependency_ids = array("i")
+        # (target file id, target line, target variable id) per result
+        self.targets: list[tuple[int, int, int]] = []
+
+    @classmethod
+    def from_results(cls, results: Iterable[SliceResult]) -> "SliceColumns":
+        """Lay out the nodes of slice results, e.g. those of Slicer.slice_many().
+
+        Args:
+            results: The results; they are only iterated once
+
+        Returns:
+            The columns of all their nodes, backward slice first for each result
+        """
+        columns = cls()
+        for result in results:
+            columns.add(result)
+        return columns
+
+    def add(self, result: SliceResult) -> int:
+        """Append the nodes of a slice result.
+
+        Returns:
+            The index of the result in the slice column
+        """
+        index = len(self.targets)
+        add_string = self.strings.add
+        self.targets.append(
+            (add_string(result.target_file), result.target_line, add_string(result.target_variable))
+        )
+        for direction, nodes in (
+            (BACKWARD, result.backward_slice),
+            (FORWARD, result.forward_slice),
+        ):
+            self._add_nodes(index, direction, nodes)
+        return index
+
+    def _add_nodes(self, index: int, direction: int, nodes: list[SliceNode]) -> None:
+        add_string = self.strings.add
+        count = len(nodes)
+        columns = self.columns
+        columns["slice"].extend(array("i", [index]) * count)
+        columns["direction"].extend(array("b", [direction]) * count)
+        columns["file"].extend([add_string(node.file) for node in nodes])
+        columns["line"].extend([node.line for node in nodes])
+        columns["function"].extend([add_string(node.function) for node in nodes])
+        columns["variable"].extend([add_string(node.variable) for node in nodes])
+        columns["operation"].extend([add_string(node.operation) for node in nodes])
+        offset = self.dependency_offsets[-1]
+        for node in nodes:
+            self.dependency_ids.extend([add_string(name) for name in node.dependencies])
+            offset += len(node.dependencies)
+            self.dependency_offsets.append(offset)
+
+    def __len__(self) -> int:
+        return len(self.columns["line"])
+
+    def dependencies(self, row: int) -> list[str]:
+        """Get the dependency names of the node in a row."""
+        start, end = self.dependency_offsets[row], self.dependency_offsets[row + 1]
+        return [self.strings[string_id] for string_id in self.dependency_ids[start:end]]
+
+    def buffers(self) -> dict[str, memoryview]:
+        """Get the raw buffers of the columns, without copying.
+
+        Returns:
+            A memoryview per column of COLUMNS, plus "dependency_offsets"
+            and "dependency_ids", all in native byte order
+        """
+        buffers = {name: memoryview(column) for name, column in self.columns.items()}
+        buffers["dependency_offsets"] = memoryview(self.dependency_offsets)
+        buffers["dependency_ids"] = memoryview(self.dependency_ids)
+        return buffers
+
+    def to_numpy(self) -> Any:
+        """Get the columns as a NumPy structured array with one record per node.
+
+        The string ids index self.strings.strings.
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        try:
+            import numpy as np
+        except ImportError as error:
+            raise ImportError(
+                "Exporting slice columns to NumPy requires numpy "
+                "(pip install 'flowslice[columnar]')"
+            ) from error
+
+        dtype = np.dtype([(name, np.dtype(code)) for name, code in COLUMNS])
+        records = np.empty(len(self), dtype=dtype)
+        for name, column in self.columns.items():
+            records[name] = np.frombuffer(column, dtype=column.typecode)
+        return records
+
+    def node(self, row: int, lines: Optional[list[str]] = None) -> SliceNode:
+        """Rebuild the node in a row.
+
+        Args:
+            row: Row of the node
+            lines: Source lines of its file, to read its code from (default: no code)
+
+        Returns:
+            The node, without context
+        """
+        strings, columns = self.strings, self.columns
+        return SliceNode(
+            file=strings[columns["file"][row]],
+            line=columns["line"][row],
+            function=strings[columns["function"][row]],
+            code=None if lines is not None else "",
+            variable=strings[columns["variable"][row]],
+            operation=strings[columns["operation"][row]],
+            dependencies=self.dependencies(row),
+            lines=lines,
+        )
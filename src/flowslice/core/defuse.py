@@ -0,0 +1,375 @@
+"""Per-module def-use index shared by all slices of a file."""
+
+import ast
+from typing import Any, NamedTuple, Optional
+
+
+def get_names_from_expr(expr: ast.expr) -> set[str]:
+    """Extract all variable names from an expression, including attributes.
+
+    Examples:
+        args.file -> {"args.file", "args"}
+        obj.attr.subattr -> {"obj.attr.subattr", "obj.attr", "obj"}
+        simple_var -> {"simple_var"}
+    """
+    names: set[str] = set()
+
+    class NameCollector(ast.NodeVisitor):
+        def visit_Name(self, node: ast.Name) -> None:
+            names.add(node.id)
+
+        def visit_Attribute(self, node: ast.Attribute) -> None:
+            # Get the full attribute path
+            full_path = self._get_full_attr_path(node)
+            if full_path:
+                names.add(full_path)
+                # Also add intermediate paths for tracking
+                # e.g., for "a.b.c" add "a.b" and "a"
+                parts = full_path.split(".")
+                for i in range(len(parts) - 1, 0, -1):
+                    names.add(".".join(parts[:i]))
+            # Continue visiting to get nested attributes
+            self.generic_visit(node)
+
+        def visit_ListComp(self, node: ast.ListComp) -> None:
+            """Handle list comprehensions: [x*2 for x in source]."""
+            # Visit the iterator (source)
+            for generator in node.generators:
+                self.visit(generator.iter)
+            # Note: Don't visit the target (x) as it's local to comprehension
+
+        def visit_SetComp(self, node: ast.SetComp) -> None:
+            """Handle set comprehensions: {x*2 for x in source}."""
+            for generator in node.generators:
+                self.visit(generator.iter)
+
+        def visit_DictComp(self, node: ast.DictComp) -> None:
+            """Handle dict comprehensions: {k: v for k, v in items}."""
+            for generator in node.generators:
+                self.visit(generator.iter)
+
+        def visit_GeneratorExp(self, node: ast.GeneratorExp) -> None:
+            """Handle generator expressions: (x*2 for x in source)."""
+            for generator in node.generators:
+                self.visit(generator.iter)
+
+        def _get_full_attr_path(self, node: ast.expr) -> str:
+            """Build full attribute path like 'obj.attr.subattr'."""
+            if isinstance(node, ast.Name):
+                return node.id
+            elif isinstance(node, ast.Attribute):
+                base = self._get_full_attr_path(node.value)
+                if base:
+                    return f"{base}.{node.attr}"
+            return ""
+
+    NameCollector().visit(expr)
+    return names
+
+
+def get_base_name(node: ast.expr) -> str:
+    """Get the base variable name from an attribute chain."""
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        return get_base_name(node.value)
+    return ""
+
+
+def get_func_name(node: ast.expr) -> str:
+    """Get a display name for the function part of a call."""
+    if isinstance(node, ast.Name):
+        return node.id
+    elif isinstance(node, ast.Attribute):
+        return f"{get_base_name(node.value)}.{node.attr}"
+    return "<unknown>"
+
+
+class CallFact(NamedTuple):
+    """A call reduced to what slicing needs, so no AST node has to be kept."""
+
+    name: str  # Display name, e.g. "helper" or "obj.method"
+    callee: Optional[str]  # Bare function name when the callee is a plain name
+    args: tuple[frozenset[str], ...]  # Variables used by each positional argument
+
+    @classmethod
+    def from_node(cls, node: ast.Call) -> "CallFact":
+        """Build the fact for a call node."""
+        callee = node.func.id if isinstance(node.func, ast.Name) else None
+        args = tuple(frozenset(get_names_from_expr(arg)) for arg in node.args)
+        return cls(get_func_name(node.func), callee, args)
+
+
+class DefinitionSite(NamedTuple):
+    """A statement that (re)defines a variable, used by backward slicing."""
+
+    order: int  # Position in AST visit order, used to keep output deterministic
+    variable: str
+    line: int
+    function: str
+    kind: str  # "parameter", "assignment", "method" or "for"
+    uses: frozenset[str] = frozenset()  # Variables the definition depends on
+    detail: str = ""  # Method name for "method" sites
+    call: Optional[CallFact] = None  # Right-hand side of an assignment, if a call
+
+
+class UseSite(NamedTuple):
+    """A statement or call that reads variables, used by forward slicing."""
+
+    order: int
+    line: int
+    function: str
+    kind: str  # "assignment", "method", "for" or "call"
+    uses: tuple[frozenset[str], ...]  # One set per call argument, a single set otherwise
+    targets: tuple[str, ...] = ()  # Assigned names, loop variable or method object
+    detail: str = ""  # Method name for "method" sites
+    call: Optional[CallFact] = None  # The call itself for "call" sites
+
+
+class ScopeIndex:
+    """Definitions and uses of a single function scope."""
+
+    def __init__(self) -> None:
+        self.definitions: dict[str, list[DefinitionSite]] = {}
+        self.uses: dict[str, list[UseSite]] = {}
+
+
+class DefUseIndex:
+    """Definitions and uses of every variable and attribute path in a module.
+
+    Built in one walk of the AST and keyed per function scope, so slices are
+    answered with dictionary lookups instead of re-visiting the tree. Scopes are
+    named like SlicerVisitor reports them ("<module>" or the function name).
+    The index holds no AST nodes and can be serialized with to_facts().
+    """
+
+    def __init__(self) -> None:
+        self.scopes: dict[str, ScopeIndex] = {}
+        self.assignments: list[tuple[int, int, str]] = []  # (order, line, function)
+        self._definitions: dict[str, list[DefinitionSite]] = {}
+        self._sites: list[tuple[bool, Any]] = []  # (is_definition, site), for to_facts()
+        self.order_count = 0  # Visit order positions used, i.e. the next free order
+
+    @classmethod
+    def build(cls, tree: ast.AST) -> "DefUseIndex":
+        """Build the index for a parsed module.
+
+        Args:
+            tree: The module AST
+
+        Returns:
+            The populated index
+        """
+        index = cls()
+        builder = _IndexBuilder(index)
+        builder.visit(tree)
+        index.order_count = builder.order_count
+        return index
+
+    def to_facts(self) -> tuple[Any, ...]:
+        """Convert the index to plain tuples, suitable for marshal."""
+        sites = []
+        for is_definition, site in self._sites:
+            fields = list(site)
+            if site.call is not None:
+                fields[-1] = tuple(site.call)
+            sites.append((is_definition, tuple(fields)))
+        return (tuple(self.assignments), tuple(sites))
+
+    @classmethod
+    def from_facts(cls, facts: tuple[Any, ...]) -> "DefUseIndex":
+        """Rebuild an index from the output of to_facts()."""
+        assignments, sites = facts
+        index = cls()
+        index.assignments = [tuple(assignment) for assignment in assignments]
+        index.order_count = max((order + 1 for order, _, _ in index.assignments), default=0)
+        for is_definition, fields in sites:
+            call = CallFact(*fields[-1]) if fields[-1] is not None else None
+            if is_definition:
+                index.add_definition(DefinitionSite._make((*fields[:-1], call)))
+            else:
+                index.add_use(UseSite._make((*fields[:-1], call)))
+            index.order_count = max(index.order_count, fields[0] + 1)
+        return index
+
+    def extend(self, other: "DefUseIndex", line_offset: int) -> None:
+        """Append the sites of an index that follows this one in the module.
+
+        Used to assemble a module's index from the indexes of its top-level
+        statements. Orders of the appended sites continue after this index's
+        and their lines are moved by line_offset.
+
+        Args:
+            other: Index of the code that follows
+            line_offset: Number of lines to move the other index's sites by
+        """
+        order_offset = self.order_count
+        for order, line, function in other.assignments:
+            self.assignments.append((order + order_offset, line + line_offset, function))
+        for is_definition, site in other._sites:
+            moved = site._replace(order=site.order + order_offset, line=site.line + line_offset)
+            if is_definition:
+                self.add_definition(moved)
+            else:
+                self.add_use(moved)
+        self.order_count = order_offset + other.order_count
+
+    def variables(self) -> set[str]:
+        """Get every variable defined or used in the index, and every scope name."""
+        names = set(self._definitions) | set(self.scopes)
+        for scope in self.scopes.values():
+            names.update(scope.uses)
+        return names
+
+    def scope(self, function: str) -> ScopeIndex:
+        """Get (or create) the index of a function scope."""
+        if function not in self.scopes:
+            self.scopes[function] = ScopeIndex()
+        return self.scopes[function]
+
+    def definitions(self, variable: str) -> list[DefinitionSite]:
+        """Get the definitions of a variable across all scopes, in visit order."""
+        return self._definitions.get(variable, [])
+
+    def uses(self, variable: str, function: str) -> list[UseSite]:
+        """Get the uses of a variable inside one function scope, in visit order."""
+        scope = self.scopes.get(function)
+        if scope is None:
+            return []
+        return scope.uses.get(variable, [])
+
+    def forward_start(self, line: int) -> Optional[tuple[int, str]]:
+        """Find where a forward slice from a line starts.
+
+        Forward slicing starts at the first assignment (in visit order) at or
+        after the target line, and stays in that assignment's function.
+
+        Args:
+            line: The target line
+
+        Returns:
+            Tuple of (visit order, function name), or None if nothing follows the line
+        """
+        for order, assign_line, function in self.assignments:
+            if assign_line >= line:
+                return (order, function)
+        return None
+
+    def forward_start_line(self, line: int) -> Optional[int]:
+        """Get the line of the assignment a forward slice from a line starts at."""
+        for _, assign_line, _ in self.assignments:
+            if assign_line >= line:
+                return assign_line
+        return None
+
+    def add_definition(self, site: DefinitionSite) -> None:
+        """Register a definition site."""
+        self.scope(site.function).definitions.setdefault(site.variable, []).append(site)
+        self._definitions.setdefault(site.variable, []).append(site)
+        self._sites.append((True, site))
+
+    def add_use(self, site: UseSite) -> None:
+        """Register a use site under every variable it reads."""
+        uses = self.scope(site.function).uses
+        for variable in frozenset().union(*site.uses):
+            uses.setdefault(variable, []).append(site)
+        self._sites.append((False, site))
+
+
+class _IndexBuilder(ast.NodeVisitor):
+    """Populate a DefUseIndex in one pass.
+
+    Mirrors the function tracking and visit order of SlicerVisitor so that
+    sites carry the same function names and ordering the visitor would see.
+    """
+
+    def __init__(self, index: DefUseIndex) -> None:
+        self.index = index
+        self.function_stack = ["<module>"]
+        self.order_count = 0
+
+    def _next_order(self) -> int:
+        order = self.order_count
+        self.order_count += 1
+        return order
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        """Record parameters and track function context."""
+        self.function_stack.append(node.name)
+        for arg in node.args.args:
+            self.index.add_definition(
+                DefinitionSite(self._next_order(), arg.arg, node.lineno, node.name, "parameter")
+            )
+        self.generic_visit(node)
+        self.function_stack.pop()
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        """Record assignments to plain names and the variables they read."""
+        function = self.function_stack[-1]
+        rhs_vars = frozenset(get_names_from_expr(node.value))
+        call = CallFact.from_node(node.value) if isinstance(node.value, ast.Call) else None
+        self.index.assignments.append((self._next_order(), node.lineno, function))
+
+        names = tuple(target.id for target in node.targets if isinstance(target, ast.Name))
+        for name in names:
+            self.index.add_definition(
+                DefinitionSite(
+                    self._next_order(), name, node.lineno, function, "assignment",
+                    rhs_vars, call=call,
+                )
+            )
+        if names:
+            self.index.add_use(
+                UseSite(self._next_order(), node.lineno, function, "assignment", (rhs_vars,), names)
+            )
+        self.generic_visit(node)
+
+    def visit_Expr(self, node: ast.Expr) -> None:
+        """Record method calls, which may mutate the object they are called on."""
+        if isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Attribute):
+            function = self.function_stack[-1]
+            obj = get_base_name(node.value.func.value)
+            method = node.value.func.attr
+            if obj:
+                arg_vars: set[str] = set()
+                for arg in node.value.args:
+                    arg_vars.update(get_names_from_expr(arg))
+                self.index.add_definition(
+                    DefinitionSite(
+                        self._next_order(), obj, node.lineno, function, "method",
+                        frozenset(arg_vars), method,
+                    )
+                )
+                self.index.add_use(
+                    UseSite(
+                        self._next_order(), node.lineno, function, "method",
+                        (frozenset({obj}),), (obj,), method,
+                    )
+                )
+        self.generic_visit(node)
+
+    def visit_For(self, node: ast.For) -> None:
+        """Record for loops over a single name."""
+        if isinstance(node.target, ast.Name):
+            function = self.function_stack[-1]
+            iter_vars = frozenset(get_names_from_expr(node.iter))
+            name = node.target.id
+            self.index.add_definition(
+                DefinitionSite(self._next_order(), name, node.lineno, function, "for", iter_vars)
+            )
+            self.index.add_use(
+                UseSite(self._next_order(), node.lineno, function, "for", (iter_vars,), (name,))
+            )
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        """Record the variables passed as call arguments."""
+        call = CallFact.from_node(node)
+        if any(call.args):
+            self.index.add_use(
+                UseSite(
+                    self._next_order(), node.lineno, self.function_stack[-1], "call",
+                    call.args, call=call,
+                )
+            )
+        self.generic_visit(node)
@@ -0,0 +1,110 @@
+"""Persistent on-disk cache of per-file analysis facts."""
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# Bump whenever the layout of stored facts changes
+FORMAT_VERSION = 1
+
+
+class DiskCache:
+    """Directory of per-file facts keyed by file content, like .mypy_cache.
+
+    Each entry is the marshal-serialized dict of facts computed for one file
+    (symbol table, import map, def-use index). Entries are keyed by a hash
+    of the file's resolved path and content and live in a subdirectory per
+    Python version and format version, so stale or incompatible entries are
+    never read. The cache is best effort: I/O errors are ignored.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """Initialize the disk cache.
+
+        Args:
+            cache_dir: Directory to store the cache in (created on first write).
+        """
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        version = f"py{sys.version_info[0]}{sys.version_info[1]}-v{FORMAT_VERSION}"
+        self._version_dir = self.cache_dir / version
+
+    @staticmethod
+    def key(file_path: Path, content: bytes) -> str:
+        """Compute the cache key for a file's content.
+
+        The path is part of the key because resolved imports depend on where
+        the file lives, not only on what it contains.
+
+        Args:
+            file_path: Path to the file
+            content: The file's content
+
+        Returns:
+            Hex digest identifying the file and its content
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(str(file_path.resolve()).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[dict[str, Any]]:
+        """Load the facts stored under a key.
+
+        Args:
+            key: Key from DiskCache.key()
+
+        Returns:
+            The stored facts, or None if missing or unreadable
+        """
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                facts = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            self.misses += 1
+            return None
+
+        if not isinstance(facts, dict):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return facts
+
+    def store(self, key: str, facts: dict[str, Any]) -> None:
+        """Store facts under a key, atomically replacing any previous entry.
+
+        Args:
+            key: Key from DiskCache.key()
+            facts: Dict of marshal-serializable values
+        """
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._write_gitignore()
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    marshal.dump(facts, f)
+                os.replace(tmp_name, path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except (OSError, ValueError):
+            return
+        self.writes += 1
+
+    def _entry_path(self, key: str) -> Path:
+        return self._version_dir / key[:2] / key
+
+    def _write_gitignore(self) -> None:
+        """Keep the cache directory out of version control."""
+        gitignore = self.cache_dir / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("# Automatically created by flowslice.\n*\n")
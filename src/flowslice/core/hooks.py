@@ -0,0 +1,89 @@
+"""Listeners for events of the slicing engine, e.g. for tracing or profiling.
+
+Like a ``sys.setprofile`` function, a hook is called as ``hook(event, arg)``
+where the type of arg depends on the event:
+
+    FILE_PARSED       Path of the file whose AST was just parsed
+    FUNCTION_ENTERED  (path, function name) of a called function about to
+                      be analyzed
+    FUNCTION_EXITED   the same, once it and the calls it makes are analyzed
+    PASS_STARTED      (pass name, criterion): "backward" or "forward" pass
+                      of a slice is starting
+    PASS_FINISHED     the same, once the pass is done
+    NODE_EMITTED      SliceNode added to the result of the current pass,
+                      emitted in result order before PASS_FINISHED
+    CACHE_HIT         (cache name, key): "parse" and "disk" with the file
+                      path, "slice" with the criterion, "summary" with the
+                      (path, function name) of the summarized function
+
+Hooks run synchronously in the slicing thread, so the time they take is
+included in the timings of the slice. When no hook is registered the engine
+only checks the registry's ``active`` flag at each event.
+
+Hooks only see slices computed in their own process: criteria that
+``flowslice.core.parallel.slice_parallel`` hands to worker processes are
+sliced without them, even by workers forked from the slicer that holds them.
+"""
+
+from typing import Any, Callable
+
+FILE_PARSED = "file_parsed"
+FUNCTION_ENTERED = "function_entered"
+FUNCTION_EXITED = "function_exited"
+PASS_STARTED = "pass_started"
+PASS_FINISHED = "pass_finished"
+NODE_EMITTED = "node_emitted"
+CACHE_HIT = "cache_hit"
+
+EVENTS = (
+    FILE_PARSED,
+    FUNCTION_ENTERED,
+    FUNCTION_EXITED,
+    PASS_STARTED,
+    PASS_FINISHED,
+    NODE_EMITTED,
+    CACHE_HIT,
+)
+
+Hook = Callable[[str, Any], None]
+
+
+class Hooks:
+    """The hooks registered with a slicer (and its parse cache)."""
+
+    def __init__(self) -> None:
+        self._hooks: tuple[Hook, ...] = ()
+        self.active = False  # Whether any hook is registered; checked before emitting
+
+    def add(self, hook: Hook) -> None:
+        """Register a hook; it is called for every event, in registration order."""
+        self._hooks += (hook,)
+        self.active = True
+
+    def remove(self, hook: Hook) -> None:
+        """Unregister a hook.
+
+        Raises:
+            ValueError: If the hook is not registered
+        """
+        hooks = list(self._hooks)
+        hooks.remove(hook)
+        self._hooks = tuple(hooks)
+        self.active = bool(hooks)
+
+    def clear(self) -> None:
+        """Unregister every hook."""
+        self._hooks = ()
+        self.active = False
+
+    def __len__(self) -> int:
+        return len(self._hooks)
+
+    def emit(self, event: str, arg: Any) -> None:
+        """Call every hook with an event.
+
+        Exceptions raised by a hook propagate and abort the slice.
+        """
+        # Hooks may remove themselves; the registered tuple is not modified in place
+        for hook in self._hooks:
+            hook(event, arg)
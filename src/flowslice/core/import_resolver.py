@@ -1,29 +1,70 @@
 """Import resolution and cross-file analysis support."""
 
 import ast
+import os
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Optional
 
+from flowslice.core.cache import ParseCache
+from flowslice.core.module_index import DirectoryListing, ModuleIndex
+from flowslice.core.symbols import FunctionNode, SymbolTable, get_symbol_table
+
 
 class ImportResolver:
     """Resolves imports and tracks cross-file dependencies."""
 
-    def __init__(self, root_path: Path):
+    def __init__(
+        self,
+        root_path: Path,
+        parse_cache: Optional[ParseCache] = None,
+        extra_roots: Optional[Iterable[Path]] = None,
+        search_paths: Optional[Iterable[Path]] = None,
+    ):
         """Initialize the import resolver.
 
         Args:
             root_path: Root directory of the project.
+            parse_cache: Parse cache to use, normally shared with the Slicer.
+                A default-sized cache is created if omitted.
+            extra_roots: More directories to resolve absolute imports against,
+                after root_path.
+            search_paths: Directories of installed packages (e.g. site-packages)
+                to resolve absolute imports against last. They are indexed
+                lazily and only the modules that slices enter are parsed.
         """
         self.root_path = root_path
         self.import_map: dict[str, tuple[Path, str]] = {}  # name -> (file_path, module_name)
 
         # Performance caches with mtime tracking
-        self.ast_cache: dict[str, tuple[float, ast.Module]] = {}  # path -> (mtime, ast)
-        self.import_cache: dict[str, tuple[float, dict[str, tuple[Path, str]]]] = {}  # file -> (mtime, imports)
+        self.parse_cache = parse_cache if parse_cache is not None else ParseCache()
+        # Module files under the roots, so resolving an import needs no file probes
+        self.module_index = ModuleIndex(
+            [Path(root_path), *(extra_roots or [])], self.parse_cache, search_paths
+        )
+        # (directory, module name) -> (resolved path, listings the resolution consulted)
+        self._resolutions: dict[
+            tuple[str, str], tuple[Optional[Path], list[tuple[str, DirectoryListing]]]
+        ] = {}
+        # Paths consulted while resolving imports -> mtime (None if missing);
+        # only collected while get_imports() computes a fresh import map
+        self._dependencies: Optional[dict[str, Optional[float]]] = None
+        # Import maps depend on the roots and search paths, so they are cached per root
+        roots = [str(path.resolve()) for path in self.module_index.roots]
+        search = [str(path.resolve()) for path in self.module_index.search_paths]
+        self.configuration = ":".join(roots) + ("|" + ":".join(search) if search else "")
+        self._imports_key = f"imports:{self.configuration}"
+        # Export tables of packages, cached with the AST of their __init__.py
+        self._exports_key = f"exports:{self.configuration}"
+        self._exporting: set[str] = set()  # __init__.py files whose table is being built
 
     def resolve_import(self, module_name: str, current_file: Path) -> Optional[Path]:
         """Resolve an import to a file path.
 
+        Candidate files are looked up in the module index. Results are memoized
+        per directory and module name, and reused as long as the directories
+        they were looked up in are unchanged.
+
         Args:
             module_name: The module being imported (e.g., 'utils' or 'package.utils')
             current_file: Path to the file containing the import
@@ -31,26 +72,56 @@ class ImportResolver:
         Returns:
             Path to the imported module file, or None if not found
         """
-        # Handle relative imports within the same directory
-        current_dir = current_file.parent
-
-        # Try as .py file in same directory
-        same_dir = current_dir / f"{module_name}.py"
-        if same_dir.exists():
-            return same_dir
+        current_dir = str(current_file.parent)
+        key = (current_dir, module_name)
+        cached = self._resolutions.get(key)
+        if cached is not None and all(
+            self.module_index.listing(directory) is listing for directory, listing in cached[1]
+        ):
+            path, consulted = cached
+        else:
+            path, consulted = self._resolve_import_uncached(module_name, current_dir)
+            self._resolutions[key] = (path, consulted)
+
+        for directory, listing in consulted:
+            self._record_listing(directory, listing)
+        return path
+
+    def _resolve_import_uncached(
+        self, module_name: str, current_dir: str
+    ) -> tuple[Optional[Path], list[tuple[str, DirectoryListing]]]:
+        """Resolve an import by looking up candidate files in the module index.
 
-        # Try as package (directory with __init__.py)
-        package_dir = current_dir / module_name / "__init__.py"
-        if package_dir.exists():
-            return package_dir
-
-        # Try relative to root
-        if self.root_path:
-            root_relative = self.root_path / f"{module_name.replace('.', '/')}.py"
-            if root_relative.exists():
-                return root_relative
+        Args:
+            module_name: The module being imported
+            current_dir: Directory of the file containing the import
 
-        return None
+        Returns:
+            The module file (or None) and the directory listings that were consulted
+        """
+        candidates = [
+            # Handle relative imports within the same directory: a .py file
+            (current_dir, f"{module_name}.py"),
+            # ... or a package (directory with __init__.py)
+            (os.path.join(current_dir, module_name), "__init__.py"),
+        ]
+        # Then try relative to the root and the extra roots
+        relative = f"{module_name.replace('.', '/')}.py"
+        for root in self.module_index.roots:
+            candidates.append(os.path.split(os.path.join(root, relative)))
+        # Finally the search paths, where packages are the norm
+        for search_path in self.module_index.search_paths:
+            module_file = os.path.join(search_path, relative)
+            candidates.append(os.path.split(module_file))
+            candidates.append((module_file[: -len(".py")], "__init__.py"))
+
+        consulted = []
+        for directory, name in candidates:
+            listing = self.module_index.listing(directory)
+            consulted.append((directory, listing))
+            if name in listing.names:
+                return Path(directory, name), consulted
+        return None, consulted
 
     def _trace_reexport(self, module_path: Path, name: str) -> tuple[Path, str]:
         """Trace through package __init__.py re-exports to find the actual source.
@@ -66,58 +137,185 @@ class ImportResolver:
         if module_path.name != "__init__.py":
             return (module_path, name)
 
-        # Parse the __init__.py to find re-exports
-        tree = self.get_ast(module_path)
+        # If we couldn't trace it, return the original __init__.py
+        return self.get_exports(module_path).get(name, (module_path, name))
+
+    def get_exports(self, init_path: Path) -> dict[str, tuple[Path, str]]:
+        """Get the export table of a package.
+
+        The table maps every name the package re-exports from its modules and
+        subpackages to where it is defined, with chains through nested packages
+        already followed. It is computed once per __init__.py, cached with its
+        AST, and reused as long as the files and directories it was built from
+        are unchanged. Circular re-exports are cut where the cycle closes.
+
+        Args:
+            init_path: Path to the package's __init__.py
+
+        Returns:
+            Dictionary mapping exported names to (file_path, original_name)
+        """
+        self._record_dependency(init_path)
+        try:
+            entry = self.parse_cache.get_entry(init_path)
+        except (OSError, UnicodeDecodeError):
+            return {}
+
+        exports: dict[str, tuple[Path, str]]
+        cached = entry.derived.get(self._exports_key)
+        if cached is not None and self._dependencies_unchanged(cached[1]):
+            exports, dependencies = cached
+        elif str(init_path) in self._exporting:
+            return {}
+        else:
+            outer, self._dependencies = self._dependencies, {}
+            self._exporting.add(str(init_path))
+            try:
+                exports = self._collect_exports(init_path)
+                dependencies = self._dependencies
+            finally:
+                self._dependencies = outer
+                self._exporting.discard(str(init_path))
+            entry.derived[self._exports_key] = (exports, dependencies)
+
+        # Whatever depends on the table also depends on what it was built from
+        if self._dependencies is not None:
+            for path, mtime in dependencies.items():
+                self._dependencies.setdefault(path, mtime)
+        return exports
+
+    def _collect_exports(self, init_path: Path) -> dict[str, tuple[Path, str]]:
+        """Build the export table of a package (uncached, see get_exports())."""
+        tree = self.get_ast(init_path)
         if not tree:
-            return (module_path, name)
+            return {}
 
-        # Look for "from .submodule import name" patterns
+        exports: dict[str, tuple[Path, str]] = {}
         for node in ast.walk(tree):
-            if isinstance(node, ast.ImportFrom):
-                # Check if this import includes our target name
-                for alias in node.names:
-                    if alias.name == name:
-                        # Found it! Now resolve where it's actually from
-                        if node.module:
-                            # Handle relative imports (e.g., from .file_utils import ...)
-                            # Remove leading dot for relative imports
-                            submodule_name = node.module.lstrip('.')
-                            package_dir = module_path.parent
-
-                            # Try as .py file in package directory
-                            submodule_path = package_dir / f"{submodule_name}.py"
-                            if submodule_path.exists():
-                                return (submodule_path, name)
-
-                            # Try as subdirectory with __init__.py
-                            submodule_init = package_dir / submodule_name / "__init__.py"
-                            if submodule_init.exists():
-                                # Recursively trace through nested packages
-                                return self._trace_reexport(submodule_init, name)
+            if not isinstance(node, ast.ImportFrom) or not node.module:
+                continue
+            source = self._resolve_reexport_source(node, init_path)
+            if source is None:
+                continue
+            for alias in node.names:
+                if alias.name == "*":
+                    for name, target in self._star_exports(source).items():
+                        exports.setdefault(name, target)
+                else:
+                    # The first import of a name wins
+                    exports.setdefault(
+                        alias.asname or alias.name, self._trace_reexport(source, alias.name)
+                    )
+        return exports
+
+    def _resolve_reexport_source(self, node: ast.ImportFrom, init_path: Path) -> Optional[Path]:
+        """Find the module a package's ``from ... import`` statement imports from."""
+        assert node.module is not None
+        package_dir = init_path.parent
+        if node.level > 1:
+            if node.level - 2 >= len(package_dir.parents):
+                return None
+            package_dir = package_dir.parents[node.level - 2]
+
+        # A module or a subpackage of the package (or of a parent, for ``from ..x``)
+        relative = Path(*node.module.split("."))
+        submodule_path = package_dir / relative.with_name(f"{relative.name}.py")
+        if self._exists(submodule_path):
+            return submodule_path
+        submodule_init = package_dir / relative / "__init__.py"
+        if self._exists(submodule_init):
+            return submodule_init
+        return None
 
-        # If we couldn't trace it, return the original __init__.py
-        return (module_path, name)
+    def _star_exports(self, module_path: Path) -> dict[str, tuple[Path, str]]:
+        """Get the names ``from module import *`` brings in, with where they are defined.
+
+        These are the names listed in the module's ``__all__``, or else its
+        public top-level names (and, for a package, its public re-exports).
+        """
+        self._record_dependency(module_path)
+        tree = self.get_ast(module_path)
+        if not tree:
+            return {}
+        exports = self.get_exports(module_path) if module_path.name == "__init__.py" else {}
+
+        names = _module_all(tree)
+        if names is None:
+            names = [name for name in _top_level_names(tree) if not name.startswith("_")]
+            names += [name for name in exports if not name.startswith("_")]
+        return {name: exports.get(name, (module_path, name)) for name in names}
 
     def parse_imports(self, tree: ast.Module, file_path: Path) -> dict[str, tuple[Path, str]]:
-        """Parse import statements from an AST with caching.
+        """Get the import map of a file; kept for callers that already hold its AST.
 
         Args:
-            tree: The AST to parse
+            tree: The file's AST (not needed; the map is cached per file)
             file_path: Path to the file being parsed
 
         Returns:
             Dictionary mapping imported names to (file_path, original_name)
         """
-        file_str = str(file_path)
-        current_mtime = file_path.stat().st_mtime
+        return self.get_imports(file_path)
+
+    def get_imports(self, file_path: Path) -> dict[str, tuple[Path, str]]:
+        """Get the import map of a file through the shared parse cache.
 
-        # Check cache
-        if file_str in self.import_cache:
-            cached_mtime, cached_imports = self.import_cache[file_str]
-            if cached_mtime == current_mtime:
-                return cached_imports
+        The map is stored as a fact on the cache entry together with the
+        directories and files it was resolved from, per root path (imports
+        can resolve relative to the root), and is reused (even from
+        the disk cache, without parsing) as long as none of those changed.
 
-        # Parse imports
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            Dictionary mapping imported names to (file_path, original_name)
+
+        Raises:
+            OSError: If the file cannot be read
+            SyntaxError: If the file has to be parsed and is invalid
+        """
+        entry = self.parse_cache.get_entry(file_path)
+        imports: dict[str, tuple[Path, str]]
+        cached = entry.derived.get(self._imports_key)
+        if cached is not None and self._dependencies_unchanged(cached[1]):
+            imports = cached[0]
+            return imports
+
+        facts = entry.facts.get(self._imports_key)
+        if cached is None and facts is not None:
+            stored_imports, dependencies = facts
+            if self._dependencies_unchanged(dependencies):
+                imports = {
+                    name: (Path(path), original)
+                    for name, (path, original) in stored_imports.items()
+                }
+                entry.derived[self._imports_key] = (imports, dependencies)
+                return imports
+
+        self._dependencies = {}
+        try:
+            imports = self._collect_imports(entry.tree, file_path)
+            dependencies = self._dependencies
+        finally:
+            self._dependencies = None
+
+        self.module_index.persist()
+        stored = {name: (str(path), original) for name, (path, original) in imports.items()}
+        entry.set_fact(self._imports_key, (stored, dependencies))
+        entry.derived[self._imports_key] = (imports, dependencies)
+        return imports
+
+    def _collect_imports(self, tree: ast.Module, file_path: Path) -> dict[str, tuple[Path, str]]:
+        """Resolve every import statement in an AST (uncached).
+
+        Args:
+            tree: The AST to parse
+            file_path: Path to the file being parsed
+
+        Returns:
+            Dictionary mapping imported names to (file_path, original_name)
+        """
         imports = {}
 
         for node in ast.walk(tree):
@@ -142,12 +340,37 @@ class ImportResolver:
                         imported_name = alias.asname if alias.asname else alias.name
                         imports[imported_name] = (module_path, module_name)
 
-        # Cache and return
-        self.import_cache[file_str] = (current_mtime, imports)
         return imports
 
+    def _exists(self, path: Path) -> bool:
+        """Check whether a candidate module path exists, recording its directory.
+
+        Adding or removing a file changes its directory's mtime, so recording
+        the directory is enough to notice when a resolution could change.
+        """
+        directory = str(path.parent)
+        listing = self.module_index.listing(directory)
+        self._record_listing(directory, listing)
+        return path.name in listing.names
+
+    def _record_listing(self, directory: str, listing: DirectoryListing) -> None:
+        """Remember a directory the current import map depends on."""
+        if self._dependencies is not None and directory not in self._dependencies:
+            self._dependencies[directory] = listing.mtime
+
+    def _record_dependency(self, path: Path) -> None:
+        """Remember a path the current import map depends on."""
+        if self._dependencies is not None and str(path) not in self._dependencies:
+            self._dependencies[str(path)] = self.parse_cache.mtime(path)
+
+    def _dependencies_unchanged(self, dependencies: dict[str, Optional[float]]) -> bool:
+        """Check that recorded paths still have the recorded mtimes."""
+        return all(
+            self.parse_cache.mtime(Path(path)) == mtime for path, mtime in dependencies.items()
+        )
+
     def get_ast(self, file_path: Path) -> Optional[ast.Module]:
-        """Get cached or parse AST for a file with mtime-based caching.
+        """Get the AST for a file from the shared parse cache.
 
         Args:
             file_path: Path to the Python file
@@ -155,51 +378,63 @@ class ImportResolver:
         Returns:
             Parsed AST module, or None if parsing fails
         """
-        file_str = str(file_path)
-
         try:
-            current_mtime = file_path.stat().st_mtime
-
-            # Check cache
-            if file_str in self.ast_cache:
-                cached_mtime, cached_ast = self.ast_cache[file_str]
-                if cached_mtime == current_mtime:
-                    return cached_ast
-
-            # Parse and cache
-            with open(file_path, encoding="utf-8") as f:
-                source = f.read()
-            tree = ast.parse(source, filename=str(file_path))
-            self.ast_cache[file_str] = (current_mtime, tree)
-            return tree
-        except (OSError, SyntaxError):
+            return self.parse_cache.get(file_path)
+        except (OSError, SyntaxError, UnicodeDecodeError):
             return None
 
-    def find_function_def(
-        self, tree: ast.Module, function_name: str
-    ) -> Optional[ast.FunctionDef]:
+    def find_function_def(self, tree: ast.Module, function_name: str) -> Optional[FunctionNode]:
         """Find a function definition in an AST.
 
         Args:
             tree: The AST to search
-            function_name: Name of the function to find
+            function_name: Name of the function to find (or qualified name, e.g. "Class.method")
 
         Returns:
-            The FunctionDef node, or None if not found
+            The function node, or None if not found
         """
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef) and node.name == function_name:
-                return node
-        return None
+        symbols = SymbolTable.build(tree)
+        return symbols.resolve_call(function_name) or symbols.function(function_name)
+
+    def find_function_in_module(
+        self, module_path: Path, function_name: str
+    ) -> Optional[FunctionNode]:
+        """Find a function definition in a module through its cached symbol table.
+
+        Args:
+            module_path: Path to the module to search
+            function_name: Name of the function to find (or qualified name, e.g. "Class.method")
+
+        Returns:
+            The function node, or None if not found or the module cannot be read
+        """
+        symbols = self.get_symbols(module_path)
+        if symbols is None:
+            return None
+        return symbols.resolve_call(function_name) or symbols.function(function_name)
+
+    def get_symbols(self, module_path: Path) -> Optional[SymbolTable]:
+        """Get the symbol table of a module, cached with its AST.
+
+        Args:
+            module_path: Path to the module
+
+        Returns:
+            The module's symbol table, or None if it cannot be read or parsed
+        """
+        try:
+            return get_symbol_table(self.parse_cache.get_entry(module_path))
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            return None
 
     def resolve_function_source(
         self, function_name: str, imports: dict[str, tuple[Path, str]]
-    ) -> Optional[tuple[Path, ast.FunctionDef]]:
+    ) -> Optional[tuple[Path, FunctionNode]]:
         """Resolve a function call to its source definition.
 
         Args:
             function_name: Name of the function being called
-            imports: Import map from parse_imports()
+            imports: Import map from get_imports() or parse_imports()
 
         Returns:
             Tuple of (file_path, function_def) or None if not found
@@ -209,12 +444,51 @@ class ImportResolver:
             return None
 
         module_path, original_name = imports[function_name]
-        tree = self.get_ast(module_path)
-        if not tree:
+        symbols = self.get_symbols(module_path)
+        if symbols is None:
             return None
 
-        func_def = self.find_function_def(tree, original_name)
+        func_def = symbols.resolve_call(original_name)
         if not func_def:
             return None
 
         return (module_path, func_def)
+
+
+def _module_all(tree: ast.Module) -> Optional[list[str]]:
+    """Get the names listed in a module's literal ``__all__``, if it has one."""
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "__all__" for target in node.targets
+        ):
+            if isinstance(node.value, (ast.List, ast.Tuple)):
+                return [
+                    element.value
+                    for element in node.value.elts
+                    if isinstance(element, ast.Constant) and isinstance(element.value, str)
+                ]
+    return None
+
+
+def _top_level_names(tree: ast.Module) -> list[str]:
+    """Get the names a module binds at top level, in order."""
+    names = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.append(node.name)
+        elif isinstance(node, ast.Assign):
+            names.extend(
+                name.id
+                for target in node.targets
+                for name in ast.walk(target)
+                if isinstance(name, ast.Name)
+            )
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            names.append(node.target.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.extend(
+                (alias.asname or alias.name).split(".")[0]
+                for alias in node.names
+                if alias.name != "*"
+            )
+    return names
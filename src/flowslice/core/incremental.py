@@ -0,0 +1,199 @@
+"""Incremental re-analysis of edited files, one top-level block at a time.
+
+A module is split into blocks, one per top-level statement (a function or
+class with its decorators, an import, an assignment, ...). Each block has its
+own def-use index and a fingerprint of its source text. When a file changes,
+blocks whose text is unchanged keep their index, even if they moved, and
+cached slices are carried over to the new version when none of the blocks
+they depend on changed.
+"""
+
+import ast
+import bisect
+import dataclasses
+import difflib
+import hashlib
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from flowslice.core.defuse import DefUseIndex
+from flowslice.core.models import SliceDirection, SliceNode, SliceResult
+
+# Cached slices kept per file version
+MAX_CACHED_SLICES = 1024
+
+
+class Block(NamedTuple):
+    """A top-level statement (or statements sharing a line) of a module."""
+
+    start: int  # First line, including decorators
+    end: int  # Last line
+    fingerprint: str  # Hash of the block's source text
+    names: frozenset[str]  # Variables, scopes and definitions the block mentions
+    defuse: DefUseIndex  # Def-use index of the block, built when it started at defuse_start
+    defuse_start: int
+
+
+class BlockTable:
+    """The blocks of one version of a module, in source order."""
+
+    def __init__(self, blocks: list[Block]):
+        self.blocks = blocks
+        self._starts = [block.start for block in blocks]
+
+    @classmethod
+    def build(
+        cls, tree: ast.Module, source_lines: list[str], previous: Optional["BlockTable"] = None
+    ) -> "BlockTable":
+        """Split a module into blocks, reusing unchanged blocks of a previous version.
+
+        Args:
+            tree: The module AST
+            source_lines: The module's source lines
+            previous: Block table of the previous version of the module, if any
+
+        Returns:
+            The block table
+        """
+        known = {block.fingerprint: block for block in previous.blocks} if previous else {}
+
+        spans: list[tuple[int, int, list[ast.stmt]]] = []
+        for stmt in tree.body:
+            start = min([stmt.lineno] + [d.lineno for d in getattr(stmt, "decorator_list", [])])
+            end = stmt.end_lineno or stmt.lineno
+            if spans and start <= spans[-1][1]:
+                # Statements sharing a line (a = 1; b = 2) form one block
+                first, last, stmts = spans[-1]
+                spans[-1] = (first, max(last, end), stmts + [stmt])
+            else:
+                spans.append((start, end, [stmt]))
+
+        blocks = []
+        for start, end, stmts in spans:
+            text = "\n".join(source_lines[start - 1 : end])
+            fingerprint = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+            block = known.get(fingerprint)
+            if block is None:
+                module = ast.Module(body=stmts, type_ignores=[])
+                index = DefUseIndex.build(module)
+                names = index.variables() | {
+                    node.name
+                    for node in ast.walk(module)
+                    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+                }
+                blocks.append(Block(start, end, fingerprint, frozenset(names), index, start))
+            else:
+                blocks.append(block._replace(start=start, end=end))
+        return cls(blocks)
+
+    def merged_index(self) -> DefUseIndex:
+        """Assemble the def-use index of the whole module from the block indexes."""
+        index = DefUseIndex()
+        for block in self.blocks:
+            index.extend(block.defuse, block.start - block.defuse_start)
+        return index
+
+    def block_at(self, line: int) -> Optional[int]:
+        """Get the position of the block containing a line, if any."""
+        position = bisect.bisect_right(self._starts, line) - 1
+        if position >= 0 and line <= self.blocks[position].end:
+            return position
+        return None
+
+
+class CachedSlice(NamedTuple):
+    """A slice result together with what it depends on."""
+
+    result: SliceResult
+    queried: frozenset[str]  # Variables and functions the slice looked up
+    imports: dict[str, tuple[Path, str]]  # Import map the slice was computed with
+    file_mtimes: dict[str, Optional[float]]  # Imported files -> mtime when sliced
+    forward_start: Optional[int]  # Line the forward slice started at
+
+
+def migrate_slices(
+    slices: dict[tuple[int, str, SliceDirection], CachedSlice],
+    old_table: BlockTable,
+    new_table: BlockTable,
+    target_file: str,
+    new_index: DefUseIndex,
+) -> dict[tuple[int, str, SliceDirection], CachedSlice]:
+    """Carry cached slices of a file over to its next version.
+
+    A slice is kept if no changed block mentions anything it looked up and
+    every line it reported in the file lies in an unchanged block. Lines of
+    reported nodes are moved along with their blocks.
+
+    Args:
+        slices: Cached slices of the old version, keyed by (line, variable, direction)
+        old_table: Blocks of the old version
+        new_table: Blocks of the new version
+        target_file: File name used for nodes of this file in slice results
+        new_index: Def-use index of the new version
+
+    Returns:
+        The slices that are still valid, keyed by their new line
+    """
+    old_fingerprints = [block.fingerprint for block in old_table.blocks]
+    new_fingerprints = [block.fingerprint for block in new_table.blocks]
+    matcher = difflib.SequenceMatcher(None, old_fingerprints, new_fingerprints, autojunk=False)
+
+    # Line offset of every unchanged block, by old position
+    offsets: dict[int, int] = {}
+    matched_new: set[int] = set()
+    for old_start, new_start, size in matcher.get_matching_blocks():
+        for i in range(size):
+            old_block, new_block = old_table.blocks[old_start + i], new_table.blocks[new_start + i]
+            offsets[old_start + i] = new_block.start - old_block.start
+            matched_new.add(new_start + i)
+
+    changed_names: set[str] = set()
+    for position, block in enumerate(old_table.blocks):
+        if position not in offsets:
+            changed_names.update(block.names)
+    for position, block in enumerate(new_table.blocks):
+        if position not in matched_new:
+            changed_names.update(block.names)
+
+    def move(line: int) -> Optional[int]:
+        position = old_table.block_at(line)
+        if position is None or position not in offsets:
+            return None
+        return line + offsets[position]
+
+    migrated = {}
+    for (line, variable, direction), cached in slices.items():
+        new_line = move(line)
+        if new_line is None or cached.queried & changed_names:
+            continue
+        if direction != SliceDirection.BACKWARD:
+            start_line = cached.forward_start
+            moved_start = move(start_line) if start_line is not None else None
+            if moved_start != new_index.forward_start_line(new_line):
+                continue
+
+        result = cached.result
+        backward = _move_nodes(result.backward_slice, target_file, move)
+        forward = _move_nodes(result.forward_slice, target_file, move)
+        if backward is None or forward is None:
+            continue
+        result = dataclasses.replace(
+            result, target_line=new_line, backward_slice=backward, forward_slice=forward
+        )
+        migrated[(new_line, variable, direction)] = cached._replace(result=result)
+    return migrated
+
+
+def _move_nodes(
+    nodes: list[SliceNode], target_file: str, move: Callable[[int], Optional[int]]
+) -> Optional[list[SliceNode]]:
+    """Move the nodes of a file to their new lines, or None if one is in a changed block."""
+    moved_nodes = []
+    for node in nodes:
+        if node.file == target_file:
+            line = move(node.line)
+            if line is None:
+                return None
+            node = node.replace(line=line)
+        moved_nodes.append(node)
+    return moved_nodes
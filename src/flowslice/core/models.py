@@ -1,8 +1,12 @@
 """Data models for flowslice."""
 
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from sys import intern
+from typing import Any, Optional, Union
 
 
 class SliceDirection(Enum):
@@ -13,18 +17,222 @@ class SliceDirection(Enum):
     BOTH = "both"
 
 
-@dataclass
-class SliceNode:
-    """Represents a single node in the slice."""
+@dataclass(frozen=True)
+class SliceCriterion:
+    """A slicing criterion: a variable at a line of a file."""
 
-    file: str
+    file_path: str
     line: int
-    function: str
-    code: str
     variable: str
-    operation: str
-    dependencies: list[str] = field(default_factory=list)
-    context: Optional[str] = None
+    direction: SliceDirection = SliceDirection.BOTH
+
+    @classmethod
+    def parse(
+        cls, text: str, direction: SliceDirection = SliceDirection.BOTH
+    ) -> "SliceCriterion":
+        """Parse a criterion written as <file>:<line>:<variable>.
+
+        Args:
+            text: The criterion text, e.g. "main.py:42:result".
+            direction: Direction of slicing for the criterion.
+
+        Returns:
+            The parsed criterion.
+
+        Raises:
+            ValueError: If the text is not of the form <file>:<line>:<variable>.
+        """
+        parts = text.strip().rsplit(":", 2)
+        if len(parts) != 3 or not all(parts):
+            raise ValueError(f"Invalid criterion '{text.strip()}'")
+        file_path, line_str, variable = parts
+        return cls(file_path, int(line_str), variable, direction)
+
+
+@dataclass(frozen=True)
+class ExpansionLimits:
+    """Limits on following calls into other functions while slicing.
+
+    A call from the sliced file is at depth 1, a call made by that callee at
+    depth 2, and so on. File, node and time budgets apply per slice. Where a
+    limit stops the analysis, a node with operation TRUNCATED is emitted at
+    the call that was not followed.
+    """
+
+    max_depth: Optional[int] = 1  # Deepest call followed (0: none, None: unlimited)
+    max_files: Optional[int] = None  # Other files entered per slice
+    max_nodes: Optional[int] = None  # Nodes added from called functions per slice
+    time_budget: Optional[float] = None  # Seconds per slice after which calls are not followed
+
+
+TRUNCATED = "truncated"  # Operation of the node marking a call that was not followed
+
+
+class SliceNode:
+    """Represents a single node in the slice.
+
+    Nodes are slotted and their file, function, variable and operation
+    names are interned, as large slices repeat them on most nodes. A node
+    created with `lines` and no `code` keeps a reference to that shared
+    line table and reads its code from it when asked.
+    """
+
+    __slots__ = (
+        "file",
+        "line",
+        "function",
+        "_code",
+        "_lines",
+        "variable",
+        "operation",
+        "dependencies",
+        "context",
+    )
+
+    def __init__(
+        self,
+        file: str,
+        line: int,
+        function: str,
+        code: Optional[str],
+        variable: str,
+        operation: str,
+        dependencies: Optional[list[str]] = None,
+        context: Optional[str] = None,
+        lines: Optional[Sequence[str]] = None,
+    ):
+        """Initialize the node.
+
+        Args:
+            file: Name of the file the node is in
+            line: Line of the node
+            function: Function the node is in
+            code: Source code of the line, or None to read it from `lines`
+            variable: Variable the node is about
+            operation: What the line does to the variable
+            dependencies: Variables the node depends on or affects
+            context: Additional explanation
+            lines: Source lines of the file, used when `code` is None
+        """
+        self.file = intern(file)
+        self.line = line
+        self.function = intern(function)
+        if code is None and lines is not None:
+            # Index of the code in the line table; kept when the node is moved
+            self._code: Union[str, int] = line - 1
+            self._lines = lines
+        else:
+            self._code = code if code is not None else ""
+            self._lines = None
+        self.variable = intern(variable)
+        self.operation = intern(operation)
+        self.dependencies = dependencies if dependencies is not None else []
+        self.context = context
+
+    @property
+    def code(self) -> str:
+        """Source code of the node's line."""
+        if isinstance(self._code, str):
+            return self._code
+        assert self._lines is not None
+        return self._lines[self._code] if 0 <= self._code < len(self._lines) else ""
+
+    @code.setter
+    def code(self, code: str) -> None:
+        self._code = code
+        self._lines = None
+
+    def replace(self, **changes: Any) -> "SliceNode":
+        """Get a copy of the node with some attributes changed, like dataclasses.replace()."""
+        node = SliceNode.__new__(SliceNode)
+        for name in SliceNode.__slots__:
+            setattr(node, name, getattr(self, name))
+        for name, value in changes.items():
+            if name not in _NODE_FIELDS:
+                raise TypeError(f"SliceNode has no attribute '{name}'")
+            setattr(node, name, intern(value) if name in _INTERNED else value)
+        return node
+
+    def _astuple(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in _NODE_FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        assert isinstance(other, SliceNode)
+        return self._astuple() == other._astuple()
+
+    __hash__ = None  # type: ignore[assignment]  # Mutable, like a dataclass
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in _NODE_FIELDS)
+        return f"SliceNode({fields})"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickle the code itself rather than the whole line table it points into
+        return (SliceNode, self._astuple())
+
+
+_NODE_FIELDS = (
+    "file",
+    "line",
+    "function",
+    "code",
+    "variable",
+    "operation",
+    "dependencies",
+    "context",
+)
+_INTERNED = frozenset(("file", "function", "variable", "operation"))
+
+
+@dataclass
+class SliceStats:
+    """Where the time of one slice went and how much work it did.
+
+    Collected when the slicer is created with collect_stats=True. Timings
+    are wall-clock seconds per phase: "prepare.parse", "prepare.imports"
+    and "prepare.index" (only for the slice that prepared its file),
+    "backward", "forward", "cross_file" (time spent in called functions,
+    included in the pass that followed the call) and "total". Counters are
+    listed in COUNTERS.
+    """
+
+    timings: dict[str, float] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=lambda: dict.fromkeys(SliceStats.COUNTERS, 0))
+
+    COUNTERS = (
+        "iterations",  # Backward worklist iterations
+        "sites_visited",  # Definition and use sites of the def-use index processed
+        "calls_followed",  # Calls whose function was analyzed
+        "summaries_computed",  # Called function bodies walked to summarize them
+        "summaries_reused",  # Calls answered with an earlier summary
+        "files_entered",  # Other files whose functions were analyzed
+        "nodes_emitted",  # Nodes in the result
+        "slice_cache_hits",  # 1 if the result came from the slice cache
+        "cache_hits",  # Parse cache lookups answered from memory
+        "cache_misses",  # Parse cache lookups that read a file
+        "parses",  # Files parsed
+        "disk_cache_hits",  # Facts loaded from the on-disk cache
+        "disk_cache_misses",
+    )
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """Add time spent in a phase."""
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def count(self, counter: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the body of a with statement as a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
 
 
 @dataclass
@@ -36,3 +244,6 @@ class SliceResult:
     target_variable: str
     backward_slice: list[SliceNode] = field(default_factory=list)
     forward_slice: list[SliceNode] = field(default_factory=list)
+    iterations: int = 0  # Worklist iterations taken by the backward fixpoint
+    # Timings and counters, if the slicer collects them; not part of the result's value
+    stats: Optional[SliceStats] = field(default=None, compare=False)
@@ -0,0 +1,160 @@
+"""Index of the Python modules under a set of roots."""
+
+import os
+import sys
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from flowslice.core.cache import ParseCache
+from flowslice.core.disk_cache import DiskCache
+
+
+class DirectoryListing(NamedTuple):
+    """The Python file names of a directory, as of its mtime."""
+
+    mtime: Optional[float]  # None if the directory does not exist
+    names: frozenset[str]  # Entries ending with .py
+
+
+class ModuleIndex:
+    """Maps module names to files with dictionary lookups instead of file probes.
+
+    Nothing is scanned up front: a directory is listed when an import is
+    first looked up in it, so a lookup costs one listing per package level
+    however large the roots are. A listing is trusted as long as its
+    directory's mtime is unchanged (adding, removing or renaming an entry
+    changes it), so after an edit only the changed directories are listed
+    again.
+
+    The listings of the roots and of search paths (such as site-packages)
+    are kept in the parse cache's disk cache, per working directory, roots
+    and environment, so later runs do not list them again.
+    """
+
+    def __init__(
+        self,
+        roots: Iterable[Path],
+        parse_cache: ParseCache,
+        search_paths: Optional[Iterable[Path]] = None,
+    ):
+        """Initialize the index.
+
+        Args:
+            roots: Directories that dotted module names are resolved against, in order
+            parse_cache: Parse cache whose snapshots also cover directory mtimes
+            search_paths: Directories of installed packages
+        """
+        self.roots = list(roots)
+        self.search_paths = list(search_paths or [])
+        self.parse_cache = parse_cache
+        self.refreshes = 0  # Directories listed again because they changed
+        self._listings: dict[str, DirectoryListing] = {}
+        self._loaded = False  # Whether the listings stored by an earlier run were loaded
+        self._dirty = False  # Listings changed since they were loaded or stored
+
+    def __len__(self) -> int:
+        return sum(len(listing.names) for listing in self._listings.values())
+
+    def listing(self, directory: str) -> DirectoryListing:
+        """Get the up-to-date listing of a directory.
+
+        The same object is returned for as long as the directory is unchanged.
+
+        Args:
+            directory: Path of the directory
+
+        Returns:
+            Its listing, refreshed if the directory changed since it was listed
+        """
+        if not self._loaded:
+            self._load_listings()
+        mtime = self.parse_cache.mtime(directory)
+        listing = self._listings.get(directory)
+        if listing is not None and listing.mtime == mtime:
+            return listing
+
+        if listing is not None:
+            self.refreshes += 1
+        names: frozenset[str] = frozenset()
+        if mtime is not None:
+            try:
+                names = frozenset(name for name in os.listdir(directory) if name.endswith(".py"))
+            except OSError:
+                mtime = None
+        listing = DirectoryListing(mtime, names)
+        self._listings[directory] = listing
+        self._dirty = True
+        return listing
+
+    def files(self) -> Iterator[Path]:
+        """Yield every Python file under the roots (search paths are not walked).
+
+        Directory listings are reused while their directories are unchanged;
+        only the walk for subdirectories touches every directory again.
+        """
+        pending = list(reversed(self.roots))
+        seen = set()  # Roots may be nested in each other
+        while pending:
+            directory = pending.pop()
+            if str(directory) in seen:
+                continue
+            seen.add(str(directory))
+            listing = self.listing(str(directory))
+            for name in sorted(listing.names):
+                yield directory / name
+            try:
+                with os.scandir(directory) as entries:
+                    subdirectories = sorted(
+                        entry.name
+                        for entry in entries
+                        if entry.name.isidentifier()
+                        and entry.name != "__pycache__"
+                        and entry.is_dir()
+                    )
+            except OSError:
+                continue
+            pending.extend(directory / name for name in reversed(subdirectories))
+
+    def exists(self, path: Path) -> bool:
+        """Check whether a .py path exists, according to its directory's listing."""
+        return path.name in self.listing(str(path.parent)).names
+
+    def persist(self) -> None:
+        """Write the directory listings to the disk cache if they changed."""
+        disk_cache = self.parse_cache.disk_cache
+        if disk_cache is None or not self._dirty:
+            return
+        listings = {
+            directory: (listing.mtime, sorted(listing.names))
+            for directory, listing in self._listings.items()
+        }
+        disk_cache.store(self._environment_key(), {"listings": listings})
+        self._dirty = False
+
+    def _load_listings(self) -> None:
+        """Load the directory listings stored by an earlier run."""
+        self._loaded = True
+        disk_cache = self.parse_cache.disk_cache
+        if disk_cache is None:
+            return
+        facts = disk_cache.load(self._environment_key())
+        if facts is None:
+            return
+        for directory, (mtime, names) in facts.get("listings", {}).items():
+            # Validated against the directory's mtime when looked up
+            self._listings.setdefault(directory, DirectoryListing(mtime, frozenset(names)))
+
+    def _environment_key(self) -> str:
+        """Disk cache key of this interpreter, working directory, roots and search paths.
+
+        The working directory is part of the key because relative roots, and
+        the directories under them, are listed under relative paths.
+        """
+        paths = "\0".join(str(path) for path in [*self.roots, "", *self.search_paths])
+        return DiskCache.key(Path(sys.prefix), f"listings\0{os.getcwd()}\0{paths}".encode())
+
+    def clear(self) -> None:
+        """Forget every listing; stored listings are loaded again on next use."""
+        self._listings.clear()
+        self._loaded = False
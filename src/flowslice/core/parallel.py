@@ -0,0 +1,124 @@
+"""Parallel slicing of many criteria with a process pool."""
+
+import math
+import multiprocessing
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from flowslice.core.models import ExpansionLimits, SliceCriterion, SliceResult
+from flowslice.core.slicer import Slicer
+
+# Slicer used by the current worker process, created once per worker
+_worker_slicer: Optional[Slicer] = None
+
+
+def _init_worker(
+    root_path: str,
+    enable_cross_file: bool,
+    cache_dir: Optional[str],
+    search_paths: list[str],
+    limits: ExpansionLimits,
+    collect_stats: bool = False,
+) -> None:
+    """Set up the worker's slicer.
+
+    Forked workers inherit the parent's slicer together with its parse cache,
+    so files the parent already parsed are not parsed again. Otherwise a new
+    slicer is created; it shares the parent's on-disk cache, if any.
+
+    Hooks are not run in workers: whatever they record or print would stay
+    in, or interleave from, another process.
+    """
+    global _worker_slicer
+    if _worker_slicer is not None:
+        _worker_slicer.hooks.clear()  # The worker's copy; the parent's hooks are kept
+    else:
+        _worker_slicer = Slicer(
+            root_path,
+            enable_cross_file,
+            cache_dir=cache_dir,
+            search_paths=search_paths,
+            limits=limits,
+            collect_stats=collect_stats,
+        )
+
+
+def _slice_chunk(criteria: list[SliceCriterion]) -> list[SliceResult]:
+    """Slice a chunk of criteria of a single file in a worker."""
+    if _worker_slicer is None:
+        raise RuntimeError("Worker process was not initialized")
+    return list(_worker_slicer.slice_many(criteria))
+
+
+def chunk_criteria(groups: list[list[SliceCriterion]], jobs: int) -> list[list[SliceCriterion]]:
+    """Split criteria grouped by file into chunks for the workers.
+
+    Each chunk holds criteria of a single file, so a worker prepares a file
+    once per chunk. Files with many criteria are split so that the work can
+    still be spread evenly when there are fewer files than workers.
+
+    Args:
+        groups: Criteria grouped by file, as returned by Slicer.group_criteria().
+        jobs: Number of worker processes.
+
+    Returns:
+        The chunks, in the order their results should be reported.
+    """
+    total = sum(len(group) for group in groups)
+    # A few chunks per worker evens out files of different sizes
+    chunk_size = max(1, math.ceil(total / (jobs * 4)))
+    return [
+        group[start : start + chunk_size]
+        for group in groups
+        for start in range(0, len(group), chunk_size)
+    ]
+
+
+def slice_parallel(
+    slicer: Slicer, criteria: Iterable[SliceCriterion], jobs: Optional[int] = None
+) -> Iterator[SliceResult]:
+    """Slice many criteria in parallel, with results in a deterministic order.
+
+    Results are yielded in the same order as Slicer.slice_many() would yield
+    them, whatever order the workers finish in. The slicer's hooks are only
+    called for criteria sliced in this process, i.e. when a single job is used.
+
+    Args:
+        slicer: Slicer whose configuration (and caches) the workers use.
+        criteria: The slicing criteria.
+        jobs: Number of worker processes (default: one per CPU). With a single
+            job the criteria are sliced in this process.
+
+    Yields:
+        One SliceResult per criterion.
+    """
+    global _worker_slicer
+    jobs = jobs or os.cpu_count() or 1
+    groups = slicer.group_criteria(criteria)
+    if jobs == 1 or sum(len(group) for group in groups) <= 1:
+        yield from slicer.slice_many(criterion for group in groups for criterion in group)
+        return
+
+    disk_cache = slicer.parse_cache.disk_cache
+    cache_dir = str(disk_cache.cache_dir) if disk_cache is not None else None
+    initargs = (
+        str(slicer.root_path),
+        slicer.enable_cross_file,
+        cache_dir,
+        slicer.search_paths,
+        slicer.limits,
+        slicer.collect_stats,
+    )
+
+    context = multiprocessing.get_context()
+    if context.get_start_method() == "fork":
+        # Forked workers start from a copy of this slicer and its warm caches
+        _worker_slicer = slicer
+    try:
+        with ProcessPoolExecutor(jobs, context, _init_worker, initargs) as executor:
+            for results in executor.map(_slice_chunk, chunk_criteria(groups, jobs)):
+                yield from results
+    finally:
+        _worker_slicer = None
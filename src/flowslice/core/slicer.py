@@ -1,15 +1,107 @@
 """Core slicing engine for flowslice."""
 
 import ast
+import dataclasses
+import heapq
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, nullcontext
 from pathlib import Path
-from typing import Optional
-
+from typing import Callable, NamedTuple, Optional
+
+from flowslice.core.cache import CacheEntry, ParseCache
+from flowslice.core.callgraph import CallEdge, CallGraph
+from flowslice.core.defuse import (
+    CallFact,
+    DefinitionSite,
+    DefUseIndex,
+    UseSite,
+    get_base_name,
+    get_func_name,
+    get_names_from_expr,
+)
+from flowslice.core.disk_cache import DiskCache
+from flowslice.core.hooks import (
+    CACHE_HIT,
+    FUNCTION_ENTERED,
+    FUNCTION_EXITED,
+    NODE_EMITTED,
+    PASS_FINISHED,
+    PASS_STARTED,
+    Hooks,
+)
 from flowslice.core.import_resolver import ImportResolver
-from flowslice.core.models import SliceDirection, SliceNode, SliceResult
+from flowslice.core.incremental import MAX_CACHED_SLICES, BlockTable, CachedSlice, migrate_slices
+from flowslice.core.models import (
+    TRUNCATED,
+    ExpansionLimits,
+    SliceCriterion,
+    SliceDirection,
+    SliceNode,
+    SliceResult,
+    SliceStats,
+)
+from flowslice.core.summaries import FunctionSummary, SummaryCache, summarize
+from flowslice.core.symbols import FunctionNode, get_symbol_table
+
+
+def _format_names(names: set[str]) -> str:
+    """Format a set of variable names like a set literal, in sorted order."""
+    return "{" + ", ".join(repr(name) for name in sorted(names)) + "}"
+
+
+class CallSite(NamedTuple):
+    """Where a followed call is made, for the node marking it if it is not followed."""
+
+    file: str
+    line: int
+    function: str
+    code: str
+
+
+class ExpansionBudget:
+    """What one slice may still spend on following calls (see ExpansionLimits)."""
+
+    def __init__(self, limits: ExpansionLimits):
+        self.limits = limits
+        self.files: set[str] = set()  # Other files entered so far
+        self.nodes = 0  # Nodes added from called functions so far
+        self.deadline = (
+            time.perf_counter() + limits.time_budget if limits.time_budget is not None else None
+        )
+        self.timed_out = False  # Whether the result depends on how fast the slice ran
+
+    def exceeded(self, depth: int, file_path: Optional[Path]) -> Optional[str]:
+        """Check whether following a call would exceed a limit.
+
+        Args:
+            depth: Depth the called function would be analyzed at
+            file_path: File of the called function, if it is another file
+
+        Returns:
+            A description of the limit reached, or None if the call can be followed
+        """
+        limits = self.limits
+        if limits.max_depth is not None and depth > limits.max_depth:
+            return f"max depth {limits.max_depth} reached"
+        if (
+            file_path is not None
+            and limits.max_files is not None
+            and str(file_path) not in self.files
+            and len(self.files) >= limits.max_files
+        ):
+            return f"max files {limits.max_files} reached"
+        if limits.max_nodes is not None and self.nodes >= limits.max_nodes:
+            return f"max nodes {limits.max_nodes} reached"
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            self.timed_out = True
+            return f"time budget of {limits.time_budget}s exceeded"
+        return None
 
 
-class SlicerVisitor(ast.NodeVisitor):
-    """AST visitor for dataflow slicing."""
+class SlicerVisitor:
+    """Dataflow slicer of one criterion in one direction, driven by a def-use index."""
 
     def __init__(
         self,
@@ -20,7 +112,12 @@ class SlicerVisitor(ast.NodeVisitor):
         current_file: str = "<current>",
         imports: Optional[dict[str, tuple[Path, str]]] = None,
         import_resolver: Optional[ImportResolver] = None,
-        function_defs: Optional[dict[str, ast.FunctionDef]] = None,
+        call_graph: Optional[CallGraph] = None,
+        current_path: Optional[Path] = None,
+        summaries: Optional[SummaryCache] = None,
+        budget: Optional[ExpansionBudget] = None,
+        stats: Optional[SliceStats] = None,
+        hooks: Optional[Hooks] = None,
     ):
         self.target_var = target_var
         self.target_line = target_line
@@ -29,281 +126,330 @@ class SlicerVisitor(ast.NodeVisitor):
         self.current_file = current_file  # Track current file for cross-file analysis
         self.imports = imports or {}  # Map of imported names to (file_path, original_name)
         self.import_resolver = import_resolver  # For resolving cross-file calls
-        self.function_defs = function_defs or {}  # Local function definitions
+        self.call_graph = call_graph  # Resolved calls of the project
+        self.current_path = current_path  # Full path of the current file, as in the call graph
+        self.summaries = summaries  # Memoized summaries of called functions
+        self.budget = budget or ExpansionBudget(ExpansionLimits())  # Limits on following calls
+        self.call_stack: list[FunctionNode] = []  # Called functions being analyzed
+        self.stats = stats  # Counters of the slice, if collected
+        self.hooks = hooks  # Hooks to tell about entered functions, if any are registered
 
         self.nodes: list[SliceNode] = []
         self.current_function = "<module>"
-        self.function_stack = ["<module>"]
-        self.started = False
         self.target_function: Optional[str] = None  # Track function containing target
+        self.called: set[str] = set()  # Names of functions whose calls were followed
 
         if direction == SliceDirection.BACKWARD:
             self.relevant_vars: set[str] = {target_var}
         else:  # forward
             self.affected_vars: set[str] = {target_var}
 
-    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
-        """Track function context."""
-        self.function_stack.append(node.name)
-        self.current_function = node.name
-
-        # Check parameters
-        if self.direction == SliceDirection.BACKWARD:
-            for arg in node.args.args:
-                if arg.arg in self.relevant_vars:
-                    self.nodes.append(
-                        SliceNode(
-                            file=self.current_file,
-                            line=node.lineno,
-                            function=self.current_function,
-                            code=f"def {node.name}(..., {arg.arg}, ...)",
-                            variable=arg.arg,
-                            operation="parameter",
-                            dependencies=[],
-                        )
-                    )
+    def run_backward_worklist(self, index: DefUseIndex) -> int:
+        """Compute the backward slice as a worklist fixpoint.
 
-        self.generic_visit(node)
-        self.function_stack.pop()
-        self.current_function = (
-            self.function_stack[-1] if self.function_stack else "<module>"
-        )
+        Only the definition sites of newly discovered variables are looked up
+        in the index, so each site is handled at most once and there is no
+        pass limit. Nodes are ordered as a single visit of the module would
+        produce them.
 
-    def visit_Assign(self, node: ast.Assign) -> None:
-        """Track assignments."""
-        if self.direction == SliceDirection.BACKWARD:
-            # Only include assignments at or before the target line
-            if node.lineno <= self.target_line:
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id in self.relevant_vars:
-                        rhs_vars = self._get_names_from_expr(node.value)
-                        code = (
-                            self.source_lines[node.lineno - 1]
-                            if node.lineno <= len(self.source_lines)
-                            else ""
-                        )
+        Args:
+            index: Def-use index of the module
 
-                        # Filter to most specific attribute paths
-                        filtered_deps = self._filter_most_specific(rhs_vars)
+        Returns:
+            Number of worklist iterations (variables processed)
+        """
+        worklist = deque(sorted(self.relevant_vars))
+        queued = set(self.relevant_vars)
+        chunks: list[tuple[int, list[SliceNode]]] = []
+        iterations = 0
+        visited = 0
+
+        while worklist:
+            var = worklist.popleft()
+            iterations += 1
+            for site in index.definitions(var):
+                visited += 1
+                start = len(self.nodes)
+                new_vars = self._emit_definition_site(site)
+                chunks.append((site.order, self.nodes[start:]))
+                for new_var in sorted(new_vars - queued):
+                    queued.add(new_var)
+                    worklist.append(new_var)
+
+        self.relevant_vars = queued
+        if self.stats is not None:
+            self.stats.count("sites_visited", visited)
+        chunks.sort(key=lambda chunk: chunk[0])
+        self.nodes = [node for _, chunk in chunks for node in chunk]
+        return iterations
+
+    def run_forward_index(self, index: DefUseIndex) -> None:
+        """Compute the forward slice from the uses recorded in the index.
+
+        Uses of affected variables are processed in visit order through a heap,
+        so only statements that read an affected variable are touched. This
+        produces the same nodes as visiting the target function in order.
 
-                        self.nodes.append(
-                            SliceNode(
-                                file=self.current_file,
-                                line=node.lineno,
-                                function=self.current_function,
-                                code=code,
-                                variable=target.id,
-                                operation="assignment",
-                                dependencies=list(filtered_deps),
-                            )
-                        )
+        Args:
+            index: Def-use index of the module
+        """
+        start = index.forward_start(self.target_line)
+        if start is None:
+            return
+        start_order, function = start
+        self.target_function = function
+        self.current_function = function
+
+        heap: list[tuple[int, UseSite]] = []
+        queued: set[int] = set()
+
+        def push_uses(variable: str, after: int) -> None:
+            for site in index.uses(variable, function):
+                if site.order >= after and site.order not in queued:
+                    queued.add(site.order)
+                    heapq.heappush(heap, (site.order, site))
+
+        for variable in sorted(self.affected_vars):
+            push_uses(variable, start_order)
+
+        while heap:
+            order, site = heapq.heappop(heap)
+            before = set(self.affected_vars)
+            self._emit_use_site(site)
+            for variable in sorted(self.affected_vars - before):
+                push_uses(variable, order)
+        if self.stats is not None:
+            self.stats.count("sites_visited", len(queued))
+
+    def _emit_definition_site(self, site: DefinitionSite) -> set[str]:
+        """Emit the backward slice nodes for one definition site.
 
-                        # Check if RHS is a function call (imported or local)
-                        # If so, follow into it because it produces the tracked variable
-                        if isinstance(node.value, ast.Call):
-                            func_call = node.value
-                            if isinstance(func_call.func, ast.Name):
-                                arg_vars = set()
-                                for arg in func_call.args:
-                                    arg_vars.update(self._get_names_from_expr(arg))
-                                if arg_vars:  # Only if it has arguments
-                                    # Try cross-file first, falls back to local
-                                    self._analyze_cross_file_call(func_call, arg_vars, node.lineno)
-
-                        # Add RHS vars to relevant set
-                        self.relevant_vars.update(rhs_vars)
+        Args:
+            site: The definition site of a relevant variable
 
-        else:  # forward
-            if not self.started and node.lineno >= self.target_line:
-                self.started = True
-                self.target_function = self.current_function  # Capture target's function
-
-            # Only include nodes from the same function as the target
-            if self.started and self.current_function == self.target_function:
-                rhs_vars = self._get_names_from_expr(node.value)
-                if rhs_vars & self.affected_vars:
-                    for target in node.targets:
-                        if isinstance(target, ast.Name):
-                            code = (
-                                self.source_lines[node.lineno - 1]
-                                if node.lineno <= len(self.source_lines)
-                                else ""
-                            )
-                            self.nodes.append(
-                                SliceNode(
-                                    file=self.current_file,
-                                    line=node.lineno,
-                                    function=self.current_function,
-                                    code=code,
-                                    variable=target.id,
-                                    operation="assignment",
-                                    dependencies=list(rhs_vars & self.affected_vars),
-                                )
-                            )
-                            self.affected_vars.add(target.id)
+        Returns:
+            Variables the definition depends on
+        """
+        self.current_function = site.function
 
-        self.generic_visit(node)
+        if site.kind == "parameter":
+            self._emit_parameter(site.function, site.line, site.variable)
+            return set()
 
-    def visit_Expr(self, node: ast.Expr) -> None:
-        """Track method calls like list.append()."""
-        if isinstance(node.value, ast.Call) and isinstance(
-            node.value.func, ast.Attribute
-        ):
-            obj = self._get_base_name(node.value.func.value)
-            method = node.value.func.attr
-
-            if self.direction == SliceDirection.BACKWARD:
-                # Only include method calls at or before the target line
-                if node.lineno <= self.target_line and obj in self.relevant_vars:
-                    args = [self._get_names_from_expr(arg) for arg in node.value.args]
-                    all_args = set()
-                    for arg_set in args:
-                        all_args.update(arg_set)
-
-                    code = (
-                        self.source_lines[node.lineno - 1]
-                        if node.lineno <= len(self.source_lines)
-                        else ""
-                    )
-                    self.nodes.append(
-                        SliceNode(
-                            file=self.current_file,
-                            line=node.lineno,
-                            function=self.current_function,
-                            code=code,
-                            variable=obj,
-                            operation=f".{method}()",
-                            dependencies=list(all_args),
-                        )
-                    )
-                    self.relevant_vars.update(all_args)
-
-            else:  # forward
-                # Only include nodes from the same function as the target
-                if (self.started and
-                    self.current_function == self.target_function and
-                    obj in self.affected_vars):
-                    code = (
-                        self.source_lines[node.lineno - 1]
-                        if node.lineno <= len(self.source_lines)
-                        else ""
-                    )
-                    self.nodes.append(
-                        SliceNode(
-                            file=self.current_file,
-                            line=node.lineno,
-                            function=self.current_function,
-                            code=code,
-                            variable=obj,
-                            operation=f".{method}()",
-                            dependencies=[],
-                        )
-                    )
+        # Everything except parameters must be at or before the target line
+        if site.line > self.target_line:
+            return set()
+
+        uses = set(site.uses)
+        if site.kind == "assignment":
+            self._emit_backward_assign(site.line, site.variable, uses, site.call)
+        elif site.kind == "for":
+            self._emit_backward_for(site.line, site.variable, uses)
+        elif site.kind == "method":
+            self._emit_backward_method_call(site.line, site.variable, site.detail, uses)
+        return uses
+
+    def _emit_use_site(self, site: UseSite) -> None:
+        """Emit the forward slice nodes for one use site.
+
+        Args:
+            site: A use site that reads an affected variable
+        """
+        if site.kind == "assignment":
+            self._emit_forward_assign(site.line, list(site.targets), set(site.uses[0]))
+        elif site.kind == "for":
+            self._emit_forward_for(site.line, site.targets[0], set(site.uses[0]))
+        elif site.kind == "method":
+            self._emit_forward_method_call(site.line, site.targets[0], site.detail)
+        elif site.kind == "call" and site.call is not None:
+            self._emit_forward_call(site.line, site.call)
+
+    def _get_code(self, lineno: int) -> str:
+        """Get the source line for a line number, or "" if out of range."""
+        return self.source_lines[lineno - 1] if lineno <= len(self.source_lines) else ""
+
+    def _emit_parameter(self, function_name: str, line: int, arg_name: str) -> None:
+        """Record a function parameter that defines a relevant variable."""
+        self.nodes.append(
+            SliceNode(
+                file=self.current_file,
+                line=line,
+                function=self.current_function,
+                code=f"def {function_name}(..., {arg_name}, ...)",
+                variable=arg_name,
+                operation="parameter",
+                dependencies=[],
+            )
+        )
+
+    def _emit_backward_assign(
+        self, line: int, target: str, rhs_vars: set[str], call: Optional[CallFact]
+    ) -> None:
+        """Record an assignment to a relevant variable.
+
+        Args:
+            line: Line of the assignment
+            target: The assigned name that is relevant to the slice
+            rhs_vars: Variables used on the right-hand side
+            call: The right-hand side, if it is a call
+        """
+        # Filter to most specific attribute paths
+        filtered_deps = self._filter_most_specific(rhs_vars)
+
+        self.nodes.append(
+            SliceNode(
+                file=self.current_file,
+                line=line,
+                function=self.current_function,
+                code=None,
+                lines=self.source_lines,
+                variable=target,
+                operation="assignment",
+                dependencies=sorted(filtered_deps),
+            )
+        )
+
+        # Check if RHS is a function call (imported, local or a method)
+        # If so, follow into it because it produces the tracked variable
+        if call is not None and call.name != "<unknown>":
+            arg_vars: set[str] = set()
+            for names in call.args:
+                arg_vars.update(names)
+            if arg_vars:  # Only if it has arguments
+                self._analyze_call(call, arg_vars, line)
+
+    def _emit_backward_method_call(
+        self, line: int, obj: str, method: str, arg_vars: set[str]
+    ) -> None:
+        """Record a method call (e.g. list.append()) on a relevant variable.
+
+        Args:
+            line: Line of the call
+            obj: Base name of the object the method is called on
+            method: Name of the method being called
+            arg_vars: Variables passed as arguments
+        """
+        self.nodes.append(
+            SliceNode(
+                file=self.current_file,
+                line=line,
+                function=self.current_function,
+                code=None,
+                lines=self.source_lines,
+                variable=obj,
+                operation=f".{method}()",
+                dependencies=sorted(arg_vars),
+            )
+        )
 
-        self.generic_visit(node)
-
-    def visit_For(self, node: ast.For) -> None:
-        """Track for loops."""
-        if self.direction == SliceDirection.BACKWARD:
-            # Only include for loops at or before the target line
-            if (node.lineno <= self.target_line and
-                isinstance(node.target, ast.Name) and
-                node.target.id in self.relevant_vars):
-                iter_vars = self._get_names_from_expr(node.iter)
-                code = (
-                    self.source_lines[node.lineno - 1]
-                    if node.lineno <= len(self.source_lines)
-                    else ""
+    def _emit_backward_for(self, line: int, target: str, iter_vars: set[str]) -> None:
+        """Record a for loop whose target is a relevant variable.
+
+        Args:
+            line: Line of the loop
+            target: The loop variable
+            iter_vars: Variables used in the iterable
+        """
+        self.nodes.append(
+            SliceNode(
+                file=self.current_file,
+                line=line,
+                function=self.current_function,
+                code=None,
+                lines=self.source_lines,
+                variable=target,
+                operation="for loop",
+                dependencies=sorted(iter_vars),
+                context=f"iterates over {_format_names(iter_vars)}",
+            )
+        )
+
+    def _emit_forward_assign(self, line: int, targets: list[str], rhs_vars: set[str]) -> None:
+        """Record an assignment whose right-hand side reads an affected variable."""
+        if not rhs_vars & self.affected_vars:
+            return
+        for target in targets:
+            self.nodes.append(
+                SliceNode(
+                    file=self.current_file,
+                    line=line,
+                    function=self.current_function,
+                    code=None,
+                    lines=self.source_lines,
+                    variable=target,
+                    operation="assignment",
+                    dependencies=sorted(rhs_vars & self.affected_vars),
                 )
+            )
+            self.affected_vars.add(target)
 
+    def _emit_forward_method_call(self, line: int, obj: str, method: str) -> None:
+        """Record a method call on an affected variable."""
+        if obj not in self.affected_vars:
+            return
+        self.nodes.append(
+            SliceNode(
+                file=self.current_file,
+                line=line,
+                function=self.current_function,
+                code=None,
+                lines=self.source_lines,
+                variable=obj,
+                operation=f".{method}()",
+                dependencies=[],
+            )
+        )
+
+    def _emit_forward_for(self, line: int, target: str, iter_vars: set[str]) -> None:
+        """Record a for loop iterating over an affected variable."""
+        if not iter_vars & self.affected_vars:
+            return
+        self.nodes.append(
+            SliceNode(
+                file=self.current_file,
+                line=line,
+                function=self.current_function,
+                code=None,
+                lines=self.source_lines,
+                variable=target,
+                operation="for loop",
+                dependencies=sorted(iter_vars & self.affected_vars),
+                context=f"iterates over {_format_names(iter_vars & self.affected_vars)}",
+            )
+        )
+        self.affected_vars.add(target)
+
+    def _emit_forward_call(self, line: int, call: CallFact) -> None:
+        """Record each call argument that passes an affected variable.
+
+        Args:
+            line: Line of the call
+            call: The call, with the variables used by each positional argument
+        """
+        for names in call.args:
+            arg_vars = set(names)
+            check_set = self.affected_vars
+            if arg_vars & check_set:
                 self.nodes.append(
                     SliceNode(
                         file=self.current_file,
-                        line=node.lineno,
+                        line=line,
                         function=self.current_function,
-                        code=code,
-                        variable=node.target.id,
-                        operation="for loop",
-                        dependencies=list(iter_vars),
-                        context=f"iterates over {iter_vars}",
+                        code=None,
+                        lines=self.source_lines,
+                        variable=sorted(arg_vars & check_set)[0],
+                        operation=f"passed to {call.name}()",
+                        dependencies=sorted(arg_vars & check_set),
                     )
                 )
-                self.relevant_vars.update(iter_vars)
-
-        else:  # forward
-            # Only include nodes from the same function as the target
-            if self.started and self.current_function == self.target_function:
-                iter_vars = self._get_names_from_expr(node.iter)
-                if iter_vars & self.affected_vars:
-                    code = (
-                        self.source_lines[node.lineno - 1]
-                        if node.lineno <= len(self.source_lines)
-                        else ""
-                    )
-                    if isinstance(node.target, ast.Name):
-                        self.nodes.append(
-                            SliceNode(
-                                file=self.current_file,
-                                line=node.lineno,
-                                function=self.current_function,
-                                code=code,
-                                variable=node.target.id,
-                                operation="for loop",
-                                dependencies=list(iter_vars & self.affected_vars),
-                                context=f"iterates over {iter_vars & self.affected_vars}",
-                            )
-                        )
-                        self.affected_vars.add(node.target.id)
-
-        self.generic_visit(node)
-
-    def visit_Call(self, node: ast.Call) -> None:
-        """Track function calls."""
-        # For forward slicing, track where variables are used in function calls
-        # For backward slicing, we only care about calls that PRODUCE tracked variables
-        # (handled in visit_Assign)
-        if self.direction == SliceDirection.FORWARD and self.started:
-            # Check arguments
-            for arg in node.args:
-                arg_vars = self._get_names_from_expr(arg)
-                check_set = self.affected_vars
-
-                # Only include if in same function as target
-                if not (self.started and self.current_function == self.target_function):
-                    continue
-
-                if arg_vars & check_set and hasattr(node, "lineno"):
-                    code = (
-                        self.source_lines[node.lineno - 1]
-                        if node.lineno <= len(self.source_lines)
-                        else ""
-                    )
-                    func_name = self._get_func_name(node.func)
-                    self.nodes.append(
-                        SliceNode(
-                            file=self.current_file,
-                            line=node.lineno,
-                            function=self.current_function,
-                            code=code,
-                            variable=list(arg_vars & check_set)[0],
-                            operation=f"passed to {func_name}()",
-                            dependencies=list(arg_vars & check_set),
-                        )
-                    )
-
-                    # Cross-file analysis: follow into imported functions
-                    if self.import_resolver and isinstance(node.func, ast.Name):
-                        self._analyze_cross_file_call(node, arg_vars & check_set, node.lineno)
 
-        self.generic_visit(node)
+                # Cross-file analysis: follow into called functions
+                if self.import_resolver and call.name != "<unknown>":
+                    self._analyze_call(call, arg_vars & check_set, line)
 
     def _get_func_name(self, node: ast.expr) -> str:
         """Get function name from call."""
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            return f"{self._get_base_name(node.value)}.{node.attr}"
-        return "<unknown>"
+        return get_func_name(node)
 
     def _filter_most_specific(self, names: set[str]) -> set[str]:
         """Filter to keep only the most specific attribute paths.
@@ -336,258 +482,269 @@ class SlicerVisitor(ast.NodeVisitor):
         return result
 
     def _get_names_from_expr(self, expr: ast.expr) -> set[str]:
-        """Extract all variable names from an expression, including attributes.
+        """Extract all variable names from an expression, including attributes."""
+        return get_names_from_expr(expr)
 
-        Examples:
-            args.file -> {"args.file", "args"}
-            obj.attr.subattr -> {"obj.attr.subattr", "obj.attr", "obj"}
-            simple_var -> {"simple_var"}
-        """
-        names: set[str] = set()
-
-        class NameCollector(ast.NodeVisitor):
-            def visit_Name(self, node: ast.Name) -> None:
-                names.add(node.id)
-
-            def visit_Attribute(self, node: ast.Attribute) -> None:
-                # Get the full attribute path
-                full_path = self._get_full_attr_path(node)
-                if full_path:
-                    names.add(full_path)
-                    # Also add intermediate paths for tracking
-                    # e.g., for "a.b.c" add "a.b" and "a"
-                    parts = full_path.split(".")
-                    for i in range(len(parts) - 1, 0, -1):
-                        names.add(".".join(parts[:i]))
-                # Continue visiting to get nested attributes
-                self.generic_visit(node)
-
-            def visit_ListComp(self, node: ast.ListComp) -> None:
-                """Handle list comprehensions: [x*2 for x in source]."""
-                # Visit the iterator (source)
-                for generator in node.generators:
-                    self.visit(generator.iter)
-                # Note: Don't visit the target (x) as it's local to comprehension
-
-            def visit_SetComp(self, node: ast.SetComp) -> None:
-                """Handle set comprehensions: {x*2 for x in source}."""
-                for generator in node.generators:
-                    self.visit(generator.iter)
-
-            def visit_DictComp(self, node: ast.DictComp) -> None:
-                """Handle dict comprehensions: {k: v for k, v in items}."""
-                for generator in node.generators:
-                    self.visit(generator.iter)
-
-            def visit_GeneratorExp(self, node: ast.GeneratorExp) -> None:
-                """Handle generator expressions: (x*2 for x in source)."""
-                for generator in node.generators:
-                    self.visit(generator.iter)
-
-            def _get_full_attr_path(self, node: ast.expr) -> str:
-                """Build full attribute path like 'obj.attr.subattr'."""
-                if isinstance(node, ast.Name):
-                    return node.id
-                elif isinstance(node, ast.Attribute):
-                    base = self._get_full_attr_path(node.value)
-                    if base:
-                        return f"{base}.{node.attr}"
-                return ""
-
-        NameCollector().visit(expr)
-        return names
-
-    def _get_base_name(self, node: ast.expr) -> str:
-        """Get the base variable name from an attribute chain."""
-        if isinstance(node, ast.Name):
-            return node.id
-        elif isinstance(node, ast.Attribute):
-            return self._get_base_name(node.value)
-        return ""
-
-    def _analyze_local_function_call(
-        self, call_node: ast.Call, relevant_args: set[str], call_site_line: int
-    ) -> None:
-        """Analyze a call to a local function (defined in same file).
+    def _map_call_arguments(
+        self, call: CallFact, func_def: FunctionNode, relevant_args: set[str], bound: bool
+    ) -> dict[str, set[str]]:
+        """Map positional call arguments that carry relevant variables to parameters.
 
         Args:
-            call_node: The Call node to analyze
+            call: The call being analyzed
+            func_def: Definition of the called function
             relevant_args: Set of argument variable names that are relevant to the slice
-            call_site_line: Line number where the function is called
-        """
-        if not isinstance(call_node.func, ast.Name):
-            return
-
-        func_name = call_node.func.id
+            bound: Whether the instance or class is passed implicitly (``self.save(x)``)
 
-        # Check if this is a local function
-        if func_name not in self.function_defs:
-            return
-
-        func_def = self.function_defs[func_name]
+        Returns:
+            Mapping of parameter names to the variables passed for them
+        """
+        decorators = {get_base_name(decorator) for decorator in func_def.decorator_list}
+        params = func_def.args.args
+        if "staticmethod" not in decorators and (bound or "classmethod" in decorators):
+            params = params[1:]  # self or cls
 
-        # Map call arguments to function parameters
-        param_mapping = {}
-        for i, arg in enumerate(call_node.args):
-            if i < len(func_def.args.args):
-                param_name = func_def.args.args[i].arg
-                arg_vars = self._get_names_from_expr(arg)
+        # e.g., process_data(file_path) -> parameter 'input_file'
+        param_mapping = {}  # param_name -> arg_vars
+        for i, arg_vars in enumerate(call.args):
+            if i < len(params):
+                param_name = params[i].arg
                 if arg_vars & relevant_args:
-                    param_mapping[param_name] = arg_vars
-
-        if not param_mapping:
-            return
+                    param_mapping[param_name] = set(arg_vars)
+        return param_mapping
 
-        # Analyze the local function body for dataflow
-        if self.direction == SliceDirection.BACKWARD:
-            self._backward_slice_local_function(func_def, param_mapping)
-        else:  # FORWARD
-            self._forward_slice_local_function(func_def, param_mapping)
-
-    def _analyze_cross_file_call(
-        self, call_node: ast.Call, relevant_args: set[str], call_site_line: int
-    ) -> None:
-        """Analyze a function call that may be from an imported module.
+    def _analyze_call(self, call: CallFact, relevant_args: set[str], call_site_line: int) -> None:
+        """Analyze a call made in the sliced file through the call graph.
 
         Args:
-            call_node: The Call node to analyze
+            call: The call to analyze
             relevant_args: Set of argument variable names that are relevant to the slice
-            call_site_line: Line number where the function is called (for ordering)
+            call_site_line: Line number where the function is called
         """
-        if not isinstance(call_node.func, ast.Name):
-            return
-
-        func_name = call_node.func.id
-
-        # Check if this function is imported
-        if func_name not in self.imports:
-            # Check if it's a local function instead
-            self._analyze_local_function_call(call_node, relevant_args, call_site_line)
+        self.called.update(call.name.split("."))
+        if self.call_graph is None or self.current_path is None:
             return
-
-        # Resolve the function to its source
-        if not self.import_resolver:
-            return
-        result = self.import_resolver.resolve_function_source(func_name, self.imports)
-        if not result:
+        edge = self.call_graph.edge(self.current_path, call_site_line, call.name)
+        if edge is None:
             return
+        site = CallSite(
+            self.current_file, call_site_line, self.current_function, self._get_code(call_site_line)
+        )
+        self._follow_edge(call, edge, relevant_args, site)
 
-        file_path, func_def = result
+    def _follow_edge(
+        self, call: CallFact, edge: CallEdge, relevant_args: set[str], site: CallSite
+    ) -> None:
+        """Follow a resolved call if it passes relevant arguments to the called function.
 
-        # Get the source lines for the imported file
-        try:
-            with open(file_path, encoding="utf-8") as f:
-                imported_source_lines = f.readlines()
-        except (OSError, UnicodeDecodeError):
+        Args:
+            call: The call being followed
+            edge: The call's edge in the call graph
+            relevant_args: Set of argument variable names that are relevant to the slice
+            site: Where the call is made
+        """
+        assert self.call_graph is not None
+        func_def = self.call_graph.function(edge)
+        if func_def is None:
             return
 
         # Map call arguments to function parameters
-        # e.g., process_data(file_path) -> parameter 'input_file'
-        param_mapping = {}  # param_name -> arg_vars
-        for i, arg in enumerate(call_node.args):
-            if i < len(func_def.args.args):
-                param_name = func_def.args.args[i].arg
-                arg_vars = self._get_names_from_expr(arg)
-                if arg_vars & relevant_args:
-                    param_mapping[param_name] = arg_vars
-
+        param_mapping = self._map_call_arguments(call, func_def, relevant_args, edge.bound)
         if not param_mapping:
             return
+        self._follow_call(call, func_def, Path(edge.callee_path), param_mapping, site)
 
-        # Analyze the imported function body for dataflow
-        if self.direction == SliceDirection.BACKWARD:
-            self._backward_slice_imported_function(
-                func_def, file_path, imported_source_lines, param_mapping
-            )
-        else:  # FORWARD
-            self._forward_slice_imported_function(
-                func_def, file_path, imported_source_lines, param_mapping
-            )
-
-    def _forward_slice_imported_function(
+    def _follow_call(
         self,
-        func_def: ast.FunctionDef,
+        call: CallFact,
+        func_def: FunctionNode,
         file_path: Path,
-        source_lines: list[str],
         param_mapping: dict[str, set[str]],
+        site: CallSite,
     ) -> None:
-        """Perform forward slicing on an imported function.
+        """Add the dataflow of a called function, and of the calls it makes, within limits.
+
+        Calls the function passes tracked variables on to are followed too,
+        as long as the expansion limits allow; where a limit is reached, a
+        truncation node is emitted at the call instead.
 
         Args:
-            func_def: The function definition AST node
+            call: The call being followed
+            func_def: The called function
             file_path: Path to the file containing the function
-            source_lines: Source code lines of the imported file
             param_mapping: Mapping of parameter names to argument variables
+            site: Where the call is made
         """
-        # Start tracking from the parameters we care about
-        affected_vars = set(param_mapping.keys())
-
-        # Walk through the function body forward to see where parameters are used
-        for stmt in func_def.body:
-            self._track_statement_forward(
-                stmt, affected_vars, file_path, source_lines, func_def.name
+        if func_def in self.call_stack:
+            return  # Recursion adds nothing the outer analysis does not already add
+
+        other_file = file_path if file_path != self.current_path else None
+        reason = self.budget.exceeded(len(self.call_stack) + 1, other_file)
+        if reason is not None:
+            relevant = sorted(set().union(*param_mapping.values()))
+            self.nodes.append(
+                SliceNode(
+                    file=site.file,
+                    line=site.line,
+                    function=site.function,
+                    code=site.code,
+                    variable=relevant[0],
+                    operation=TRUNCATED,
+                    dependencies=relevant,
+                    context=f"{call.name}() not followed: {reason}",
+                )
             )
-
-    def _backward_slice_local_function(
-        self, func_def: ast.FunctionDef, param_mapping: dict[str, set[str]]
+            return
+        if other_file is not None:
+            self.budget.files.add(str(other_file))
+
+        load_source_lines = self._source_line_loader(file_path)
+        before = len(self.nodes)
+        # Time is only taken for the outermost call, which includes the nested ones
+        started = time.perf_counter() if self.stats is not None and not self.call_stack else None
+        self.call_stack.append(func_def)
+        if self.hooks is not None:
+            self.hooks.emit(FUNCTION_ENTERED, (file_path, func_def.name))
+        try:
+            summary = self._apply_function_summary(
+                func_def, file_path, load_source_lines, param_mapping
+            )
+            self.budget.nodes += len(self.nodes) - before
+            if summary is not None and summary.calls:
+                self._follow_nested_calls(func_def, file_path, load_source_lines, summary)
+        finally:
+            self.call_stack.pop()
+            if self.hooks is not None:
+                self.hooks.emit(FUNCTION_EXITED, (file_path, func_def.name))
+            if self.stats is not None:
+                self.stats.count("calls_followed")
+                if started is not None:
+                    self.stats.add_time("cross_file", time.perf_counter() - started)
+
+    def _follow_nested_calls(
+        self,
+        func_def: FunctionNode,
+        file_path: Path,
+        load_source_lines: Callable[[], Optional[list[str]]],
+        summary: FunctionSummary,
     ) -> None:
-        """Perform backward slicing on a local function.
+        """Follow the calls a called function passes tracked variables to.
 
         Args:
-            func_def: The function definition AST node
-            param_mapping: Mapping of parameter names to argument variables
+            func_def: The called function
+            file_path: Path to the file containing the function
+            load_source_lines: Returns the source lines of that file
+            summary: The function's summary for the tracked parameters
         """
-        # Start tracking from the parameters we care about
-        tracked_vars = set(param_mapping.keys())
-
-        # Walk through the function body to track dependencies
-        for stmt in func_def.body:
-            self._track_statement_backward(
-                stmt, tracked_vars, Path(self.current_file), self.source_lines, func_def.name
-            )
-
-    def _forward_slice_local_function(
-        self, func_def: ast.FunctionDef, param_mapping: dict[str, set[str]]
-    ) -> None:
-        """Perform forward slicing on a local function.
+        assert self.call_graph is not None
+        source_lines = load_source_lines()
+        if source_lines is None:
+            return
+        for node in ast.walk(func_def):
+            if not isinstance(node, ast.Call):
+                continue
+            call = CallFact.from_node(node)
+            if call.name not in summary.calls:
+                continue
+            self.called.update(call.name.split("."))
+            edge = self.call_graph.edge(file_path, node.lineno, call.name)
+            if edge is None:
+                continue
+            relevant = set().union(*call.args) & summary.tracked
+            code = source_lines[node.lineno - 1] if node.lineno <= len(source_lines) else ""
+            site = CallSite(file_path.name, node.lineno, func_def.name, code)
+            self._follow_edge(call, edge, relevant, site)
+
+    def _source_line_loader(self, file_path: Path) -> Callable[[], Optional[list[str]]]:
+        """Get a function returning the source lines of a file (None if unreadable)."""
+        if file_path == self.current_path or self.call_graph is None:
+            return lambda: self.source_lines
+        parse_cache = self.call_graph.parse_cache
+
+        def load_source_lines() -> Optional[list[str]]:
+            # Source lines of the called file, from the record its AST came from
+            try:
+                return parse_cache.get_entry(file_path).lines
+            except (OSError, UnicodeDecodeError):
+                return None
+
+        return load_source_lines
+
+    def _apply_function_summary(
+        self,
+        func_def: FunctionNode,
+        file_path: Path,
+        load_source_lines: Callable[[], Optional[list[str]]],
+        param_mapping: dict[str, set[str]],
+    ) -> Optional[FunctionSummary]:
+        """Add the nodes of a called function's body, using its cached summary if any.
 
         Args:
             func_def: The function definition AST node
+            file_path: Path to the file containing the function
+            load_source_lines: Returns the source lines of that file (None if unreadable);
+                only called when the summary has to be computed
             param_mapping: Mapping of parameter names to argument variables
-        """
-        # Start tracking from the parameters we care about
-        affected_vars = set(param_mapping.keys())
-
-        # Walk through the function body to see where parameters are used
-        for stmt in func_def.body:
-            self._track_statement_forward(
-                stmt, affected_vars, Path(self.current_file), self.source_lines, func_def.name
-            )
 
-    def _backward_slice_imported_function(
+        Returns:
+            The summary applied, or None if the file could not be read
+        """
+        params = frozenset(param_mapping)
+        summary = None
+        if self.summaries is not None:
+            summary = self.summaries.get(func_def, self.direction, params)
+        if summary is None:
+            source_lines = load_source_lines()
+            if source_lines is None:
+                return None
+            summary = self._summarize_function(func_def, file_path, source_lines, params)
+            if self.summaries is not None:
+                self.summaries.store(func_def, self.direction, params, summary)
+            if self.stats is not None:
+                self.stats.count("summaries_computed")
+        else:
+            if self.stats is not None:
+                self.stats.count("summaries_reused")
+            if self.hooks is not None:
+                self.hooks.emit(CACHE_HIT, ("summary", (file_path, func_def.name)))
+        # The summary is shared by every call site, so each result gets its own nodes
+        self.nodes.extend(_copy_node(node) for node in summary.nodes)
+        return summary
+
+    def _summarize_function(
         self,
-        func_def: ast.FunctionDef,
+        func_def: FunctionNode,
         file_path: Path,
         source_lines: list[str],
-        param_mapping: dict[str, set[str]],
-    ) -> None:
-        """Perform backward slicing on an imported function.
+        params: frozenset[str],
+    ) -> FunctionSummary:
+        """Track a set of parameters through a function body.
 
         Args:
             func_def: The function definition AST node
             file_path: Path to the file containing the function
-            source_lines: Source code lines of the imported file
-            param_mapping: Mapping of parameter names to argument variables
+            source_lines: Source code lines of that file
+            params: Parameters receiving relevant arguments
+
+        Returns:
+            The function's summary for these parameters
         """
         # Start tracking from the parameters we care about
-        tracked_vars = set(param_mapping.keys())
-
-        # First pass: identify all variables we need to track
-        # Walk FORWARD to build the dependency chain
-        for stmt in func_def.body:
-            self._track_statement_backward(
-                stmt, tracked_vars, file_path, source_lines, func_def.name
-            )
+        tracked_vars = set(params)
+        outer_nodes, self.nodes = self.nodes, []
+        try:
+            for stmt in func_def.body:
+                if self.direction == SliceDirection.BACKWARD:
+                    self._track_statement_backward(
+                        stmt, tracked_vars, file_path, source_lines, func_def.name
+                    )
+                else:  # FORWARD
+                    self._track_statement_forward(
+                        stmt, tracked_vars, file_path, source_lines, func_def.name
+                    )
+            return summarize(func_def, self.nodes, tracked_vars)
+        finally:
+            self.nodes = outer_nodes
 
     def _track_statement_forward(
         self,
@@ -612,7 +769,6 @@ class SlicerVisitor(ast.NodeVisitor):
 
             # If any affected variable is used in RHS, track the assignment
             if rhs_vars & affected_vars:
-                code = source_lines[stmt.lineno - 1] if stmt.lineno <= len(source_lines) else ""
                 target_name = ""
                 if stmt.targets and isinstance(stmt.targets[0], ast.Name):
                     target_name = stmt.targets[0].id
@@ -623,10 +779,11 @@ class SlicerVisitor(ast.NodeVisitor):
                         file=file_path.name,
                         line=stmt.lineno,
                         function=function_name,
-                        code=code,
-                        variable=list(rhs_vars & affected_vars)[0],
+                        code=None,
+                        lines=source_lines,
+                        variable=sorted(rhs_vars & affected_vars)[0],
                         operation="assignment",
-                        dependencies=list(rhs_vars & affected_vars),
+                        dependencies=sorted(rhs_vars & affected_vars),
                     )
                 )
 
@@ -641,7 +798,6 @@ class SlicerVisitor(ast.NodeVisitor):
                 arg_vars.update(self._get_names_from_expr(arg))
 
             if arg_vars & affected_vars:
-                code = source_lines[stmt.lineno - 1] if stmt.lineno <= len(source_lines) else ""
                 func_name = self._get_func_name(stmt.value.func)
 
                 relevant_vars = arg_vars & affected_vars
@@ -650,10 +806,11 @@ class SlicerVisitor(ast.NodeVisitor):
                         file=file_path.name,
                         line=stmt.lineno,
                         function=function_name,
-                        code=code,
-                        variable=list(relevant_vars)[0] if relevant_vars else "",
+                        code=None,
+                        lines=source_lines,
+                        variable=sorted(relevant_vars)[0] if relevant_vars else "",
                         operation=f"passed to {func_name}()",
-                        dependencies=list(relevant_vars),
+                        dependencies=sorted(relevant_vars),
                     )
                 )
 
@@ -662,17 +819,17 @@ class SlicerVisitor(ast.NodeVisitor):
             return_vars = self._get_names_from_expr(stmt.value)
 
             if return_vars & affected_vars:
-                code = source_lines[stmt.lineno - 1] if stmt.lineno <= len(source_lines) else ""
 
                 self.nodes.append(
                     SliceNode(
                         file=file_path.name,
                         line=stmt.lineno,
                         function=function_name,
-                        code=code,
-                        variable=list(return_vars & affected_vars)[0],
+                        code=None,
+                        lines=source_lines,
+                        variable=sorted(return_vars & affected_vars)[0],
                         operation="returned",
-                        dependencies=list(return_vars & affected_vars),
+                        dependencies=sorted(return_vars & affected_vars),
                     )
                 )
 
@@ -691,17 +848,16 @@ class SlicerVisitor(ast.NodeVisitor):
                 for item in stmt.items:
                     context_vars = self._get_names_from_expr(item.context_expr)
                     if context_vars & affected_vars:
-                        line_idx = stmt.lineno - 1
-                        code = source_lines[line_idx] if stmt.lineno <= len(source_lines) else ""
                         self.nodes.append(
                             SliceNode(
                                 file=file_path.name,
                                 line=stmt.lineno,
                                 function=function_name,
-                                code=code,
-                                variable=list(context_vars & affected_vars)[0],
+                                code=None,
+                                lines=source_lines,
+                                variable=sorted(context_vars & affected_vars)[0],
                                 operation="used in with statement",
-                                dependencies=list(context_vars & affected_vars),
+                                dependencies=sorted(context_vars & affected_vars),
                             )
                         )
                 sub_stmts.extend(stmt.body)
@@ -742,7 +898,6 @@ class SlicerVisitor(ast.NodeVisitor):
 
             # Check if any tracked variable is USED in the RHS
             if rhs_vars & tracked_vars:
-                code = source_lines[stmt.lineno - 1] if stmt.lineno <= len(source_lines) else ""
                 target_name = ""
                 if stmt.targets and isinstance(stmt.targets[0], ast.Name):
                     target_name = stmt.targets[0].id
@@ -753,10 +908,11 @@ class SlicerVisitor(ast.NodeVisitor):
                         file=file_path.name,
                         line=stmt.lineno,
                         function=function_name,
-                        code=code,
-                        variable=list(rhs_vars & tracked_vars)[0],
+                        code=None,
+                        lines=source_lines,
+                        variable=sorted(rhs_vars & tracked_vars)[0],
                         operation="assignment",
-                        dependencies=list(rhs_vars & tracked_vars),
+                        dependencies=sorted(rhs_vars & tracked_vars),
                     )
                 )
 
@@ -778,7 +934,6 @@ class SlicerVisitor(ast.NodeVisitor):
                 arg_vars.update(self._get_names_from_expr(arg))
 
             if arg_vars & tracked_vars:
-                code = source_lines[stmt.lineno - 1] if stmt.lineno <= len(source_lines) else ""
                 func_name = self._get_func_name(stmt.value.func)
 
                 relevant_vars = arg_vars & tracked_vars
@@ -787,10 +942,11 @@ class SlicerVisitor(ast.NodeVisitor):
                         file=file_path.name,
                         line=stmt.lineno,
                         function=function_name,
-                        code=code,
-                        variable=list(relevant_vars)[0] if relevant_vars else "",
+                        code=None,
+                        lines=source_lines,
+                        variable=sorted(relevant_vars)[0] if relevant_vars else "",
                         operation=f"passed to {func_name}()",
-                        dependencies=list(relevant_vars),
+                        dependencies=sorted(relevant_vars),
                     )
                 )
 
@@ -803,27 +959,95 @@ class SlicerVisitor(ast.NodeVisitor):
                         tracked_vars.update(dependencies)
 
 
+class _StatsStart(NamedTuple):
+    """Where the stats of a slice start: its stats, start time and cache counters."""
+
+    stats: SliceStats
+    time: float
+    counters: tuple[int, ...]
+
+
+def _phase(stats: Optional[SliceStats], name: str) -> AbstractContextManager[None]:
+    """Time a phase if stats are collected."""
+    return stats.phase(name) if stats is not None else nullcontext()
+
+
+class PreparedFile(NamedTuple):
+    """Per-file data shared by all slices of one file."""
+
+    path: Path
+    source_lines: list[str]
+    imports: dict[str, tuple[Path, str]]
+    defuse: DefUseIndex
+    slices: dict[tuple[int, str, SliceDirection], CachedSlice]
+    file_mtimes: dict[str, Optional[float]]  # Imported files -> mtime
+
+
 class Slicer:
     """Main slicer class for analyzing Python code dataflow."""
 
-    def __init__(self, root_path: str = ".", enable_cross_file: bool = True):
+    def __init__(
+        self,
+        root_path: str = ".",
+        enable_cross_file: bool = True,
+        parse_cache: Optional[ParseCache] = None,
+        cache_dir: Optional[str] = None,
+        search_paths: Optional[Iterable[str]] = None,
+        limits: Optional[ExpansionLimits] = None,
+        collect_stats: bool = False,
+    ):
         """Initialize the slicer.
 
         Args:
             root_path: Root directory of the project to analyze.
             enable_cross_file: Whether to enable cross-file analysis (default: True).
+            parse_cache: Parse cache to use; shared with the import resolver.
+                A default-sized cache is created if omitted.
+            cache_dir: Directory of the persistent on-disk cache of per-file
+                facts (disabled if omitted). Ignored when parse_cache is given.
+            search_paths: Directories of installed packages (e.g. a virtualenv's
+                site-packages) that cross-file analysis follows imports into.
+            limits: Limits on following calls into other functions and files
+                (default: calls made by the sliced file only, no budgets).
+            collect_stats: Whether to record per-phase timings and counters
+                on every result (SliceResult.stats).
+
+        Hooks for tracing engine events (see flowslice.core.hooks) are
+        registered with ``slicer.hooks.add()``; they are the parse cache's,
+        so every slicer sharing a parse cache shares its hooks.
         """
         self.root_path = Path(root_path)
         self.enable_cross_file = enable_cross_file
-        self.import_resolver = ImportResolver(self.root_path) if enable_cross_file else None
-        self.function_defs: dict[str, ast.FunctionDef] = {}  # Cache of function definitions
-
-        # Performance caches
-        self._ast_cache: dict[str, tuple[float, ast.AST]] = {}  # path -> (mtime, ast)
-        self._func_cache: dict[str, tuple[float, dict[str, ast.FunctionDef]]] = {}  # path -> (mtime, funcs)
+        self.search_paths = [str(path) for path in search_paths or []]
+        self.limits = limits or ExpansionLimits()
+        self.collect_stats = collect_stats
+        if parse_cache is None:
+            disk_cache = DiskCache(cache_dir) if cache_dir else None
+            parse_cache = ParseCache(disk_cache=disk_cache)
+        self.parse_cache = parse_cache
+        self.import_resolver = (
+            ImportResolver(
+                self.root_path,
+                parse_cache=self.parse_cache,
+                search_paths=[Path(path) for path in self.search_paths],
+            )
+            if enable_cross_file
+            else None
+        )
+        # Calls of the project resolved to the functions they call
+        self.call_graph = CallGraph(self.parse_cache, self.import_resolver, self.root_path)
+        # Summaries of called functions, shared by all slices
+        self.summaries = SummaryCache()
+        # Listeners for engine events, shared with the parse cache
+        self.hooks = self.parse_cache.hooks
+        # Cached slices depend on the configuration, so each slicer keeps its own
+        self._slices_key = (
+            f"slices:{self.root_path.resolve()}:{enable_cross_file}:{self.search_paths}"
+            f":{self.limits}"
+        )
 
-    def _parse_file_cached(self, file_path: Path) -> ast.AST:
-        """Parse a Python file with caching based on modification time.
+    def _parse_file_cached(self, file_path: Path) -> ast.Module:
+        """Parse a Python file through the shared parse cache.
 
         Args:
             file_path: Path to the Python file
@@ -834,60 +1058,35 @@ class Slicer:
         Raises:
             SyntaxError: If the file contains invalid Python syntax
         """
-        file_str = str(file_path)
-        current_mtime = file_path.stat().st_mtime
-
-        # Check cache
-        if file_str in self._ast_cache:
-            cached_mtime, cached_ast = self._ast_cache[file_str]
-            if cached_mtime == current_mtime:
-                return cached_ast
-
-        # Parse and cache
-        with open(file_path, encoding="utf-8") as f:
-            source = f.read()
-        tree = ast.parse(source)
-        self._ast_cache[file_str] = (current_mtime, tree)
-        return tree
+        return self.parse_cache.get(file_path)
 
-    def _find_function_definitions(self, tree: ast.AST) -> dict[str, ast.FunctionDef]:
-        """Find all function definitions in the AST.
-
-        Args:
-            tree: The AST to search
-
-        Returns:
-            Dictionary mapping function names to their FunctionDef nodes
-        """
-        functions = {}
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                functions[node.name] = node
-        return functions
+    def _get_defuse_index(self, entry: CacheEntry) -> DefUseIndex:
+        """Get the def-use index of a file, building it at most once per content.
 
-    def _get_function_definitions_cached(self, file_path: Path, tree: ast.AST) -> dict[str, ast.FunctionDef]:
-        """Get function definitions with caching.
+        The index is stored next to the AST in the parse cache (and persisted
+        through the disk cache), so it is invalidated together with the AST.
+        When the file was edited, only the top-level blocks that changed since
+        the previous version are indexed again.
 
         Args:
-            file_path: Path to the file
-            tree: Parsed AST (used if not cached)
+            entry: Parse cache entry of the file
 
         Returns:
-            Dictionary mapping function names to their FunctionDef nodes
+            The def-use index for the file
         """
-        file_str = str(file_path)
-        current_mtime = file_path.stat().st_mtime
-
-        # Check cache
-        if file_str in self._func_cache:
-            cached_mtime, cached_funcs = self._func_cache[file_str]
-            if cached_mtime == current_mtime:
-                return cached_funcs
-
-        # Compute and cache
-        functions = self._find_function_definitions(tree)
-        self._func_cache[file_str] = (current_mtime, functions)
-        return functions
+        index: Optional[DefUseIndex] = entry.derived.get("defuse")
+        if index is None:
+            facts = entry.facts.get("defuse")
+            if facts is not None:
+                index = DefUseIndex.from_facts(facts)
+            else:
+                previous = entry.previous.derived.get("blocks") if entry.previous else None
+                blocks = BlockTable.build(entry.tree, entry.lines, previous)
+                entry.derived["blocks"] = blocks
+                index = blocks.merged_index()
+                entry.set_fact("defuse", index.to_facts())
+            entry.derived["defuse"] = index
+        return index
 
     def slice(
         self,
@@ -907,25 +1106,200 @@ class Slicer:
         Returns:
             SliceResult containing the backward and/or forward slices.
         """
-        # Resolve file path
+        start = self._start_stats()
+        stats = start.stats if start is not None else None
+        # Every file is stat'ed and read at most once per slice
+        with self.parse_cache.snapshot():
+            prepared = self._prepare_file(file_path, stats)
+            result = self._slice_prepared(
+                prepared, SliceCriterion(file_path, line, variable, direction), stats
+            )
+        self._finish_stats(start, result)
+        return result
+
+    def slice_many(self, criteria: Iterable[SliceCriterion]) -> Iterator[SliceResult]:
+        """Perform slicing for many criteria, preparing each file only once.
+
+        Criteria are grouped by file: the source, symbol table, import map
+        and def-use index of a file are looked up once and shared by all of
+        its criteria. Results are yielded as they are computed, file by file
+        in order of first appearance, and in input order within a file.
+
+        Args:
+            criteria: The slicing criteria.
+
+        Yields:
+            One SliceResult per criterion.
+        """
+        for group in self.group_criteria(criteria):
+            # Preparing the file counts towards the stats of its first slice
+            start = self._start_stats()
+            with self.parse_cache.snapshot():
+                prepared = self._prepare_file(
+                    group[0].file_path, start.stats if start is not None else None
+                )
+            for position, criterion in enumerate(group):
+                if position:
+                    start = self._start_stats()
+                with self.parse_cache.snapshot():
+                    result = self._slice_prepared(
+                        prepared, criterion, start.stats if start is not None else None
+                    )
+                self._finish_stats(start, result)
+                yield result
+
+    def _cache_counters(self) -> tuple[int, ...]:
+        """Get the parse and disk cache counters, to count what a slice added to them."""
+        cache = self.parse_cache
+        disk_cache = cache.disk_cache
+        disk_counters = (disk_cache.hits, disk_cache.misses) if disk_cache is not None else (0, 0)
+        return (cache.hits, cache.misses, cache.parses, *disk_counters)
+
+    def _start_stats(self) -> Optional[_StatsStart]:
+        """Start collecting the stats of a slice, if enabled."""
+        if not self.collect_stats:
+            return None
+        return _StatsStart(SliceStats(), time.perf_counter(), self._cache_counters())
+
+    def _finish_stats(self, start: Optional[_StatsStart], result: SliceResult) -> None:
+        """Complete the stats of a slice and attach them to its result."""
+        if start is None:
+            return
+        stats = start.stats
+        stats.add_time("total", time.perf_counter() - start.time)
+        names = ("cache_hits", "cache_misses", "parses", "disk_cache_hits", "disk_cache_misses")
+        for name, before, after in zip(names, start.counters, self._cache_counters()):
+            stats.count(name, after - before)
+        stats.count("nodes_emitted", len(result.backward_slice) + len(result.forward_slice))
+        result.stats = stats
+
+    def group_criteria(self, criteria: Iterable[SliceCriterion]) -> list[list[SliceCriterion]]:
+        """Group criteria by the file they resolve to, in order of first appearance.
+
+        Args:
+            criteria: The slicing criteria.
+
+        Returns:
+            One list of criteria per file, each in input order.
+        """
+        groups: dict[Path, list[SliceCriterion]] = {}
+        resolved: dict[str, Path] = {}
+        for criterion in criteria:
+            file_path = criterion.file_path
+            if file_path not in resolved:
+                resolved[file_path] = self._resolve_path(file_path)
+            groups.setdefault(resolved[file_path], []).append(criterion)
+        return list(groups.values())
+
+    def _resolve_path(self, file_path: str) -> Path:
+        """Resolve a file path relative to the root path, falling back to the path itself."""
         full_path = self.root_path / file_path
-        if not full_path.exists():
+        if self.parse_cache.mtime(full_path) is None:
             full_path = Path(file_path)
+        return full_path
+
+    def _prepare_file(self, file_path: str, stats: Optional[SliceStats] = None) -> PreparedFile:
+        """Look up everything slicing needs to know about a file.
+
+        Args:
+            file_path: Path to the Python file to analyze.
+            stats: Stats to record the time of each step in, if collected.
 
-        # Use cached AST parsing
-        tree = self._parse_file_cached(full_path)
+        Returns:
+            The file's source lines, import map and def-use index.
+        """
+        full_path = self._resolve_path(file_path)
 
-        with open(full_path) as f:
-            source = f.read()
-        source_lines = source.split("\n")
+        with _phase(stats, "prepare.parse"):
+            # Cached source record; the file is only parsed if some fact is missing
+            entry = self.parse_cache.get_entry(full_path)
+            source_lines = entry.lines
 
-        # Find all function definitions in the file for inter-procedural analysis (with caching)
-        self.function_defs = self._get_function_definitions_cached(full_path, tree)
+            # Definitions in the file, for inter-procedural analysis; built here so
+            # they are persisted with the other facts below
+            get_symbol_table(entry)
 
         # Parse imports if cross-file analysis is enabled
-        imports = {}
+        imports: dict[str, tuple[Path, str]] = {}
         if self.import_resolver:
-            imports = self.import_resolver.parse_imports(tree, full_path)
+            with _phase(stats, "prepare.imports"):
+                imports = self.import_resolver.get_imports(full_path)
+
+        # Def-use index, shared by every slice of this file
+        with _phase(stats, "prepare.index"):
+            index = self._get_defuse_index(entry)
+            self.parse_cache.persist(entry)
+
+        # Cached slices are valid as long as the imported files are unchanged
+        imported_files = sorted({str(path) for path, _ in imports.values()})
+        file_mtimes = {path: self.parse_cache.mtime(Path(path)) for path in imported_files}
+        slices = self._get_slice_cache(entry, full_path.name, index)
+        return PreparedFile(full_path, source_lines, imports, index, slices, file_mtimes)
+
+    def _get_slice_cache(
+        self, entry: CacheEntry, target_file: str, index: DefUseIndex
+    ) -> dict[tuple[int, str, SliceDirection], CachedSlice]:
+        """Get the cached slices of a file, carrying over those of its previous version.
+
+        Args:
+            entry: Parse cache entry of the file
+            target_file: File name used for nodes of this file in slice results
+            index: Def-use index of the file
+
+        Returns:
+            Cached slices keyed by (line, variable, direction)
+        """
+        slices: Optional[dict[tuple[int, str, SliceDirection], CachedSlice]]
+        slices = entry.derived.get(self._slices_key)
+        if slices is None:
+            slices = {}
+            previous = entry.previous
+            if previous is not None:
+                old_slices = previous.derived.get(self._slices_key)
+                old_blocks = previous.derived.get("blocks")
+                new_blocks = entry.derived.get("blocks")
+                if old_slices and old_blocks is not None and new_blocks is not None:
+                    slices = migrate_slices(old_slices, old_blocks, new_blocks, target_file, index)
+            entry.derived[self._slices_key] = slices
+        # The previous version is no longer needed once its slices were carried over
+        entry.previous = None
+        return slices
+
+    def _slice_prepared(
+        self,
+        prepared: PreparedFile,
+        criterion: SliceCriterion,
+        stats: Optional[SliceStats] = None,
+    ) -> SliceResult:
+        """Slice one criterion of a prepared file.
+
+        Args:
+            prepared: The file as returned by _prepare_file().
+            criterion: The criterion to slice.
+            stats: Stats to record timings and counters in, if collected.
+
+        Returns:
+            SliceResult containing the backward and/or forward slices.
+        """
+        file_path, line, variable, direction = (
+            criterion.file_path,
+            criterion.line,
+            criterion.variable,
+            criterion.direction,
+        )
+        source_lines, imports, index = prepared.source_lines, prepared.imports, prepared.defuse
+
+        slice_key = (line, variable, direction)
+        cached = prepared.slices.get(slice_key)
+        if cached is not None and self._is_cached_slice_valid(cached, prepared):
+            if stats is not None:
+                stats.count("slice_cache_hits")
+            if self.hooks.active:
+                self.hooks.emit(CACHE_HIT, ("slice", criterion))
+            return _copy_result(cached.result)
+        hooks = self.hooks if self.hooks.active else None
+        queried: set[str] = set()
+        budget = ExpansionBudget(self.limits)
 
         result = SliceResult(
             target_file=Path(file_path).name,
@@ -934,46 +1308,41 @@ class Slicer:
         )
 
         if direction in (SliceDirection.BACKWARD, SliceDirection.BOTH):
-            # Multi-pass backward slicing to find transitive dependencies
-            # This is necessary because dependencies may be defined before they're discovered
+            # Worklist fixpoint: only definitions of newly discovered variables are visited
+            backward_visitor = SlicerVisitor(
+                variable,
+                line,
+                SliceDirection.BACKWARD,
+                source_lines,
+                current_file=Path(file_path).name,
+                imports=imports,
+                import_resolver=self.import_resolver,
+                call_graph=self.call_graph,
+                current_path=prepared.path,
+                summaries=self.summaries,
+                budget=budget,
+                stats=stats,
+                hooks=hooks,
+            )
+            if hooks is not None:
+                hooks.emit(PASS_STARTED, ("backward", criterion))
+            with _phase(stats, "backward"):
+                result.iterations = backward_visitor.run_backward_worklist(index)
+            queried |= backward_visitor.relevant_vars | backward_visitor.called
+
+            # Drop duplicates (e.g. the same cross-file line reached from two call sites)
             all_nodes = []
             seen_keys = set()
-            relevant_vars = {variable}
-
-            max_passes = 10  # Safety limit to prevent infinite loops
-            for pass_num in range(max_passes):
-                backward_visitor = SlicerVisitor(
-                    variable,
-                    line,
-                    SliceDirection.BACKWARD,
-                    source_lines,
-                    current_file=Path(file_path).name,
-                    imports=imports,
-                    import_resolver=self.import_resolver,
-                    function_defs=self.function_defs,
-                )
-                # Start with accumulated relevant vars from previous passes
-                backward_visitor.relevant_vars = relevant_vars.copy()
-                backward_visitor.visit(tree)
-
-                # Add new nodes (avoiding duplicates)
-                for node in backward_visitor.nodes:
-                    key = (node.file, node.line, node.variable, node.operation)
-                    if key not in seen_keys:
-                        seen_keys.add(key)
-                        all_nodes.append(node)
-
-                # Check if we found any new variables
-                new_vars = backward_visitor.relevant_vars - relevant_vars
-                if not new_vars and pass_num > 0:
-                    # No new variables discovered after first pass, we're done
-                    break
-
-                # Update relevant vars for next pass
-                relevant_vars = backward_visitor.relevant_vars.copy()
+            for node in backward_visitor.nodes:
+                key = (node.file, node.line, node.variable, node.operation)
+                if key not in seen_keys:
+                    seen_keys.add(key)
+                    all_nodes.append(node)
 
             # Don't overwrite file names - preserve cross-file information
             result.backward_slice = sorted(all_nodes, key=lambda n: (n.file, n.line))
+            if hooks is not None:
+                _emit_pass_finished(hooks, "backward", criterion, result.backward_slice)
 
         if direction in (SliceDirection.FORWARD, SliceDirection.BOTH):
             forward_visitor = SlicerVisitor(
@@ -984,21 +1353,114 @@ class Slicer:
                 current_file=Path(file_path).name,
                 imports=imports,
                 import_resolver=self.import_resolver,
-                function_defs=self.function_defs,
+                call_graph=self.call_graph,
+                current_path=prepared.path,
+                summaries=self.summaries,
+                budget=budget,
+                stats=stats,
+                hooks=hooks,
             )
-            forward_visitor.visit(tree)
+            if hooks is not None:
+                hooks.emit(PASS_STARTED, ("forward", criterion))
+            with _phase(stats, "forward"):
+                forward_visitor.run_forward_index(index)
+            queried |= forward_visitor.affected_vars | forward_visitor.called
+            if forward_visitor.target_function is not None:
+                queried.add(forward_visitor.target_function)
             # For forward slicing, sort by (current_file first, then line, then other files)
             # This ensures cross-file nodes appear after their call sites
             target_file = Path(file_path).name
 
-            def sort_key(node: SliceNode) -> tuple[int, int, int]:
+            def sort_key(item: tuple[int, SliceNode]) -> tuple[int, int]:
+                position, node = item
                 # Nodes from target file come first (sorted by line)
                 # Nodes from other files come after (in insertion order)
                 if node.file == target_file:
-                    return (0, node.line, 0)
-                else:
-                    # Use original index for cross-file nodes to preserve insertion order
-                    return (1, forward_visitor.nodes.index(node), 0)
-            result.forward_slice = sorted(forward_visitor.nodes, key=sort_key)
-
+                    return (0, node.line)
+                return (1, position)
+
+            ordered = sorted(enumerate(forward_visitor.nodes), key=sort_key)
+            result.forward_slice = [node for _, node in ordered]
+            if hooks is not None:
+                _emit_pass_finished(hooks, "forward", criterion, result.forward_slice)
+
+        if stats is not None:
+            stats.count("iterations", result.iterations)
+            stats.count("files_entered", len(budget.files))
+        if not budget.timed_out:
+            self._cache_slice(prepared, slice_key, result, queried, budget.files)
         return result
+
+    def _cache_slice(
+        self,
+        prepared: PreparedFile,
+        key: tuple[int, str, SliceDirection],
+        result: SliceResult,
+        queried: set[str],
+        entered: set[str],
+    ) -> None:
+        """Remember a slice result together with what it depends on.
+
+        Args:
+            prepared: The file the slice was computed for.
+            key: The slice's (line, variable, direction).
+            result: The slice result.
+            queried: Variables and functions the slice looked up.
+            entered: Other files whose functions the slice analyzed.
+        """
+        file_mtimes = prepared.file_mtimes
+        if not entered.issubset(file_mtimes):
+            # Files reached through nested calls are checked like imported ones
+            file_mtimes = dict(file_mtimes)
+            for path in sorted(entered - file_mtimes.keys()):
+                file_mtimes[path] = self.parse_cache.mtime(Path(path))
+        if any(Path(path).name == result.target_file for path in file_mtimes):
+            # Nodes of this file could not be told apart from those of the import
+            return
+        if len(prepared.slices) >= MAX_CACHED_SLICES:
+            del prepared.slices[next(iter(prepared.slices))]
+        prepared.slices[key] = CachedSlice(
+            _copy_result(result),
+            frozenset(queried),
+            prepared.imports,
+            file_mtimes,
+            prepared.defuse.forward_start_line(key[0]),
+        )
+
+    def _is_cached_slice_valid(self, cached: CachedSlice, prepared: PreparedFile) -> bool:
+        """Check that neither the import map nor a file the slice entered changed since slicing."""
+        if cached.imports is not prepared.imports and cached.imports != prepared.imports:
+            return False
+        if cached.file_mtimes is prepared.file_mtimes:
+            return True
+        return all(
+            prepared.file_mtimes[path] == mtime
+            if path in prepared.file_mtimes
+            else self.parse_cache.mtime(Path(path)) == mtime
+            for path, mtime in cached.file_mtimes.items()
+        )
+
+
+def _emit_pass_finished(
+    hooks: Hooks, name: str, criterion: SliceCriterion, nodes: list[SliceNode]
+) -> None:
+    """Tell hooks about the nodes of a finished pass, then that it finished."""
+    for node in nodes:
+        hooks.emit(NODE_EMITTED, node)
+    hooks.emit(PASS_FINISHED, (name, criterion))
+
+
+def _copy_node(node: SliceNode) -> SliceNode:
+    """Copy a node, including its list of dependencies."""
+    return node.replace(dependencies=list(node.dependencies))
+
+
+def _copy_result(result: SliceResult) -> SliceResult:
+    """Copy a slice result and its nodes, so callers can modify them without touching the cache."""
+    return dataclasses.replace(
+        result,
+        backward_slice=[_copy_node(node) for node in result.backward_slice],
+        forward_slice=[_copy_node(node) for node in result.forward_slice],
+        stats=None,  # Stats describe one call, not the cached result
+    )
+
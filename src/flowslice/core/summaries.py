@@ -0,0 +1,103 @@
+"""Memoized dataflow summaries of called functions.
+
+Following a call into a function means tracking the parameters that receive
+relevant arguments through the function body. The outcome only depends on
+the function, the direction of slicing and the set of tracked parameters,
+so it is summarized once and applied at every call site.
+"""
+
+import ast
+import weakref
+from typing import NamedTuple, Optional
+
+from flowslice.core.defuse import get_func_name
+from flowslice.core.models import SliceDirection, SliceNode
+from flowslice.core.symbols import FunctionNode
+
+
+class FunctionSummary(NamedTuple):
+    """Dataflow of a set of parameters through a function body."""
+
+    nodes: tuple[SliceNode, ...]  # Nodes emitted for the function body
+    tracked: frozenset[str]  # Variables reached from the parameters
+    returns: bool  # Whether the parameters flow to a return value
+    calls: tuple[str, ...]  # Display names of the calls the parameters are passed to
+
+
+def summarize(
+    func_def: FunctionNode, nodes: list[SliceNode], tracked: set[str]
+) -> FunctionSummary:
+    """Build the summary of a function from the result of tracking its body.
+
+    Args:
+        func_def: The function definition
+        nodes: Nodes emitted while tracking the body
+        tracked: Variables tracked once the whole body was analyzed
+
+    Returns:
+        The function summary
+    """
+    returns = False
+    calls = set()
+    for node in ast.walk(func_def):
+        if isinstance(node, ast.Return) and node.value is not None:
+            names = {n.id for n in ast.walk(node.value) if isinstance(n, ast.Name)}
+            returns = returns or bool(names & tracked)
+        elif isinstance(node, ast.Call) and isinstance(node.func, (ast.Name, ast.Attribute)):
+            names = {n.id for arg in node.args for n in ast.walk(arg) if isinstance(n, ast.Name)}
+            if names & tracked:
+                calls.add(get_func_name(node.func))
+    return FunctionSummary(tuple(nodes), frozenset(tracked), returns, tuple(sorted(calls)))
+
+
+class SummaryCache:
+    """Function summaries by function definition, direction and tracked parameters.
+
+    Summaries are attached to the FunctionDef nodes weakly, so they are
+    dropped together with the AST when the parse cache evicts a module or
+    the module changes.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._summaries: weakref.WeakKeyDictionary[
+            FunctionNode, dict[tuple[SliceDirection, frozenset[str]], FunctionSummary]
+        ] = weakref.WeakKeyDictionary()
+
+    def __len__(self) -> int:
+        return sum(len(summaries) for summaries in self._summaries.values())
+
+    def get(
+        self, func_def: FunctionNode, direction: SliceDirection, params: frozenset[str]
+    ) -> Optional[FunctionSummary]:
+        """Get a cached summary, or None if it was not computed yet.
+
+        Args:
+            func_def: The called function
+            direction: Direction of slicing
+            params: Parameters receiving relevant arguments
+
+        Returns:
+            The summary, if cached
+        """
+        summary = self._summaries.get(func_def, {}).get((direction, params))
+        if summary is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return summary
+
+    def store(
+        self,
+        func_def: FunctionNode,
+        direction: SliceDirection,
+        params: frozenset[str],
+        summary: FunctionSummary,
+    ) -> None:
+        """Cache the summary of a function for a set of parameters."""
+        self._summaries.setdefault(func_def, {})[(direction, params)] = summary
+
+    def clear(self) -> None:
+        """Drop every summary (counters are kept)."""
+        self._summaries.clear()
@@ -0,0 +1,186 @@
+"""Per-module symbol tables with qualified names.
+
+A module is walked once, scope by scope, into a table of the functions,
+async functions and classes it defines, keyed by qualified name as in
+``__qualname__``: ``helper``, ``Parser.parse``, ``outer.<locals>.inner``.
+Same-named methods of different classes therefore no longer collide, and
+every lookup is a dictionary access.
+"""
+
+import ast
+from collections.abc import Iterator, Mapping
+from typing import Any, Callable, NamedTuple, Optional, Union
+
+from flowslice.core.cache import CacheEntry
+
+FunctionNode = Union[ast.FunctionDef, ast.AsyncFunctionDef]
+
+FUNCTION = "function"
+ASYNC_FUNCTION = "async_function"
+CLASS = "class"
+
+_KINDS = {ast.FunctionDef: FUNCTION, ast.AsyncFunctionDef: ASYNC_FUNCTION, ast.ClassDef: CLASS}
+
+
+class Symbol(NamedTuple):
+    """A function, async function or class defined in a module."""
+
+    qualname: str  # e.g. "helper", "Parser.parse" or "outer.<locals>.inner"
+    line: int  # Line of the definition (not of its decorators)
+    kind: str  # FUNCTION, ASYNC_FUNCTION or CLASS
+
+
+def _definitions(tree: ast.AST) -> Iterator[tuple[str, bool, ast.AST]]:
+    """Yield (qualified name, is method, node) for every definition, in source order."""
+    pending: list[tuple[ast.AST, str, bool]] = [(tree, "", False)]
+    while pending:
+        node, prefix, in_class = pending.pop()
+        kind = _KINDS.get(type(node))
+        if kind is not None:
+            qualname = prefix + node.name  # type: ignore[attr-defined]
+            yield qualname, in_class and kind != CLASS, node
+            prefix, in_class = (
+                (qualname + ".", True) if kind == CLASS else (qualname + ".<locals>.", False)
+            )
+        children = list(ast.iter_child_nodes(node))
+        pending.extend((child, prefix, in_class) for child in reversed(children))
+
+
+class SymbolTable(Mapping[str, Symbol]):
+    """Definitions of a module by qualified name, resolved to AST nodes lazily.
+
+    The table itself only stores names, lines and kinds (which is what the
+    disk cache persists); the module is parsed the first time a definition
+    node is actually looked up.
+    """
+
+    def __init__(
+        self,
+        symbols: list[Symbol],
+        callables: dict[str, str],
+        load_tree: Callable[[], ast.AST],
+    ):
+        """Initialize the table.
+
+        Args:
+            symbols: Definitions of the module, in source order
+            callables: Qualified name of the function a bare call to each name refers to
+            load_tree: Returns the module AST when a definition node is needed
+        """
+        self.symbols = {symbol.qualname: symbol for symbol in symbols}
+        self.callables = callables
+        self._load_tree = load_tree
+        self._nodes: Optional[dict[str, ast.AST]] = None
+
+    @classmethod
+    def build(cls, tree: ast.AST) -> "SymbolTable":
+        """Build the table of a module in one pass.
+
+        Args:
+            tree: The module AST
+
+        Returns:
+            The symbol table, with the definition nodes already resolved
+        """
+        symbols = []
+        callables: dict[str, str] = {}
+        nodes = {}
+        for qualname, is_method, node in _definitions(tree):
+            if qualname in nodes:
+                continue  # Redefinitions in the same scope keep the first one
+            kind = _KINDS[type(node)]
+            symbols.append(Symbol(qualname, node.lineno, kind))  # type: ignore[attr-defined]
+            nodes[qualname] = node
+            name = node.name  # type: ignore[attr-defined]
+            # A bare call resolves to a module-level function, else the first
+            # nested function of that name; methods are only reached through
+            # their class
+            if kind != CLASS and not is_method and (qualname == name or name not in callables):
+                callables[name] = qualname
+        table = cls(symbols, callables, lambda: tree)
+        table._nodes = nodes
+        return table
+
+    @classmethod
+    def from_facts(cls, facts: dict[str, Any], load_tree: Callable[[], ast.AST]) -> "SymbolTable":
+        """Rebuild a table from to_facts() output, resolving nodes from load_tree() on demand."""
+        symbols = [Symbol(qualname, line, kind) for qualname, line, kind in facts["symbols"]]
+        return cls(symbols, dict(facts["callables"]), load_tree)
+
+    def to_facts(self) -> dict[str, Any]:
+        """Serializable form of the table (see from_facts())."""
+        return {
+            "symbols": [list(symbol) for symbol in self.symbols.values()],
+            "callables": self.callables,
+        }
+
+    def __getitem__(self, qualname: str) -> Symbol:
+        return self.symbols[qualname]
+
+    def __contains__(self, qualname: object) -> bool:
+        return qualname in self.symbols
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.symbols)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def node(self, qualname: str) -> Optional[ast.AST]:
+        """Get the AST node of a definition, or None if the module has no such symbol."""
+        symbol = self.symbols.get(qualname)
+        if symbol is None:
+            return None
+        if self._nodes is None:
+            self._nodes = {
+                name: node
+                for name, _, node in _definitions(self._load_tree())
+                if name in self.symbols
+                and self.symbols[name].line == node.lineno  # type: ignore[attr-defined]
+            }
+        return self._nodes.get(qualname)
+
+    def function(self, qualname: str) -> Optional[FunctionNode]:
+        """Get the node of a function or method by qualified name (e.g. ``"Parser.parse"``)."""
+        node = self.node(qualname)
+        return node if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) else None
+
+    def resolve_call(self, name: str) -> Optional[FunctionNode]:
+        """Get the function a call to a bare name refers to.
+
+        Args:
+            name: The called name
+
+        Returns:
+            The module-level function of that name, else the first nested
+            function of that name, or None (methods are never returned)
+        """
+        qualname = self.callables.get(name)
+        return self.function(qualname) if qualname is not None else None
+
+
+def get_symbol_table(entry: CacheEntry) -> SymbolTable:
+    """Get the symbol table of a module, cached next to its AST.
+
+    The table is persisted with the entry's facts, so a new process can
+    look up definitions without parsing the module until a node is needed.
+
+    Args:
+        entry: Parse cache entry of the module
+
+    Returns:
+        The module's symbol table
+
+    Raises:
+        SyntaxError: If the module has to be parsed and is not valid Python
+    """
+    table: Optional[SymbolTable] = entry.derived.get("symbols")
+    if table is None:
+        facts = entry.facts.get("symbols")
+        if facts is None:
+            table = SymbolTable.build(entry.tree)
+            entry.set_fact("symbols", table.to_facts())
+        else:
+            table = SymbolTable.from_facts(facts, lambda: entry.tree)
+        entry.derived["symbols"] = table
+    return table
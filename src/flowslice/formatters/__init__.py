@@ -1,8 +1,36 @@
-"""Output formatters for slice results."""
+"""Output formatters for slice results.
 
-from flowslice.formatters.dot import DotFormatter
-from flowslice.formatters.graph import GraphFormatter
-from flowslice.formatters.json import JSONFormatter
-from flowslice.formatters.tree import TreeFormatter
+Formatters are imported on first use, so that importing one of them (as
+the command line does for the chosen format) does not import the others.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from flowslice.formatters.dot import DotFormatter
+    from flowslice.formatters.graph import GraphFormatter
+    from flowslice.formatters.json import JSONFormatter
+    from flowslice.formatters.tree import TreeFormatter
+
+# Exported name -> module defining it
+_EXPORTS = {
+    "DotFormatter": "flowslice.formatters.dot",
+    "GraphFormatter": "flowslice.formatters.graph",
+    "JSONFormatter": "flowslice.formatters.json",
+    "TreeFormatter": "flowslice.formatters.tree",
+}
 
 __all__ = ["DotFormatter", "GraphFormatter", "JSONFormatter", "TreeFormatter"]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value  # Later lookups do not go through __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,9 @@
 """JSON formatter for flowslice results."""
 
+import io
 import json
-from typing import Any
+from collections.abc import Iterable
+from typing import Any, Optional, TextIO
 
 from flowslice.core.models import SliceDirection, SliceNode, SliceResult
 
@@ -11,49 +13,127 @@ class JSONFormatter:
 
     @staticmethod
     def format(
-        result: SliceResult, direction: SliceDirection = SliceDirection.BOTH, indent: int = 2
+        result: SliceResult,
+        direction: SliceDirection = SliceDirection.BOTH,
+        indent: Optional[int] = 2,
     ) -> str:
         """Format a SliceResult as JSON.
 
         Args:
             result: The SliceResult to format.
             direction: Which direction(s) to display.
-            indent: Number of spaces for indentation (default: 2).
+            indent: Number of spaces for indentation (default: 2), None for a single line.
 
         Returns:
             Formatted JSON string.
         """
-        data: dict[str, Any] = {
-            "target": {
-                "file": result.target_file,
-                "line": result.target_line,
-                "variable": result.target_variable,
-            }
-        }
+        out = io.StringIO()
+        JSONFormatter.write(result, out, direction, indent)
+        return out.getvalue()
 
-        if direction in (SliceDirection.BACKWARD, SliceDirection.BOTH) and result.backward_slice:
-            data["backward_slice"] = [
-                JSONFormatter._node_to_dict(node) for node in result.backward_slice
-            ]
+    @staticmethod
+    def write(
+        result: SliceResult,
+        out: TextIO,
+        direction: SliceDirection = SliceDirection.BOTH,
+        indent: Optional[int] = 2,
+    ) -> None:
+        """Write a SliceResult as JSON, node by node.
 
-        if direction in (SliceDirection.FORWARD, SliceDirection.BOTH) and result.forward_slice:
-            data["forward_slice"] = [
-                JSONFormatter._node_to_dict(node) for node in result.forward_slice
-            ]
+        The output is the same as format()'s, but no node is kept in memory
+        after it has been written; statistics are gathered while writing.
 
-        # Add statistics
-        all_files = set(n.file for n in result.backward_slice + result.forward_slice)
-        all_functions = set(
-            n.function for n in result.backward_slice + result.forward_slice
-        )
+        Args:
+            result: The SliceResult to write.
+            out: File object to write to.
+            direction: Which direction(s) to display.
+            indent: Number of spaces for indentation (default: 2), None for a single line.
+        """
+        newline = "" if indent is None else "\n"
+        separator = ", " if indent is None else ","
 
-        data["statistics"] = {
-            "total_lines": len(result.backward_slice) + len(result.forward_slice),
-            "files_involved": sorted(list(all_files)),
-            "functions_involved": sorted(list(all_functions)),
+        def start(depth: int) -> str:
+            # What goes before a member at a nesting depth, as json.dumps() lays it out
+            return newline + " " * (indent * depth if indent is not None else 0)
+
+        def dumps(value: Any, depth: int) -> str:
+            return json.dumps(value, indent=indent).replace("\n", start(depth))
+
+        target = {
+            "file": result.target_file,
+            "line": result.target_line,
+            "variable": result.target_variable,
         }
+        out.write("{" + start(1) + '"target": ' + dumps(target, 1))
+
+        statistics = _Statistics()
+        sections = (
+            ("backward_slice", result.backward_slice, SliceDirection.BACKWARD),
+            ("forward_slice", result.forward_slice, SliceDirection.FORWARD),
+        )
+        for key, nodes, section_direction in sections:
+            if direction not in (section_direction, SliceDirection.BOTH) or not nodes:
+                statistics.add_all(nodes)  # Counted even when not shown
+                continue
+            out.write(separator + start(1) + json.dumps(key) + ": [")
+            for index, node in enumerate(nodes):
+                statistics.add(node)
+                item = dumps(JSONFormatter._node_to_dict(node), 2)
+                out.write((separator if index else "") + start(2) + item)
+            out.write(start(1) + "]")
+
+        out.write(separator + start(1) + '"statistics": ' + dumps(statistics.to_dict(), 1))
+        out.write(start(0) + "}")
+
+    @staticmethod
+    def write_ndjson(
+        results: Iterable[SliceResult],
+        out: TextIO,
+        direction: SliceDirection = SliceDirection.BOTH,
+    ) -> None:
+        """Write slice results as newline-delimited JSON, one record per line.
+
+        Each result is written as a "target" record, one "node" record per
+        node (with its "direction") and a "statistics" record, all with the
+        index of the result in "slice". Results are written as they come, so
+        results of a batch can be read while later ones are being computed.
 
-        return json.dumps(data, indent=indent)
+        Args:
+            results: The results to write.
+            out: File object to write to.
+            direction: Which direction(s) to display.
+        """
+        for index, result in enumerate(results):
+            out.write(
+                json.dumps(
+                    {
+                        "type": "target",
+                        "slice": index,
+                        "file": result.target_file,
+                        "line": result.target_line,
+                        "variable": result.target_variable,
+                    }
+                )
+                + "\n"
+            )
+            statistics = _Statistics()
+            sections = (
+                (result.backward_slice, SliceDirection.BACKWARD),
+                (result.forward_slice, SliceDirection.FORWARD),
+            )
+            for nodes, section_direction in sections:
+                if direction not in (section_direction, SliceDirection.BOTH):
+                    statistics.add_all(nodes)
+                    continue
+                for node in nodes:
+                    statistics.add(node)
+                    record = {"type": "node", "slice": index, "direction": section_direction.value}
+                    record.update(JSONFormatter._node_to_dict(node))
+                    out.write(json.dumps(record) + "\n")
+            record = {"type": "statistics", "slice": index}
+            record.update(statistics.to_dict())
+            out.write(json.dumps(record) + "\n")
+            out.flush()
 
     @staticmethod
     def _node_to_dict(node: SliceNode) -> dict[str, Any]:
@@ -81,3 +161,28 @@ class JSONFormatter:
             node_dict["context"] = node.context
 
         return node_dict
+
+
+class _Statistics:
+    """Statistics of a slice, gathered one node at a time."""
+
+    def __init__(self) -> None:
+        self.total_lines = 0
+        self.files: set[str] = set()
+        self.functions: set[str] = set()
+
+    def add(self, node: SliceNode) -> None:
+        self.total_lines += 1
+        self.files.add(node.file)
+        self.functions.add(node.function)
+
+    def add_all(self, nodes: list[SliceNode]) -> None:
+        for node in nodes:
+            self.add(node)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total_lines": self.total_lines,
+            "files_involved": sorted(self.files),
+            "functions_involved": sorted(self.functions),
+        }
@@ -1,7 +1,7 @@
 """Tree formatter for flowslice results."""
 
 
-from flowslice.core.models import SliceDirection, SliceNode, SliceResult
+from flowslice.core.models import TRUNCATED, SliceDirection, SliceNode, SliceResult
 from flowslice.formatters.colors import Colors, colorize
 
 
@@ -63,14 +63,23 @@ class TreeFormatter:
                 idx = seen_lines[key]
                 existing = merged[idx]
                 all_deps = set(existing.dependencies) | set(node.dependencies)
-                existing.dependencies = sorted(list(all_deps))
+                context = existing.context
 
+                # A call that was not followed is explained rather than listed
+                if node.operation == TRUNCATED and node.context:
+                    if not context:
+                        context = node.context
+                    else:
+                        context = f"{node.context}; {context}"
                 # Merge operations (keep first operation, note if there are more)
-                if node.operation and node.operation != existing.operation:
-                    if not existing.context:
-                        existing.context = f"Also: {node.operation}"
+                elif node.operation and node.operation != existing.operation:
+                    if not context:
+                        context = f"Also: {node.operation}"
                     else:
-                        existing.context += f", {node.operation}"
+                        context += f", {node.operation}"
+
+                # Merge into a copy; the nodes belong to the result (and the slice cache)
+                merged[idx] = existing.replace(dependencies=sorted(all_deps), context=context)
 
         return merged
 
@@ -0,0 +1,9 @@
+"""Shared pytest configuration."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the CLI's on-disk analysis cache out of the working directory."""
+    monkeypatch.setenv("FLOWSLICE_CACHE_DIR", str(tmp_path / "flowslice_cache"))
@@ -0,0 +1,78 @@
+"""Unit tests for the benchmark suite in benchmarks/."""
+
+import ast
+import json
+
+from benchmarks import startup
+from benchmarks.generator import PRESETS, ProjectSpec, generate_project
+from benchmarks.run import compare, main, run_benchmarks
+
+SPEC = ProjectSpec(modules=4, functions=2, function_length=8, call_depth=2, reexport_fanout=3)
+
+
+def test_generated_projects_are_deterministic_and_valid(tmp_path):
+    """Test a spec always generates the same parseable files and criteria."""
+    first = generate_project(SPEC, tmp_path / "first")
+    second = generate_project(SPEC, tmp_path / "second")
+
+    assert [path.read_text() for path in first.files] == [path.read_text() for path in second.files]
+    for path in first.files:
+        ast.parse(path.read_text())
+    assert len(first.files) == SPEC.modules + 2
+    assert len(first.criteria) == 2 * SPEC.modules * SPEC.functions
+    for criterion in first.criteria + first.entry_criteria:
+        line = open(criterion.file_path).read().splitlines()[criterion.line - 1]
+        assert criterion.variable in line
+
+
+def test_run_benchmarks_and_compare(tmp_path, capsys):
+    """Test the runner times the requested benchmarks and flags regressions."""
+    results = run_benchmarks(SPEC, repeat=1, only=["slice.both", "cross_file.both", "format.json"])
+
+    assert set(results["benchmarks"]) == {"slice.both", "cross_file.both", "format.json"}
+    assert results["benchmarks"]["slice.both"]["items"] > 0
+    assert results["spec"] == SPEC.to_dict()
+
+    slower = json.loads(json.dumps(results))
+    slower["benchmarks"]["slice.both"]["median"] *= 3
+    assert compare(slower, results, threshold=1.5) is False
+    assert compare(results, results, threshold=1.5) is True
+    assert "SLOWER" in capsys.readouterr().out
+
+
+def test_main_writes_results(tmp_path):
+    """Test the command line writes the results file."""
+    output = tmp_path / "results.json"
+
+    status = main(
+        ["--preset", "small", "--repeat", "1", "--only", "format.tree", "--output", str(output)]
+    )
+
+    assert status == 0
+    data = json.loads(output.read_text())
+    assert data["spec"] == PRESETS["small"].to_dict()
+    assert list(data["benchmarks"]) == ["format.tree"]
+
+
+def test_startup_budget(tmp_path, capsys):
+    """Test the startup benchmark runs the CLI and checks the budgets."""
+    output = tmp_path / "startup.json"
+
+    argv = ["--repeat", "1", "--help-budget", "60", "--slice-budget", "60", "--output", str(output)]
+    assert startup.main(argv) == 0
+    data = json.loads(output.read_text())
+    assert set(data["commands"]) == {"help", "slice"}
+    assert data["ok"]
+
+    assert startup.main(["--repeat", "1", "--slice-budget", "-60"]) == 1
+    assert "OVER BUDGET" in capsys.readouterr().out
+
+
+def test_startup_budget_comparison():
+    """Test the median overhead over the interpreter is what is held to the budget."""
+    timing = startup.summarize([0.30, 0.12, 0.14], baseline=0.05, budget=0.1)
+    assert timing["median"] == 0.14 and timing["runs"] == 3
+    assert abs(timing["overhead"] - 0.09) < 1e-9
+    assert timing["ok"]
+
+    assert not startup.summarize([0.30, 0.20, 0.14], baseline=0.05, budget=0.1)["ok"]
@@ -0,0 +1,115 @@
+"""Unit tests for flowslice.core.binary."""
+
+import os
+
+import pytest
+
+from flowslice.core.binary import BinaryFormatError, ResultReader, write_results
+from flowslice.core.models import SliceNode, SliceResult
+from flowslice.core.slicer import Slicer
+
+
+def _results() -> list[SliceResult]:
+    return [
+        SliceResult(
+            target_file="main.py",
+            target_line=3,
+            target_variable="y",
+            iterations=3,
+            backward_slice=[
+                SliceNode("main.py", 1, "main", "x = 1", "x", "assignment"),
+                SliceNode("main.py", 2, "main", "y = x", "y", "assignment", ["x"]),
+            ],
+            forward_slice=[
+                SliceNode("util.py", 7, "show", "print(y)", "y", "passed to print()", ["y"], "ctx"),
+            ],
+        ),
+        SliceResult(target_file="util.py", target_line=9, target_variable="z"),
+        SliceResult(
+            target_file="main.py",
+            target_line=5,
+            target_variable="é",
+            forward_slice=[SliceNode("util.py", 8, "helper", "é = 2", "é", "assignment")],
+        ),
+    ]
+
+
+def test_round_trip(tmp_path):
+    """Test every result reads back equal to what was written."""
+    path = tmp_path / "slices.fsr"
+    assert write_results(iter(_results()), path) == 3
+
+    with ResultReader(path) as reader:
+        assert len(reader) == 3
+        assert reader.node_count == 4
+        assert list(reader.results()) == _results()
+        assert reader.target(2) == ("main.py", 5, "é")
+
+
+def test_round_trip_of_sliced_results(tmp_path):
+    """Test results computed by the slicer, with their iterations, read back equal."""
+    (tmp_path / "mod.py").write_text("x = 10\ny = x + 5\nz = y * 2\n")
+    slicer = Slicer(str(tmp_path), enable_cross_file=False)
+    results = [slicer.slice("mod.py", 3, "z"), slicer.slice("mod.py", 1, "x")]
+    assert results[0].iterations > 0
+    path = tmp_path / "slices.fsr"
+    write_results(results, path)
+
+    with ResultReader(path) as reader:
+        assert list(reader.results()) == results
+
+
+def test_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    """Test the temporary file is removed when the result file cannot be written."""
+    path = tmp_path / "slices.fsr"
+
+    def fail(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        write_results(_results(), path)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_filter_nodes_by_file_function_and_result(tmp_path):
+    """Test nodes are filtered on their ids before being built."""
+    path = tmp_path / "slices.fsr"
+    write_results(_results(), path)
+
+    with ResultReader(path) as reader:
+        assert [(index, node.line) for index, node in reader.nodes(file="util.py")] == [
+            (0, 7),
+            (2, 8),
+        ]
+        assert [node.line for _, node in reader.nodes(file="util.py", function="show")] == [7]
+        assert [node.line for _, node in reader.nodes(result=0, function="main")] == [1, 2]
+        assert list(reader.nodes(file="missing.py")) == []
+        assert reader.string_id("missing") is None
+        with pytest.raises(IndexError):
+            reader.result(3)
+
+
+def test_close_with_iterators_in_progress(tmp_path):
+    """Test the file can be closed while nodes and results are only partly read."""
+    path = tmp_path / "slices.fsr"
+    write_results(_results(), path)
+
+    reader = ResultReader(path)
+    nodes = reader.nodes()
+    results = reader.results()
+    assert next(nodes)[1].line == 1
+    assert next(results) == _results()[0]
+
+    reader.close()
+    with pytest.raises(ValueError):
+        next(nodes)
+
+
+def test_rejects_other_files(tmp_path):
+    """Test files that are not result files are refused."""
+    for content in (b"", b"not a result file" * 8):
+        path = tmp_path / "other.bin"
+        path.write_bytes(content)
+        with pytest.raises(BinaryFormatError):
+            ResultReader(path)
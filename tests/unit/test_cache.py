@@ -0,0 +1,171 @@
+"""Unit tests for flowslice.core.cache."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from flowslice.core.cache import ParseCache
+from flowslice.core.models import SliceDirection
+from flowslice.core.slicer import Slicer
+
+
+def _write_modules(tmpdir: Path, count: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        path = tmpdir / f"mod{i}.py"
+        path.write_text(f"value{i} = {i}\n")
+        paths.append(path)
+    return paths
+
+
+class TestParseCache:
+    """Test ParseCache behavior."""
+
+    def test_hit_and_miss_counters(self):
+        """Test repeated lookups of an unchanged file are hits."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (path,) = _write_modules(Path(tmpdir), 1)
+            cache = ParseCache()
+
+            first = cache.get(path)
+            second = cache.get(path)
+
+            assert first is second
+            info = cache.cache_info()
+            assert info.hits == 1
+            assert info.misses == 1
+            assert info.entries == 1
+
+    def test_reparse_on_mtime_change(self):
+        """Test a modified file is parsed again."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (path,) = _write_modules(Path(tmpdir), 1)
+            cache = ParseCache()
+            first = cache.get(path)
+
+            path.write_text("value0 = 42\nother = 1\n")
+            stat = path.stat()
+            os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+            second = cache.get(path)
+            assert second is not first
+            assert len(second.body) == 2
+            assert cache.cache_info().misses == 2
+
+    def test_entry_budget_evicts_least_recently_used(self):
+        """Test the entry budget evicts the least recently used module."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = _write_modules(Path(tmpdir), 3)
+            cache = ParseCache(max_entries=2)
+
+            cache.get(paths[0])
+            cache.get(paths[1])
+            cache.get(paths[0])  # paths[1] is now least recently used
+            cache.get(paths[2])
+
+            assert paths[0] in cache
+            assert paths[1] not in cache
+            assert paths[2] in cache
+            assert cache.cache_info().evictions == 1
+
+    def test_byte_budget(self):
+        """Test the byte budget bounds total source size."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = _write_modules(Path(tmpdir), 4)
+            size = paths[0].stat().st_size
+            cache = ParseCache(max_entries=None, max_bytes=size * 2)
+
+            for path in paths:
+                cache.get(path)
+
+            info = cache.cache_info()
+            assert info.entries == 2
+            assert info.bytes <= size * 2
+            assert info.evictions == 2
+
+    def test_derived_data_dropped_with_entry(self):
+        """Test derived analyses are invalidated together with the AST."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (path,) = _write_modules(Path(tmpdir), 1)
+            cache = ParseCache()
+            cache.get_entry(path).derived["functions"] = {}
+
+            cache.invalidate(path)
+            assert cache.lookup(path) is None
+            assert cache.get_entry(path).derived == {}
+
+    def test_syntax_error_propagates(self):
+        """Test parse errors are raised on every access, not cached away."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "bad.py"
+            path.write_text("def broken(:\n")
+            cache = ParseCache()
+
+            with pytest.raises(SyntaxError):
+                cache.get(path)
+            with pytest.raises(SyntaxError):
+                cache.get(path)
+            assert cache.cache_info().parses == 0
+
+
+    def test_entry_holds_bytes_and_lines(self):
+        """Test an entry keeps the raw bytes and decodes lines like a text-mode read."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "crlf.py"
+            path.write_bytes(b"a = 1\r\nb = a\r\n")
+            entry = ParseCache().get_entry(path)
+
+            assert entry.data == b"a = 1\r\nb = a\r\n"
+            assert entry.lines == ["a = 1", "b = a", ""]
+            assert entry.size == len(entry.data)
+
+    def test_snapshot_stats_each_path_once(self):
+        """Test files are not stat'ed again inside a snapshot, and are after it."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (path,) = _write_modules(Path(tmpdir), 1)
+            cache = ParseCache()
+            first = cache.get_entry(path)
+
+            with cache.snapshot():
+                assert cache.get_entry(path) is first
+                path.write_text("value0 = 42\n")
+                stat = path.stat()
+                os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+                assert cache.get_entry(path) is first
+                assert cache.mtime(Path(tmpdir) / "missing.py") is None
+
+            assert cache.get_entry(path) is not first
+
+    def test_missing_file_raises(self):
+        """Test looking up a missing file raises FileNotFoundError."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with pytest.raises(FileNotFoundError):
+                ParseCache().get_entry(Path(tmpdir) / "missing.py")
+
+class TestSharedCache:
+    """Test the Slicer and ImportResolver share one parse cache."""
+
+    def test_slicer_and_resolver_share_cache(self):
+        """Test an imported module is parsed once for both users."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmpdir = Path(tmpdir)
+            (tmpdir / "utils.py").write_text(
+                "def helper(value):\n    doubled = value * 2\n    return doubled\n"
+            )
+            main_file = tmpdir / "main.py"
+            main_file.write_text(
+                "from utils import helper\n\nx = 1\ny = helper(x)\n"
+            )
+
+            slicer = Slicer(root_path=str(tmpdir))
+            assert slicer.import_resolver is not None
+            assert slicer.import_resolver.parse_cache is slicer.parse_cache
+
+            slicer.slice(str(main_file), 4, "y", SliceDirection.BACKWARD)
+            assert tmpdir / "utils.py" in slicer.parse_cache
+            misses = slicer.parse_cache.cache_info().misses
+
+            slicer.slice(str(main_file), 4, "y", SliceDirection.BACKWARD)
+            assert slicer.parse_cache.cache_info().misses == misses
@@ -0,0 +1,164 @@
+"""Unit tests for flowslice.core.callgraph."""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+from flowslice.core.cache import ParseCache
+from flowslice.core.callgraph import MODULE_SCOPE, CallGraph
+from flowslice.core.disk_cache import DiskCache
+from flowslice.core.import_resolver import ImportResolver
+from flowslice.core.models import SliceDirection
+from flowslice.core.slicer import Slicer
+
+FILES = {
+    "pkg/__init__.py": "",
+    "pkg/storage.py": (
+        "class Base:\n"
+        "    def save(self, record):\n"
+        "        stored = record\n"
+        "        return stored\n"
+        "\n"
+        "\n"
+        "def write(payload):\n"
+        "    size = len(payload)\n"
+        "    return size\n"
+    ),
+    "service.py": (
+        "import pkg.storage\n"
+        "from pkg import storage\n"
+        "from pkg.storage import Base\n"
+        "\n"
+        "\n"
+        "class Service(Base):\n"
+        "    def __init__(self, name):\n"
+        "        self.name = name\n"
+        "\n"
+        "    def handle(self, request):\n"
+        "        record = request + 1\n"
+        "        self.save(record)\n"
+        "        return record\n"
+        "\n"
+        "    @staticmethod\n"
+        "    def check(value):\n"
+        "        valid = value > 0\n"
+        "        return valid\n"
+        "\n"
+        "\n"
+        "def run(data):\n"
+        "    service = Service('main')\n"
+        "    pkg.storage.write(data)\n"
+        "    storage.write(data)\n"
+        "    total = service.handle(data)\n"
+        "    Service.check(data)\n"
+        "    return total\n"
+        "\n"
+        "\n"
+        "run(1)\n"
+    ),
+}
+
+
+def _write_project(root: Path) -> None:
+    for name, source in FILES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+
+
+def _graph(root: Path, parse_cache: Optional[ParseCache] = None) -> CallGraph:
+    parse_cache = parse_cache if parse_cache is not None else ParseCache()
+    return CallGraph(parse_cache, ImportResolver(root, parse_cache))
+
+
+def _targets(graph: CallGraph, path: Path) -> dict[tuple[int, str], tuple[str, str, bool]]:
+    return {
+        key: (os.path.basename(edge.callee_path), edge.callee, edge.bound)
+        for key, edge in graph.edges(path).items()
+    }
+
+
+def test_edges_resolve_module_method_and_constructor_calls(tmp_path):
+    """Test calls through modules, self, classes and constructors get edges."""
+    _write_project(tmp_path)
+    graph = _graph(tmp_path)
+
+    assert _targets(graph, tmp_path / "service.py") == {
+        (12, "self.save"): ("storage.py", "Base.save", True),
+        (22, "Service"): ("service.py", "Service.__init__", True),
+        (23, "pkg.write"): ("storage.py", "write", False),
+        (24, "storage.write"): ("storage.py", "write", False),
+        (26, "Service.check"): ("service.py", "Service.check", False),
+        (30, "run"): ("service.py", "run", False),
+    }
+    # Calls on objects of unknown type are not resolved
+    assert graph.edge(tmp_path / "service.py", 25, "service.handle") is None
+
+
+def test_edges_are_reused_until_a_callee_module_changes(tmp_path):
+    """Test edges are resolved again once a module they point into is edited."""
+    _write_project(tmp_path)
+    parse_cache = ParseCache()
+    graph = _graph(tmp_path, parse_cache)
+    service = tmp_path / "service.py"
+    edges = graph.edges(service)
+
+    assert graph.edges(service) is edges
+
+    storage = tmp_path / "pkg" / "storage.py"
+    storage.write_text(FILES["pkg/storage.py"].replace("def write(", "def emit("))
+    stat = storage.stat()
+    os.utime(storage, (stat.st_atime, stat.st_mtime + 10))
+
+    assert (23, "pkg.write") not in graph.edges(service)
+
+
+def test_callers_and_callees(tmp_path):
+    """Test who-calls-this queries over the whole project."""
+    _write_project(tmp_path)
+    graph = _graph(tmp_path)
+    storage = tmp_path / "pkg" / "storage.py"
+
+    callers = graph.callers(storage, "write")
+
+    assert [(edge.caller, edge.line) for edge in callers] == [("run", 23), ("run", 24)]
+    assert [edge.caller for edge in graph.callers(storage, "Base.save")] == ["Service.handle"]
+    assert [edge.callee for edge in graph.callees(tmp_path / "service.py", MODULE_SCOPE)] == [
+        "run"
+    ]
+
+
+def test_parallel_build_matches_serial_build_and_persists_facts(tmp_path):
+    """Test facts collected by workers give the same graph and reach the disk cache."""
+    project = tmp_path / "project"
+    project.mkdir()
+    _write_project(project)
+    for index in range(4):
+        (project / f"client{index}.py").write_text(
+            f"from pkg.storage import write\n\n\ndef send{index}(data):\n    write(data)\n"
+        )
+
+    serial = _graph(project)
+    assert serial.build(jobs=1) == 10
+    disk_cache = DiskCache(tmp_path / "cache")
+    parallel = _graph(project, ParseCache(disk_cache=disk_cache))
+    assert parallel.build(jobs=2) == 10
+
+    storage = project / "pkg" / "storage.py"
+    assert parallel.callers(storage, "write") == serial.callers(storage, "write")
+    assert disk_cache.writes >= 4
+
+    fresh = ParseCache(disk_cache=DiskCache(tmp_path / "cache"))
+    assert _graph(project, fresh).build(jobs=1) == 10
+    assert fresh.parses == 0
+
+
+def test_slicer_follows_method_calls_through_the_graph(tmp_path):
+    """Test a slice enters an inherited method called through self."""
+    _write_project(tmp_path)
+    slicer = Slicer(str(tmp_path))
+
+    result = slicer.slice("service.py", 11, "record", SliceDirection.FORWARD)
+
+    nodes = {(node.file, node.line) for node in result.forward_slice}
+    assert ("storage.py", 3) in nodes
@@ -1,25 +1,31 @@
 """Unit tests for flowslice.cli.main."""
 
+import ast
+import io
+import json
+import subprocess
 import sys
+import sysconfig
 import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from flowslice.cli.main import main, print_usage
+from flowslice.cli.main import build_parser, get_cache_dir, get_search_paths, main
 
 
 class TestCLI:
     """Test CLI functionality."""
 
-    def test_print_usage(self, capsys):
-        """Test that print_usage outputs help text."""
-        print_usage()
-        captured = capsys.readouterr()
-        assert "flowslice - Dataflow Slicing for Python" in captured.out
-        assert "Usage:" in captured.out
-        assert "Examples:" in captured.out
+    def test_help_text(self):
+        """Test the generated help lists every format and the examples."""
+        help_text = build_parser().format_help()
+        assert "flowslice - Dataflow Slicing for Python" in help_text
+        assert "usage:" in help_text
+        assert "examples:" in help_text
+        for format_str in ("tree", "graph", "json", "ndjson", "dot"):
+            assert f"\n  {format_str} " in help_text
 
     def test_main_no_arguments(self, capsys):
         """Test main with no arguments shows usage and exits."""
@@ -31,6 +37,39 @@ class TestCLI:
         captured = capsys.readouterr()
         assert "flowslice - Dataflow Slicing for Python" in captured.out
 
+    @pytest.mark.parametrize("flag", ["-h", "--help"])
+    def test_main_help(self, flag, capsys):
+        """Test --help prints usage and succeeds."""
+        with patch.object(sys, "argv", ["flowslice", flag]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 0
+
+        assert "usage:" in capsys.readouterr().out
+
+    def test_startup_imports(self):
+        """Test importing the CLI does not import the slicer, server or formatters."""
+        code = (
+            "import sys, flowslice, flowslice.cli.main\n"
+            "print(sorted(m for m in sys.modules if m.startswith('flowslice')"
+            " or m == 'multiprocessing'))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        loaded = set(ast.literal_eval(output))
+
+        assert loaded.isdisjoint(
+            {
+                "flowslice.core.slicer",
+                "flowslice.cli.server",
+                "flowslice.core.parallel",
+                "flowslice.formatters.tree",
+                "flowslice.formatters.json",
+                "multiprocessing",
+            }
+        )
+
     def test_main_invalid_format(self, capsys):
         """Test main with invalid criterion format."""
         with patch.object(sys, "argv", ["flowslice", "invalid_format"]):
@@ -170,3 +209,223 @@ print(y)
             assert "BACKWARD SLICE" in captured.out
             assert "result" in captured.out
             assert "example.py" in captured.out
+
+
+class TestCLIBatch:
+    """Test the --criteria-file batch mode."""
+
+    CODE = "x = 10\ny = x + 5\nz = y * 2\n"
+
+    def test_criteria_file_json(self, tmp_path, capsys):
+        """Test each criterion yields one JSON document per line."""
+        source = tmp_path / "mod.py"
+        source.write_text(self.CODE)
+        criteria = tmp_path / "criteria.txt"
+        criteria.write_text(f"# flagged variables\n{source}:3:z\n\n{source}:1:x\n")
+
+        with patch.object(
+            sys, "argv", ["flowslice", "--criteria-file", str(criteria), "both", "json"]
+        ):
+            main()
+
+        lines = capsys.readouterr().out.splitlines()
+        results = [json.loads(line) for line in lines]
+        assert [r["target"]["variable"] for r in results] == ["z", "x"]
+        assert {n["line"] for n in results[0]["backward_slice"]} == {1, 2, 3}
+
+    def test_criteria_file_ndjson(self, tmp_path, capsys):
+        """Test NDJSON output has one record per line for every result and node."""
+        source = tmp_path / "mod.py"
+        source.write_text(self.CODE)
+        criteria = tmp_path / "criteria.txt"
+        criteria.write_text(f"{source}:3:z\n{source}:1:x\n")
+
+        with patch.object(
+            sys, "argv", ["flowslice", "--criteria-file", str(criteria), "backward", "ndjson"]
+        ):
+            main()
+
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        targets = [r["variable"] for r in records if r["type"] == "target"]
+        assert targets == ["z", "x"]
+        nodes = [r for r in records if r["type"] == "node" and r["slice"] == 0]
+        assert {r["line"] for r in nodes} == {1, 2, 3}
+
+    def test_criteria_from_stdin(self, tmp_path, capsys):
+        """Test criteria are read from stdin when the file name is -."""
+        source = tmp_path / "mod.py"
+        source.write_text(self.CODE)
+
+        with patch.object(sys, "argv", ["flowslice", "--criteria-file", "-", "backward"]):
+            with patch.object(sys, "stdin", io.StringIO(f"{source}:2:y\n")):
+                main()
+
+        assert "BACKWARD SLICE" in capsys.readouterr().out
+
+    def test_invalid_criterion_line(self, tmp_path, capsys):
+        """Test a malformed criterion reports its line number."""
+        criteria = tmp_path / "criteria.txt"
+        criteria.write_text("mod.py:1:x\nnot-a-criterion\n")
+
+        with patch.object(sys, "argv", ["flowslice", "--criteria-file", str(criteria)]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 1
+
+        assert "Error: Invalid criterion on line 2" in capsys.readouterr().out
+
+    def test_jobs(self, tmp_path, capsys):
+        """Test --jobs gives the same output as a sequential run."""
+        source = tmp_path / "mod.py"
+        source.write_text(self.CODE)
+        criteria = tmp_path / "criteria.txt"
+        criteria.write_text(f"{source}:3:z\n{source}:2:y\n{source}:1:x\n")
+        argv = ["flowslice", "--criteria-file", str(criteria), "both", "json"]
+
+        with patch.object(sys, "argv", argv):
+            main()
+        sequential = capsys.readouterr().out
+        with patch.object(sys, "argv", argv[:1] + ["--jobs", "2"] + argv[1:]):
+            main()
+
+        assert capsys.readouterr().out == sequential
+
+    @pytest.mark.parametrize("jobs", ["many", "-1"])
+    def test_invalid_jobs(self, jobs, capsys):
+        """Test --jobs rejects values that are not process counts."""
+        with patch.object(sys, "argv", ["flowslice", "--criteria-file", "-", "--jobs", jobs]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 1
+
+        assert "Error: argument -j/--jobs" in capsys.readouterr().out
+
+    def test_many_criteria(self, tmp_path, capsys):
+        """Test several criteria given as arguments are sliced by one process."""
+        source = tmp_path / "mod.py"
+        source.write_text(self.CODE)
+
+        argv = ["flowslice", f"{source}:3:z", f"{source}:1:x", "backward", "json"]
+        with patch.object(sys, "argv", argv):
+            main()
+
+        results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [r["target"]["variable"] for r in results] == ["z", "x"]
+
+    def test_options_and_output_file(self, tmp_path, capsys):
+        """Test --direction, --format and --output replace the positional forms."""
+        source = tmp_path / "mod.py"
+        source.write_text(self.CODE)
+        output = tmp_path / "slices.ndjson"
+
+        argv = ["flowslice", f"{source}:3:z", "-d", "backward", "-f", "ndjson", "-o", str(output)]
+        with patch.object(sys, "argv", argv):
+            main()
+
+        assert capsys.readouterr().out == ""
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert records[0]["type"] == "target" and records[0]["variable"] == "z"
+        assert {r["direction"] for r in records if r["type"] == "node"} == {"backward"}
+
+    def test_arguments_and_stdin(self, tmp_path, capsys):
+        """Test - reads more criteria from stdin after those given as arguments."""
+        source = tmp_path / "mod.py"
+        source.write_text(self.CODE)
+
+        with patch.object(sys, "argv", ["flowslice", f"{source}:3:z", "-", "both", "json"]):
+            with patch.object(sys, "stdin", io.StringIO(f"{source}:2:y\n")):
+                main()
+
+        results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [r["target"]["variable"] for r in results] == ["z", "y"]
+
+    @pytest.mark.parametrize(
+        "extra, message",
+        [
+            (["backward", "json", "more"], "Error: Unexpected argument 'more'"),
+            (["--unknown"], "Error: unrecognized arguments: --unknown"),
+        ],
+    )
+    def test_bad_arguments(self, tmp_path, capsys, extra, message):
+        """Test argument errors are reported like other errors."""
+        source = tmp_path / "mod.py"
+        source.write_text(self.CODE)
+
+        with patch.object(sys, "argv", ["flowslice", f"{source}:3:z", *extra]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+            assert exc_info.value.code == 1
+
+        assert message in capsys.readouterr().out
+
+    def test_stats(self, tmp_path, capsys):
+        """Test --stats prints the stats of every slice to stderr only."""
+        source = tmp_path / "mod.py"
+        source.write_text(self.CODE)
+        criteria = tmp_path / "criteria.txt"
+        criteria.write_text(f"{source}:3:z\n{source}:1:x\n")
+        argv = ["flowslice", "--criteria-file", str(criteria), "both", "json"]
+
+        with patch.object(sys, "argv", argv):
+            main()
+        plain = capsys.readouterr().out
+        with patch.object(sys, "argv", [*argv, "--stats"]):
+            main()
+
+        captured = capsys.readouterr()
+        assert captured.out == plain
+        assert captured.err.count("Stats for mod.py:") == 2
+        assert "total (ms)" in captured.err
+        assert "nodes_emitted" in captured.err
+
+
+class TestCLICacheDir:
+    """Test where the CLI keeps its on-disk cache."""
+
+    def test_default_is_per_user(self, tmp_path, monkeypatch):
+        """Test the cache goes under XDG_CACHE_HOME, not the working directory."""
+        monkeypatch.delenv("FLOWSLICE_CACHE_DIR")
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+        assert get_cache_dir() == str(tmp_path / "xdg" / "flowslice")
+
+        monkeypatch.delenv("XDG_CACHE_HOME")
+        monkeypatch.setenv("HOME", str(tmp_path))
+        assert get_cache_dir() == str(tmp_path / ".cache" / "flowslice")
+
+    def test_environment(self, tmp_path, monkeypatch):
+        """Test FLOWSLICE_CACHE_DIR moves the cache, or disables it when empty."""
+        monkeypatch.setenv("FLOWSLICE_CACHE_DIR", str(tmp_path / "cache"))
+        assert get_cache_dir() == str(tmp_path / "cache")
+
+        monkeypatch.setenv("FLOWSLICE_CACHE_DIR", "")
+        assert get_cache_dir() is None
+
+
+class TestCLISearchPaths:
+    """Test following imports into installed packages."""
+
+    def test_search_path_from_environment(self, tmp_path, capsys, monkeypatch):
+        """Test FLOWSLICE_SEARCH_PATH lets slices enter installed packages."""
+        site = tmp_path / "site"
+        (site / "mylib").mkdir(parents=True)
+        (site / "mylib" / "__init__.py").write_text("from .core import transform\n")
+        (site / "mylib" / "core.py").write_text(
+            "def transform(data):\n    cleaned = data.strip()\n    return cleaned\n"
+        )
+        source = tmp_path / "main.py"
+        source.write_text("from mylib import transform\n\nraw = ''\nout = transform(raw)\n")
+        monkeypatch.setenv("FLOWSLICE_SEARCH_PATH", str(site))
+
+        with patch.object(sys, "argv", ["flowslice", f"{source}:3:raw", "forward", "json"]):
+            main()
+
+        result = json.loads(capsys.readouterr().out)
+        assert "core.py" in {node["file"] for node in result["forward_slice"]}
+
+    def test_site_packages_flag(self, monkeypatch):
+        """Test --site-packages adds the interpreter's site-packages after the environment's."""
+        monkeypatch.setenv("FLOWSLICE_SEARCH_PATH", "")
+        assert get_search_paths(False) == []
+
+        search_paths = get_search_paths(True)
+        assert sysconfig.get_paths()["purelib"] in search_paths
@@ -0,0 +1,89 @@
+"""Unit tests for flowslice.core.columnar."""
+
+import pytest
+
+from flowslice.core.columnar import BACKWARD, FORWARD, SliceColumns
+from flowslice.core.models import SliceDirection, SliceNode, SliceResult
+from flowslice.core.slicer import Slicer
+
+
+def _result(variable: str) -> SliceResult:
+    return SliceResult(
+        target_file="main.py",
+        target_line=3,
+        target_variable=variable,
+        backward_slice=[
+            SliceNode("main.py", 1, "main", "x = 1", "x", "assignment"),
+            SliceNode("main.py", 2, "main", "y = x", "y", "assignment", ["x"]),
+        ],
+        forward_slice=[
+            SliceNode("util.py", 7, "show", "print(y)", "y", "passed to print()", ["x", "y"]),
+        ],
+    )
+
+
+def test_columns_hold_one_row_per_node():
+    """Test nodes of several results become rows with shared string ids."""
+    columns = SliceColumns.from_results([_result("y"), _result("x")])
+    strings = columns.strings
+
+    assert len(columns) == 6
+    assert list(columns.columns["slice"]) == [0, 0, 0, 1, 1, 1]
+    assert list(columns.columns["direction"]) == [BACKWARD, BACKWARD, FORWARD] * 2
+    assert list(columns.columns["line"]) == [1, 2, 7] * 2
+    assert [strings[i] for i in columns.columns["file"][:3]] == ["main.py", "main.py", "util.py"]
+    assert columns.columns["operation"][0] == columns.columns["operation"][4]
+    assert columns.dependencies(0) == []
+    assert columns.dependencies(2) == ["x", "y"]
+    assert [strings[i] for _, _, i in columns.targets] == ["y", "x"]
+    assert len(strings) == len(set(strings.strings))
+
+
+def test_buffers_and_rebuilt_nodes():
+    """Test raw buffers expose the columns and rows can be turned back into nodes."""
+    columns = SliceColumns.from_results([_result("y")])
+
+    buffers = columns.buffers()
+    assert buffers["line"].tolist() == [1, 2, 7]
+    assert buffers["dependency_offsets"].tolist() == [0, 0, 1, 3]
+    node = columns.node(1, lines=["x = 1\n", "y = x\n"])
+    assert (node.file, node.line, node.code, node.dependencies) == (
+        "main.py",
+        2,
+        "y = x\n",
+        ["x"],
+    )
+
+
+def test_to_numpy():
+    """Test the columns convert to a structured array."""
+    np = pytest.importorskip("numpy")
+    columns = SliceColumns.from_results([_result("y")])
+
+    records = columns.to_numpy()
+
+    assert records.dtype.names == (
+        "slice",
+        "direction",
+        "file",
+        "line",
+        "function",
+        "variable",
+        "operation",
+    )
+    assert np.array_equal(records["line"], [1, 2, 7])
+
+
+def test_columns_of_slicer_results(tmp_path):
+    """Test results of a batch of slices can be exported together."""
+    (tmp_path / "main.py").write_text("a = 1\nb = a + 1\nc = b * 2\n")
+    slicer = Slicer(str(tmp_path))
+    results = [
+        slicer.slice("main.py", line, variable, SliceDirection.BACKWARD)
+        for line, variable in ((2, "b"), (3, "c"))
+    ]
+
+    columns = SliceColumns.from_results(results)
+
+    assert len(columns) == sum(len(result.backward_slice) for result in results)
+    assert set(columns.columns["slice"]) == {0, 1}
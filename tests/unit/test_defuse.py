@@ -0,0 +1,108 @@
+"""Unit tests for flowslice.core.defuse."""
+
+import ast
+import tempfile
+from pathlib import Path
+
+from flowslice.core.defuse import DefUseIndex, get_names_from_expr
+from flowslice.core.models import SliceDirection
+from flowslice.core.slicer import Slicer
+
+
+class TestGetNamesFromExpr:
+    """Test name extraction from expressions."""
+
+    def test_attribute_paths(self):
+        """Test attribute chains yield every prefix."""
+        expr = ast.parse("obj.attr.sub", mode="eval").body
+        assert get_names_from_expr(expr) == {"obj", "obj.attr", "obj.attr.sub"}
+
+    def test_comprehension_target_excluded(self):
+        """Test comprehension variables are not reported as uses."""
+        expr = ast.parse("[x * 2 for x in source]", mode="eval").body
+        assert get_names_from_expr(expr) == {"source"}
+
+
+class TestDefUseIndex:
+    """Test DefUseIndex construction and lookups."""
+
+    CODE = """
+def process(data):
+    total = 0
+    for item in data:
+        total = total + item
+    result.append(total)
+    return total
+
+def other():
+    total = 99
+    print(total)
+"""
+
+    def test_definitions_across_scopes(self):
+        """Test definitions of a name are found in every function, in order."""
+        index = DefUseIndex.build(ast.parse(self.CODE))
+        sites = index.definitions("total")
+        assert [(site.line, site.function) for site in sites] == [
+            (3, "process"),
+            (5, "process"),
+            (10, "other"),
+        ]
+        assert sites[1].uses == frozenset({"total", "item"})
+
+    def test_parameter_and_loop_definitions(self):
+        """Test parameters and for-loop targets are recorded as definitions."""
+        index = DefUseIndex.build(ast.parse(self.CODE))
+        assert [site.line for site in index.definitions("data")] == [2]
+        assert index.definitions("item")[0].uses == frozenset({"data"})
+
+    def test_method_call_defines_object(self):
+        """Test a method call is recorded as a definition of its object."""
+        index = DefUseIndex.build(ast.parse(self.CODE))
+        sites = index.definitions("result")
+        assert [site.line for site in sites] == [6]
+        assert sites[0].uses == frozenset({"total"})
+
+    def test_uses_are_scoped(self):
+        """Test uses are looked up per function scope."""
+        index = DefUseIndex.build(ast.parse(self.CODE))
+        assert [site.line for site in index.uses("total", "process")] == [5, 6]
+        assert [site.line for site in index.uses("total", "other")] == [11]
+        assert index.uses("total", "missing") == []
+
+    def test_forward_start(self):
+        """Test forward slices start at the first assignment at or after a line."""
+        index = DefUseIndex.build(ast.parse(self.CODE))
+        order, function = index.forward_start(4)
+        assert function == "process"
+        assert index.forward_start(100) is None
+        assert index.forward_start(9) is not None
+        assert order < index.forward_start(9)[0]
+
+
+class TestSlicerIndexCache:
+    """Test the slicer builds the def-use index once per file."""
+
+    def test_index_cached_next_to_ast(self):
+        """Test repeated slices reuse the index stored in the parse cache."""
+        code = """
+x = 10
+y = x + 5
+z = y * 2
+"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+            f.write(code)
+            f.flush()
+            temp_path = f.name
+
+        try:
+            slicer = Slicer()
+            slicer.slice(temp_path, 4, "z", SliceDirection.BOTH)
+            index = slicer.parse_cache.lookup(Path(temp_path)).derived["defuse"]
+            assert isinstance(index, DefUseIndex)
+
+            result = slicer.slice(temp_path, 2, "x", SliceDirection.FORWARD)
+            assert slicer.parse_cache.lookup(Path(temp_path)).derived["defuse"] is index
+            assert {node.line for node in result.forward_slice} == {3, 4}
+        finally:
+            Path(temp_path).unlink()
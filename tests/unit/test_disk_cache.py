@@ -0,0 +1,92 @@
+"""Unit tests for flowslice.core.disk_cache."""
+
+import os
+from pathlib import Path
+
+from flowslice.core.disk_cache import DiskCache
+from flowslice.core.models import SliceDirection
+from flowslice.core.slicer import Slicer
+
+MAIN = """from utils import helper
+
+x = 1
+y = x + 2
+z = helper(y)
+"""
+
+
+def _write_project(root: Path) -> Path:
+    root.mkdir()
+    (root / "utils.py").write_text("def helper(value):\n    return value\n")
+    main_file = root / "main.py"
+    main_file.write_text(MAIN)
+    return main_file
+
+
+def _slice(root: Path, main_file: Path, cache_dir: Path) -> tuple[Slicer, list[int]]:
+    slicer = Slicer(root_path=str(root), cache_dir=str(cache_dir))
+    result = slicer.slice(str(main_file), 4, "y", SliceDirection.BACKWARD)
+    return slicer, [node.line for node in result.backward_slice]
+
+
+class TestDiskCache:
+    """Test the DiskCache store itself."""
+
+    def test_round_trip(self, tmp_path):
+        """Test stored facts are loaded back under the same key."""
+        cache = DiskCache(tmp_path / "cache")
+        key = DiskCache.key(tmp_path / "mod.py", b"x = 1\n")
+        cache.store(key, {"functions": {"f": 1}})
+
+        assert cache.load(key) == {"functions": {"f": 1}}
+        assert cache.load(DiskCache.key(tmp_path / "mod.py", b"x = 2\n")) is None
+        assert (cache.hits, cache.misses, cache.writes) == (1, 1, 1)
+        assert (tmp_path / "cache" / ".gitignore").exists()
+
+    def test_corrupt_entry_is_a_miss(self, tmp_path):
+        """Test unreadable entries are ignored rather than raised."""
+        cache = DiskCache(tmp_path)
+        key = DiskCache.key(tmp_path / "mod.py", b"")
+        cache.store(key, {"functions": {}})
+        for path in tmp_path.rglob(key):
+            path.write_bytes(b"not marshal data")
+
+        assert cache.load(key) is None
+
+
+class TestSlicerDiskCache:
+    """Test the Slicer reuses facts across processes via the disk cache."""
+
+    def test_warm_cache_skips_parsing(self, tmp_path):
+        """Test a new slicer with a warm disk cache does not parse the file."""
+        root = tmp_path / "project"
+        main_file = _write_project(root)
+        cache_dir = tmp_path / "cache"
+
+        cold, cold_lines = _slice(root, main_file, cache_dir)
+        assert cold.parse_cache.cache_info().parses == 1
+        assert cold.parse_cache.disk_cache.writes == 2  # The file's facts and directory listings
+
+        warm, warm_lines = _slice(root, main_file, cache_dir)
+        assert warm_lines == cold_lines == [3, 4]
+        assert warm.parse_cache.cache_info().parses == 0
+        assert warm.parse_cache.disk_cache.writes == 0
+
+    def test_stale_import_map_recomputed(self, tmp_path):
+        """Test cached imports are recomputed when an imported module appears."""
+        root = tmp_path / "project"
+        main_file = _write_project(root)
+        cache_dir = tmp_path / "cache"
+        main_file.write_text("from pkg import helper\n" + MAIN.split("\n", 1)[1])
+        _slice(root, main_file, cache_dir)
+
+        package = root / "pkg"
+        package.mkdir()
+        (package / "__init__.py").write_text("from utils import helper\n")
+        stat = root.stat()
+        os.utime(root, (stat.st_atime, stat.st_mtime + 10))
+
+        warm = Slicer(root_path=str(root), cache_dir=str(cache_dir))
+        assert warm.import_resolver is not None
+        imports = warm.import_resolver.get_imports(main_file)
+        assert imports["helper"][0] == package / "__init__.py"
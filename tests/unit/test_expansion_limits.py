@@ -0,0 +1,136 @@
+"""Unit tests for limits on following calls across functions and files."""
+
+import json
+import os
+from pathlib import Path
+
+from flowslice.core.models import TRUNCATED, ExpansionLimits, SliceDirection
+from flowslice.core.slicer import Slicer
+from flowslice.formatters.json import JSONFormatter
+from flowslice.formatters.tree import TreeFormatter
+
+# main.py -> service.handle -> repository.store -> storage.write
+FILES = {
+    "main.py": "from service import handle\n\n\ndef main():\n    data = 1\n    handle(data)\n",
+    "service.py": (
+        "from repository import store\n\n\ndef handle(request):\n"
+        "    record = request + 1\n    store(record)\n"
+    ),
+    "repository.py": (
+        "from storage import write\n\n\ndef store(item):\n    row = item * 2\n    write(row)\n"
+    ),
+    "storage.py": "def write(payload):\n    size = len(payload)\n    log(size)\n",
+}
+
+
+def _write_project(root: Path) -> None:
+    for name, source in FILES.items():
+        (root / name).write_text(source)
+
+
+def _slice(root: Path, limits: ExpansionLimits) -> list:
+    slicer = Slicer(str(root), limits=limits)
+    return slicer.slice("main.py", 5, "data", SliceDirection.FORWARD).forward_slice
+
+
+def _files(nodes: list) -> list[str]:
+    return sorted({node.file for node in nodes if node.operation != TRUNCATED})
+
+
+def _markers(nodes: list) -> list[tuple[str, int, str]]:
+    return [(node.file, node.line, node.context) for node in nodes if node.operation == TRUNCATED]
+
+
+def test_default_follows_calls_of_the_sliced_file_only(tmp_path):
+    """Test by default calls made by called functions are marked, not followed."""
+    _write_project(tmp_path)
+
+    nodes = _slice(tmp_path, ExpansionLimits())
+
+    assert _files(nodes) == ["main.py", "service.py"]
+    assert _markers(nodes) == [("service.py", 6, "store() not followed: max depth 1 reached")]
+
+
+def test_default_output_marks_calls_not_followed(tmp_path):
+    """Test a default slicer's tree and JSON output include the truncated call."""
+    _write_project(tmp_path)
+    result = Slicer(str(tmp_path)).slice("main.py", 5, "data", SliceDirection.FORWARD)
+
+    assert Slicer(str(tmp_path)).limits == ExpansionLimits(max_depth=1)
+    assert _markers(result.forward_slice) == [
+        ("service.py", 6, "store() not followed: max depth 1 reached")
+    ]
+    json_nodes = json.loads(JSONFormatter.format(result))["forward_slice"]
+    assert [node["line"] for node in json_nodes if node["operation"] == TRUNCATED] == [6]
+    tree = TreeFormatter.format(result, SliceDirection.FORWARD)
+    assert "store() not followed: max depth 1 reached" in tree
+
+
+def test_deeper_calls_are_followed_up_to_max_depth(tmp_path):
+    """Test raising the depth follows calls through several files."""
+    _write_project(tmp_path)
+
+    nodes = _slice(tmp_path, ExpansionLimits(max_depth=None))
+    assert _files(nodes) == ["main.py", "repository.py", "service.py", "storage.py"]
+    assert not _markers(nodes)
+
+    nodes = _slice(tmp_path, ExpansionLimits(max_depth=2))
+    assert _files(nodes) == ["main.py", "repository.py", "service.py"]
+    assert _markers(nodes) == [("repository.py", 6, "write() not followed: max depth 2 reached")]
+
+    nodes = _slice(tmp_path, ExpansionLimits(max_depth=0))
+    assert _files(nodes) == ["main.py"]
+    assert _markers(nodes) == [("main.py", 6, "handle() not followed: max depth 0 reached")]
+
+
+def test_file_and_node_budgets(tmp_path):
+    """Test the number of files entered and of nodes added are bounded."""
+    _write_project(tmp_path)
+
+    nodes = _slice(tmp_path, ExpansionLimits(max_depth=None, max_files=2))
+    assert _files(nodes) == ["main.py", "repository.py", "service.py"]
+    assert _markers(nodes) == [("repository.py", 6, "write() not followed: max files 2 reached")]
+
+    nodes = _slice(tmp_path, ExpansionLimits(max_depth=None, max_nodes=1))
+    assert _markers(nodes)[0][:2] == ("service.py", 6)
+
+
+def test_time_budget_results_are_not_cached(tmp_path):
+    """Test a slice cut short by the clock is computed again next time."""
+    _write_project(tmp_path)
+    slicer = Slicer(str(tmp_path), limits=ExpansionLimits(max_depth=None, time_budget=0.0))
+
+    result = slicer.slice("main.py", 5, "data", SliceDirection.FORWARD)
+
+    assert "time budget" in _markers(result.forward_slice)[0][2]
+    entry = slicer.parse_cache.get_entry(tmp_path / "main.py")
+    assert entry.derived[slicer._slices_key] == {}
+
+
+def test_change_in_a_nested_file_invalidates_cached_slice(tmp_path):
+    """Test cached slices notice edits to files reached through nested calls."""
+    _write_project(tmp_path)
+    slicer = Slicer(str(tmp_path), limits=ExpansionLimits(max_depth=None))
+    slicer.slice("main.py", 5, "data", SliceDirection.FORWARD)
+
+    storage = tmp_path / "storage.py"
+    storage.write_text("def write(payload):\n    size = len(payload)\n    total = size + 1\n")
+    stat = storage.stat()
+    os.utime(storage, (stat.st_atime, stat.st_mtime + 10))
+
+    nodes = slicer.slice("main.py", 5, "data", SliceDirection.FORWARD).forward_slice
+    assert ("storage.py", 3) in {(node.file, node.line) for node in nodes}
+
+
+def test_recursive_calls_terminate(tmp_path):
+    """Test an unlimited depth does not follow recursion forever."""
+    (tmp_path / "main.py").write_text(
+        "def walk(node):\n    child = node - 1\n    walk(child)\n\n\n"
+        "def main():\n    start = 10\n    walk(start)\n"
+    )
+
+    slicer = Slicer(str(tmp_path), limits=ExpansionLimits(max_depth=None))
+
+    nodes = slicer.slice("main.py", 7, "start", SliceDirection.FORWARD).forward_slice
+
+    assert [node.line for node in nodes] == [2, 3, 8]
@@ -1,7 +1,7 @@
 """Unit tests for flowslice.formatters.tree."""
 
 
-from flowslice.core.models import SliceDirection, SliceNode, SliceResult
+from flowslice.core.models import TRUNCATED, SliceDirection, SliceNode, SliceResult
 from flowslice.formatters.tree import TreeFormatter
 
 
@@ -171,6 +171,60 @@ class TestTreeFormatter:
 
         assert "iterates over items" in output
 
+    def test_format_explains_truncated_call(self):
+        """Test that a call that was not followed shows why on its line."""
+        call = SliceNode(
+            file="test.py",
+            line=41,
+            function="main",
+            code="store(x)",
+            variable="x",
+            operation="passed to store()",
+        )
+        marker = SliceNode(
+            file="test.py",
+            line=41,
+            function="main",
+            code="store(x)",
+            variable="x",
+            operation=TRUNCATED,
+            context="store() not followed: max depth 1 reached",
+        )
+        result = SliceResult(
+            target_file="test.py",
+            target_line=40,
+            target_variable="x",
+            forward_slice=[call, marker],
+        )
+        output = TreeFormatter().format(result, SliceDirection.FORWARD)
+
+        assert "store() not followed: max depth 1 reached" in output
+        assert "Also: truncated" not in output
+
+    def test_format_leaves_nodes_unchanged(self):
+        """Test merging nodes of the same line does not modify the result."""
+        assignment = SliceNode(
+            file="test.py",
+            line=41,
+            function="main",
+            code="y = store(x)",
+            variable="y",
+            operation="assignment",
+            dependencies=["x"],
+        )
+        call = assignment.replace(variable="x", operation="passed to store()", dependencies=["z"])
+        result = SliceResult(
+            target_file="test.py",
+            target_line=40,
+            target_variable="x",
+            forward_slice=[assignment, call],
+        )
+        formatter = TreeFormatter()
+        output = formatter.format(result, SliceDirection.FORWARD)
+
+        assert assignment.dependencies == ["x"] and assignment.context is None
+        assert formatter.format(result, SliceDirection.FORWARD) == output
+
     def test_format_groups_by_function(self):
         """Test that nodes are grouped by function in output."""
         node1 = SliceNode(
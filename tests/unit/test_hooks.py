@@ -0,0 +1,138 @@
+"""Unit tests for flowslice.core.hooks."""
+
+import pytest
+
+from flowslice.core.cache import ParseCache
+from flowslice.core.hooks import (
+    CACHE_HIT,
+    FILE_PARSED,
+    FUNCTION_ENTERED,
+    FUNCTION_EXITED,
+    NODE_EMITTED,
+    PASS_FINISHED,
+    PASS_STARTED,
+    Hooks,
+)
+from flowslice.core.models import SliceCriterion, SliceDirection, SliceNode
+from flowslice.core.slicer import Slicer
+
+HELPER = "def double(v):\n    w = v * 2\n    return w\n"
+MAIN = "from helper import double\n\na = 1\nb = double(a)\nc = b + 1\n"
+
+
+class TestHooks:
+    """Test registering hooks."""
+
+    def test_add_and_remove(self):
+        """Test hooks are called in registration order until removed."""
+        hooks = Hooks()
+        calls = []
+        first = lambda event, arg: calls.append(("first", event, arg))  # noqa: E731
+        second = lambda event, arg: calls.append(("second", event, arg))  # noqa: E731
+        assert not hooks.active
+
+        hooks.add(first)
+        hooks.add(second)
+        hooks.emit("event", 1)
+        hooks.remove(first)
+        hooks.emit("event", 2)
+
+        assert calls == [("first", "event", 1), ("second", "event", 1), ("second", "event", 2)]
+        assert hooks.active and len(hooks) == 1
+        hooks.remove(second)
+        assert not hooks.active
+        with pytest.raises(ValueError):
+            hooks.remove(second)
+
+        hooks.add(first)
+        hooks.clear()
+        assert not hooks.active and len(hooks) == 0
+
+    def test_hook_can_remove_itself(self):
+        """Test a hook removing itself does not skip the others."""
+        hooks = Hooks()
+        calls = []
+
+        def once(event, arg):
+            calls.append("once")
+            hooks.remove(once)
+
+        hooks.add(once)
+        hooks.add(lambda event, arg: calls.append("always"))
+        hooks.emit("event", None)
+        hooks.emit("event", None)
+
+        assert calls == ["once", "always", "always"]
+
+    def test_shared_with_parse_cache(self):
+        """Test slicers sharing a parse cache share its hooks."""
+        parse_cache = ParseCache()
+        assert Slicer(parse_cache=parse_cache).hooks is parse_cache.hooks
+        assert Slicer(parse_cache=parse_cache).hooks is Slicer(parse_cache=parse_cache).hooks
+
+
+class TestSlicerEvents:
+    """Test the events emitted while slicing."""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        (tmp_path / "helper.py").write_text(HELPER)
+        path = tmp_path / "main.py"
+        path.write_text(MAIN)
+        return tmp_path, path
+
+    def test_events_of_a_slice(self, project):
+        """Test parses, entered functions, passes and emitted nodes are reported."""
+        root, path = project
+        slicer = Slicer(str(root))
+        events = []
+        slicer.hooks.add(lambda event, arg: events.append((event, arg)))
+
+        result = slicer.slice(str(path), 5, "c", SliceDirection.BACKWARD)
+
+        names = [event for event, _ in events]
+        parsed = {arg.name for event, arg in events if event == FILE_PARSED}
+        assert parsed == {"main.py", "helper.py"}
+        criterion = SliceCriterion(str(path), 5, "c", SliceDirection.BACKWARD)
+        assert (PASS_STARTED, ("backward", criterion)) in events
+        assert events[-1] == (PASS_FINISHED, ("backward", criterion))
+        assert PASS_STARTED not in names[names.index(PASS_STARTED) + 1 :]
+        entered = [arg for event, arg in events if event == FUNCTION_ENTERED]
+        exited = [arg for event, arg in events if event == FUNCTION_EXITED]
+        assert entered == exited == [(root / "helper.py", "double")]
+        assert names.index(FUNCTION_ENTERED) < names.index(FUNCTION_EXITED)
+        emitted = [arg for event, arg in events if event == NODE_EMITTED]
+        assert emitted == result.backward_slice
+        assert all(isinstance(node, SliceNode) for node in emitted)
+
+    def test_cache_hits(self, project):
+        """Test repeated slices report the caches that answered them."""
+        root, path = project
+        slicer = Slicer(str(root))
+        slicer.slice(str(path), 5, "c", SliceDirection.BACKWARD)
+        hits = []
+        slicer.hooks.add(lambda event, arg: hits.append(arg) if event == CACHE_HIT else None)
+
+        slicer.slice(str(path), 5, "c", SliceDirection.BACKWARD)
+        slicer.slice(str(path), 4, "b", SliceDirection.BACKWARD)
+
+        caches = {cache for cache, _ in hits}
+        assert {"parse", "slice", "summary"} <= caches
+        assert ("summary", (root / "helper.py", "double")) in hits
+        criterion = SliceCriterion(str(path), 5, "c", SliceDirection.BACKWARD)
+        assert ("slice", criterion) in hits
+
+    def test_no_hooks(self, project, monkeypatch):
+        """Test nothing is emitted once the last hook is removed."""
+        root, path = project
+        slicer = Slicer(str(root))
+        slicer.hooks.add(print)
+        slicer.hooks.remove(print)
+
+        def fail(self, event, arg):
+            raise AssertionError(f"{event} emitted without hooks")
+
+        monkeypatch.setattr(Hooks, "emit", fail)
+        result = slicer.slice(str(path), 4, "b")
+
+        assert result.backward_slice and result.forward_slice
@@ -1,9 +1,11 @@
 """Tests for import resolution and cross-file analysis."""
 
 import ast
+import os
 import tempfile
 from pathlib import Path
 
+from flowslice.core.cache import ParseCache
 from flowslice.core.import_resolver import ImportResolver
 
 
@@ -101,6 +103,38 @@ def process():
     assert func_def3 is None
 
 
+def test_find_function_in_module():
+    """Test finding function definitions through a module's cached symbol table."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        module = tmpdir / "module.py"
+        module.write_text(
+            "def helper(x):\n    return x * 2\n\nclass Tool:\n    def run(self):\n        pass\n"
+        )
+        resolver = ImportResolver(tmpdir)
+
+        func_def = resolver.find_function_in_module(module, "helper")
+        assert func_def is not None and func_def.name == "helper"
+        assert resolver.find_function_in_module(module, "Tool.run").name == "run"
+        assert resolver.find_function_in_module(module, "nonexistent") is None
+        assert resolver.find_function_in_module(tmpdir / "missing.py", "helper") is None
+        assert resolver.parse_cache.cache_info().parses == 1
+
+
+def test_parse_imports_matches_get_imports():
+    """Test the tree-based entry point returns the cached import map."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        main_file = tmpdir / "main.py"
+        main_file.write_text("from utils import process as run\n")
+        (tmpdir / "utils.py").write_text("def process(): pass\n")
+
+        resolver = ImportResolver(tmpdir)
+        imports = resolver.parse_imports(ast.parse(main_file.read_text()), main_file)
+        assert imports == resolver.get_imports(main_file)
+        assert imports["run"] == (tmpdir / "utils.py", "process")
+
+
 def test_resolve_function_source():
     """Test resolving a function call to its source."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -247,3 +281,78 @@ from .time_utils import parse_time
         # Each should trace to its actual source
         assert imports["detect_format"][0] == file_utils
         assert imports["parse_time"][0] == time_utils
+
+
+def test_get_imports_notices_new_module():
+    """Test a cached import map is refreshed when an imported module appears."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        main_file = tmpdir / "main.py"
+        main_file.write_text("from utils import helper\n")
+
+        resolver = ImportResolver(tmpdir)
+        assert resolver.get_imports(main_file) == {}
+
+        utils_file = tmpdir / "utils.py"
+        utils_file.write_text("def helper(): pass\n")
+        stat = tmpdir.stat()
+        os.utime(tmpdir, (stat.st_atime, stat.st_mtime + 10))
+
+        assert resolver.get_imports(main_file) == {"helper": (utils_file, "helper")}
+
+
+def test_get_imports_cached_per_root():
+    """Test resolvers with different roots sharing a cache keep their own import maps."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmpdir = Path(tmpdir)
+        (tmpdir / "pkg").mkdir()
+        main_file = tmpdir / "pkg" / "main.py"
+        main_file.write_text("from utils import helper\n")
+        (tmpdir / "utils.py").write_text("def helper(): pass\n")
+
+        cache = ParseCache()
+        nested = ImportResolver(tmpdir / "pkg", parse_cache=cache)
+        top = ImportResolver(tmpdir, parse_cache=cache)
+
+        assert nested.get_imports(main_file) == {}
+        assert top.get_imports(main_file) == {"helper": (tmpdir / "utils.py", "helper")}
+
+
+def test_export_table_follows_star_imports_and_chains(tmp_path):
+    """Test star imports honour __all__ and nested packages resolve in one lookup."""
+    package = tmp_path / "pkg"
+    (package / "inner").mkdir(parents=True)
+    (package / "__init__.py").write_text(
+        "from .shapes import *\nfrom .inner import deep as renamed\n"
+    )
+    (package / "shapes.py").write_text(
+        "__all__ = ['area']\n\ndef area(x):\n    return x\n\ndef volume(x):\n    return x\n"
+    )
+    (package / "inner" / "__init__.py").write_text("from .core import deep\n")
+    (package / "inner" / "core.py").write_text("def deep(x):\n    return x\n")
+
+    resolver = ImportResolver(tmp_path)
+    exports = resolver.get_exports(package / "__init__.py")
+
+    assert exports == {
+        "area": (package / "shapes.py", "area"),
+        "renamed": (package / "inner" / "core.py", "deep"),
+    }
+    assert resolver.get_exports(package / "__init__.py") is exports
+
+
+def test_circular_reexports_terminate(tmp_path):
+    """Test packages re-exporting from each other do not recurse forever."""
+    package = tmp_path / "pkg"
+    for name, other in [("one", "two"), ("two", "one")]:
+        (package / name).mkdir(parents=True)
+        (package / name / "__init__.py").write_text(f"from ..{other} import *\nvalue_{name} = 1\n")
+    (package / "__init__.py").write_text("from .one import *\n")
+    main_file = tmp_path / "main.py"
+    main_file.write_text("from pkg import value_one, value_two, missing\n")
+
+    imports = ImportResolver(tmp_path).get_imports(main_file)
+
+    assert imports["value_one"] == (package / "one" / "__init__.py", "value_one")
+    assert imports["value_two"] == (package / "two" / "__init__.py", "value_two")
+    assert imports["missing"] == (package / "__init__.py", "missing")
@@ -0,0 +1,154 @@
+"""Unit tests for flowslice.core.incremental."""
+
+import ast
+import os
+from pathlib import Path
+
+from flowslice.core.defuse import DefUseIndex
+from flowslice.core.incremental import BlockTable
+from flowslice.core.models import SliceDirection
+from flowslice.core.slicer import Slicer
+from flowslice.formatters.tree import TreeFormatter
+
+SOURCE = '''\
+import os
+
+LIMIT = 10
+
+
+def scale(value):
+    factor = 2
+    return value * factor
+
+
+@staticmethod
+def clamp(value):
+    low = 0
+    high = LIMIT
+    return max(low, min(value, high))
+
+
+def main():
+    x = 5
+    y = scale(x)
+    z = y + 1
+    return z
+'''
+
+
+def _rewrite(path: Path, source: str) -> None:
+    """Rewrite a file and move its mtime forward so caches see the change."""
+    path.write_text(source)
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+class TestBlockTable:
+    """Test splitting modules into blocks."""
+
+    def test_merged_index_matches_full_index(self):
+        """Test the index assembled from blocks equals one built for the whole module."""
+        tree = ast.parse(SOURCE)
+        table = BlockTable.build(tree, SOURCE.split("\n"))
+
+        assert table.merged_index().to_facts() == DefUseIndex.build(tree).to_facts()
+
+    def test_decorators_belong_to_their_block(self):
+        """Test a block starts at the first decorator line."""
+        table = BlockTable.build(ast.parse(SOURCE), SOURCE.split("\n"))
+        position = table.block_at(11)
+
+        assert position is not None
+        assert table.blocks[position].start == 11
+        assert table.block_at(12) == position
+        assert table.block_at(10) is None
+
+    def test_unchanged_blocks_are_reused(self):
+        """Test only edited blocks are indexed again, including moved ones."""
+        old = BlockTable.build(ast.parse(SOURCE), SOURCE.split("\n"))
+        edited = "# header\n\n" + SOURCE.replace("factor = 2", "factor = 3")
+        tree = ast.parse(edited)
+        new = BlockTable.build(tree, edited.split("\n"), old)
+
+        reused = {id(block.defuse) for block in old.blocks}
+        changed = [block for block in new.blocks if id(block.defuse) not in reused]
+        assert [block.start for block in changed] == [8]
+        assert new.merged_index().to_facts() == DefUseIndex.build(tree).to_facts()
+
+
+class TestIncrementalSlicing:
+    """Test cached slices are reused or invalidated after edits."""
+
+    def test_unchanged_slice_is_reused_and_moved(self, tmp_path):
+        """Test a slice of an untouched function survives lines inserted above it."""
+        path = tmp_path / "mod.py"
+        path.write_text(SOURCE)
+        slicer = Slicer(str(tmp_path), enable_cross_file=False)
+        before = slicer.slice("mod.py", 14, "high", SliceDirection.BACKWARD)
+
+        _rewrite(path, "# header\n\n" + SOURCE.replace("factor = 2", "factor = 3"))
+        entry = slicer.parse_cache.get_entry(path)
+        slicer._prepare_file("mod.py")
+        cached = entry.derived[slicer._slices_key]
+
+        assert (16, "high", SliceDirection.BACKWARD) in cached
+        assert before.backward_slice
+        after = slicer.slice("mod.py", 16, "high", SliceDirection.BACKWARD)
+        assert [node.line for node in after.backward_slice] == [
+            node.line + 2 for node in before.backward_slice
+        ]
+        assert entry.previous is None
+
+    def test_slice_touching_changed_block_is_invalidated(self, tmp_path):
+        """Test a slice is recomputed when a block it depends on changes."""
+        path = tmp_path / "mod.py"
+        path.write_text(SOURCE)
+        slicer = Slicer(str(tmp_path), enable_cross_file=False)
+        slicer.slice("mod.py", 14, "high", SliceDirection.BACKWARD)
+
+        _rewrite(path, SOURCE.replace("LIMIT = 10", "LIMIT = 10 * 2"))
+        entry = slicer.parse_cache.get_entry(path)
+        slicer._prepare_file("mod.py")
+
+        assert entry.derived[slicer._slices_key] == {}
+
+    def test_results_after_edits_match_fresh_slicer(self, tmp_path):
+        """Test incremental results equal those of a slicer without history."""
+        path = tmp_path / "mod.py"
+        path.write_text(SOURCE)
+        slicer = Slicer(str(tmp_path), enable_cross_file=False)
+        criteria = [(21, "z"), (14, "high"), (7, "factor"), (19, "x")]
+        for line, variable in criteria:
+            slicer.slice("mod.py", line, variable)
+
+        edited = SOURCE.replace("    z = y + 1\n", "    w = 0\n    z = y + x\n")
+        _rewrite(path, edited)
+        for line, variable in [(22, "z"), (14, "high"), (7, "factor"), (19, "x")]:
+            incremental = slicer.slice("mod.py", line, variable)
+            fresh = Slicer(str(tmp_path), enable_cross_file=False).slice("mod.py", line, variable)
+            assert incremental == fresh
+
+    def test_cached_result_is_a_copy(self, tmp_path):
+        """Test modifying a returned result does not affect later results."""
+        (tmp_path / "mod.py").write_text(SOURCE)
+        slicer = Slicer(str(tmp_path), enable_cross_file=False)
+
+        first = slicer.slice("mod.py", 21, "z", SliceDirection.BACKWARD)
+        expected = list(first.backward_slice)
+        first.backward_slice.clear()
+
+        again = slicer.slice("mod.py", 21, "z", SliceDirection.BACKWARD)
+        assert again.backward_slice == expected
+
+    def test_formatting_does_not_change_cached_nodes(self, tmp_path):
+        """Test tree formatting between two slices leaves the cached nodes alone."""
+        (tmp_path / "mod.py").write_text(SOURCE)
+        slicer = Slicer(str(tmp_path), enable_cross_file=False)
+
+        first = slicer.slice("mod.py", 21, "z")
+        output = TreeFormatter.format(first)
+        first.backward_slice[0].dependencies.append("changed")
+        again = slicer.slice("mod.py", 21, "z")
+
+        assert again == Slicer(str(tmp_path), enable_cross_file=False).slice("mod.py", 21, "z")
+        assert TreeFormatter.format(again) == output
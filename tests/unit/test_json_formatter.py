@@ -1,5 +1,6 @@
 """Unit tests for flowslice.formatters.json."""
 
+import io
 import json
 
 from flowslice.core.models import SliceDirection, SliceNode, SliceResult
@@ -257,3 +258,52 @@ class TestJSONFormatter:
         assert len(data["statistics"]["functions_involved"]) == 2
         assert "helper" in data["statistics"]["functions_involved"]
         assert "main" in data["statistics"]["functions_involved"]
+
+    def test_write_matches_json_dumps_layout(self):
+        """Test the streaming writer lays out the document like json.dumps()."""
+        result = SliceResult(
+            target_file="test.py",
+            target_line=42,
+            target_variable="x",
+            backward_slice=[
+                SliceNode("test.py", 40, "main", "x = y", "x", "assignment", ["y"], "ctx")
+            ],
+            forward_slice=[SliceNode("other.py", 3, "f", "g(x)", "x", "passed to g()")],
+        )
+
+        for indent in (None, 2, 4):
+            for direction in SliceDirection:
+                output = io.StringIO()
+                JSONFormatter.write(result, output, direction, indent)
+                data = json.loads(output.getvalue())
+                assert output.getvalue() == json.dumps(data, indent=indent)
+                assert data["statistics"]["total_lines"] == 2
+
+    def test_write_ndjson(self):
+        """Test NDJSON output has a target, node and statistics record per result."""
+        results = [
+            SliceResult(
+                target_file="test.py",
+                target_line=2,
+                target_variable=variable,
+                backward_slice=[SliceNode("test.py", 1, "main", "x = 1", "x", "assignment")],
+                forward_slice=[SliceNode("test.py", 3, "main", "y = x", "y", "assignment")],
+            )
+            for variable in ("x", "y")
+        ]
+        output = io.StringIO()
+
+        JSONFormatter.write_ndjson(results, output, SliceDirection.FORWARD)
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert [(r["type"], r["slice"]) for r in records] == [
+            ("target", 0),
+            ("node", 0),
+            ("statistics", 0),
+            ("target", 1),
+            ("node", 1),
+            ("statistics", 1),
+        ]
+        assert records[1]["direction"] == "forward"
+        assert records[1]["line"] == 3
+        assert records[2]["total_lines"] == 2
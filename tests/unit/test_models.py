@@ -1,7 +1,10 @@
 """Unit tests for flowslice.core.models."""
 
+import pickle
 
-from flowslice.core.models import SliceDirection, SliceNode, SliceResult
+import pytest
+
+from flowslice.core.models import SliceCriterion, SliceDirection, SliceNode, SliceResult
 
 
 class TestSliceDirection:
@@ -74,6 +77,38 @@ class TestSliceNode:
         )
         assert node.context == "iterates over items"
 
+    def test_code_is_read_from_shared_lines(self):
+        """Test a node without code reads it from the line table it was given."""
+        lines = ["x = 10\n", "y = x + 1\n"]
+        node = SliceNode("test.py", 2, "main", None, "y", "assignment", lines=lines)
+        assert node.code == "y = x + 1\n"
+        assert not hasattr(node, "__dict__")
+        assert SliceNode("test.py", 5, "main", None, "y", "assignment", lines=lines).code == ""
+
+    def test_names_are_interned(self):
+        """Test file, function and variable names are shared between nodes."""
+        first = SliceNode("".join(["te", "st.py"]), 1, "main", "x = 1", "x", "assignment")
+        second = SliceNode("".join(["tes", "t.py"]), 2, "main", "x = 2", "x", "assignment")
+        assert first.file is second.file
+
+    def test_replace_keeps_code_of_original_line(self):
+        """Test moving a node keeps the code it was created with."""
+        lines = ["x = 10\n", "y = x + 1\n"]
+        node = SliceNode("test.py", 2, "main", None, "y", "assignment", ["x"], lines=lines)
+        moved = node.replace(line=7)
+        assert (moved.line, moved.code, moved.dependencies) == (7, "y = x + 1\n", ["x"])
+        assert node.line == 2
+        with pytest.raises(TypeError):
+            node.replace(lines=[])
+
+    def test_pickle_stores_code_not_line_table(self):
+        """Test pickled nodes compare equal and no longer reference the line table."""
+        lines = ["x = 10\n"] * 1000
+        node = SliceNode("test.py", 1, "main", None, "x", "assignment", lines=lines)
+        data = pickle.dumps(node)
+        assert pickle.loads(data) == node
+        assert len(data) < 200
+
 
 class TestSliceResult:
     """Test SliceResult dataclass."""
@@ -121,3 +156,22 @@ class TestSliceResult:
         assert len(result.forward_slice) == 1
         assert result.backward_slice[0] == backward_node
         assert result.forward_slice[0] == forward_node
+
+
+class TestSliceCriterion:
+    """Test SliceCriterion parsing."""
+
+    def test_parse(self):
+        """Test a <file>:<line>:<variable> criterion is parsed."""
+        criterion = SliceCriterion.parse("src/main.py:42:result\n", SliceDirection.FORWARD)
+        assert criterion == SliceCriterion("src/main.py", 42, "result", SliceDirection.FORWARD)
+
+    def test_parse_defaults_to_both(self):
+        """Test the direction defaults to BOTH."""
+        assert SliceCriterion.parse("a.py:1:x").direction == SliceDirection.BOTH
+
+    @pytest.mark.parametrize("text", ["main.py", "main.py:x:result", "main.py:42:", ":1:x"])
+    def test_parse_invalid(self, text):
+        """Test malformed criteria raise ValueError."""
+        with pytest.raises(ValueError):
+            SliceCriterion.parse(text)
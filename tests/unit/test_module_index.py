@@ -0,0 +1,186 @@
+"""Tests for the module index used by import resolution."""
+
+import os
+from pathlib import Path
+
+from flowslice.core.cache import ParseCache
+from flowslice.core.disk_cache import DiskCache
+from flowslice.core.import_resolver import ImportResolver
+from flowslice.core.module_index import ModuleIndex
+
+
+def _touch_dir(directory: Path) -> None:
+    """Move a directory's mtime forward so a change is noticed."""
+    stat = directory.stat()
+    os.utime(directory, (stat.st_atime, stat.st_mtime + 10))
+
+
+def test_directories_are_listed_when_looked_up(tmp_path):
+    """Test only the directories a lookup needs are listed, not the whole root."""
+    (tmp_path / "pkg" / "sub").mkdir(parents=True)
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "sub" / "mod.py").write_text("")
+    (tmp_path / "big" / "deep").mkdir(parents=True)
+    (tmp_path / "big" / "deep" / "other.py").write_text("")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "skipped.py").write_text("")
+    (tmp_path / "notes.txt").write_text("")
+
+    index = ModuleIndex([tmp_path], ParseCache())
+
+    assert index.listing(str(tmp_path / "pkg")).names == {"__init__.py"}
+    assert index.listing(str(tmp_path / "pkg" / "sub")).names == {"mod.py"}
+    assert len(index) == 2
+    assert str(tmp_path / "big" / "deep") not in index._listings
+    assert index.listing(str(tmp_path)).names == frozenset()
+    assert index.exists(tmp_path / ".venv" / "skipped.py")
+    assert index.refreshes == 0
+
+
+def test_resolving_an_import_does_not_walk_the_root(tmp_path, monkeypatch):
+    """Test resolving an import lists a few directories, however large the root."""
+    for number in range(20):
+        (tmp_path / f"dir{number}" / "nested").mkdir(parents=True)
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "tools.py").write_text("")
+    main_file = tmp_path / "main.py"
+    main_file.write_text("from pkg.tools import helper\n")
+
+    listed = []
+    real_listdir, real_scandir = os.listdir, os.scandir
+    monkeypatch.setattr(os, "listdir", lambda path: listed.append(path) or real_listdir(path))
+    monkeypatch.setattr(os, "scandir", lambda path: listed.append(path) or real_scandir(path))
+    resolver = ImportResolver(tmp_path)
+
+    assert resolver.resolve_import("pkg.tools", main_file) == tmp_path / "pkg" / "tools.py"
+    assert len(listed) <= 3
+    assert not [path for path in listed if "dir" in Path(path).name]
+
+
+def test_root_listings_are_stored(tmp_path, monkeypatch):
+    """Test a new process reuses the listings of directories under the roots."""
+    project = tmp_path / "project"
+    (project / "pkg").mkdir(parents=True)
+    (project / "pkg" / "tools.py").write_text("def helper(x):\n    return x\n")
+    main_file = project / "main.py"
+    main_file.write_text("from pkg.tools import helper\n")
+    disk_cache = DiskCache(tmp_path / "cache")
+    ImportResolver(project, ParseCache(disk_cache=disk_cache)).get_imports(main_file)
+
+    listed = []
+    real_listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: listed.append(path) or real_listdir(path))
+    resolver = ImportResolver(project, ParseCache(disk_cache=disk_cache))
+    assert resolver.resolve_import("pkg.tools", main_file) == project / "pkg" / "tools.py"
+    assert listed == []
+
+    (project / "pkg" / "extra.py").write_text("")
+    _touch_dir(project / "pkg")
+    resolver = ImportResolver(project, ParseCache(disk_cache=disk_cache))
+    assert resolver.resolve_import("pkg.extra", main_file) == project / "pkg" / "extra.py"
+    assert [str(path) for path in listed] == [str(project / "pkg")]
+
+
+def test_only_changed_directories_are_listed_again(tmp_path):
+    """Test a listing is reused until its directory changes."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    index = ModuleIndex([tmp_path], ParseCache())
+    listing_a = index.listing(str(tmp_path / "a"))
+    listing_b = index.listing(str(tmp_path / "b"))
+
+    (tmp_path / "a" / "new.py").write_text("")
+    _touch_dir(tmp_path / "a")
+
+    assert index.listing(str(tmp_path / "b")) is listing_b
+    assert index.listing(str(tmp_path / "a")) is not listing_a
+    assert index.exists(tmp_path / "a" / "new.py")
+    assert index.refreshes == 1
+
+
+def test_missing_directory_has_empty_listing(tmp_path):
+    """Test looking up a missing directory does not fail."""
+    index = ModuleIndex([tmp_path], ParseCache())
+
+    listing = index.listing(str(tmp_path / "missing"))
+    assert listing.mtime is None
+    assert not listing.names
+
+
+def test_resolver_uses_extra_roots(tmp_path):
+    """Test absolute imports fall back to extra roots, in order."""
+    project, vendor = tmp_path / "project", tmp_path / "vendor"
+    (vendor / "lib").mkdir(parents=True)
+    project.mkdir()
+    (vendor / "lib" / "tools.py").write_text("def helper(x):\n    return x\n")
+    main_file = project / "main.py"
+    main_file.write_text("from lib.tools import helper\n")
+
+    resolver = ImportResolver(project, extra_roots=[vendor])
+    assert resolver.resolve_import("lib.tools", main_file) == vendor / "lib" / "tools.py"
+
+    (project / "lib").mkdir()
+    (project / "lib" / "tools.py").write_text("def helper(x):\n    return x\n")
+    _touch_dir(project / "lib")
+    _touch_dir(project)
+    assert resolver.resolve_import("lib.tools", main_file) == project / "lib" / "tools.py"
+
+
+def test_resolution_is_memoized_until_a_directory_changes(tmp_path):
+    """Test a repeated resolution reuses the memo, and a removed module is noticed."""
+    main_file = tmp_path / "main.py"
+    main_file.write_text("import utils\n")
+    (tmp_path / "utils.py").write_text("")
+    resolver = ImportResolver(tmp_path)
+
+    assert resolver.resolve_import("utils", main_file) == tmp_path / "utils.py"
+    assert resolver.resolve_import("utils", main_file) == tmp_path / "utils.py"
+    assert len(resolver._resolutions) == 1
+
+    (tmp_path / "utils.py").unlink()
+    _touch_dir(tmp_path)
+    assert resolver.resolve_import("utils", main_file) is None
+
+
+def _make_site_packages(site: Path) -> None:
+    (site / "mylib").mkdir(parents=True)
+    (site / "mylib" / "__init__.py").write_text("from .core import transform\n")
+    (site / "mylib" / "core.py").write_text("def transform(data):\n    return data\n")
+    (site / "other").mkdir()
+    (site / "other" / "__init__.py").write_text("value = 1\n")
+
+
+def test_search_paths_are_indexed_lazily(tmp_path):
+    """Test only the installed modules an import enters are listed and parsed."""
+    site, project = tmp_path / "site", tmp_path / "project"
+    _make_site_packages(site)
+    project.mkdir()
+    main_file = project / "main.py"
+    main_file.write_text("from mylib import transform\n")
+
+    resolver = ImportResolver(project, search_paths=[site])
+    imports = resolver.get_imports(main_file)
+
+    assert imports["transform"] == (site / "mylib" / "core.py", "transform")
+    assert site / "other" / "__init__.py" not in resolver.parse_cache
+    assert str(site / "other") not in resolver.module_index._listings
+
+
+def test_search_path_listings_are_stored_per_environment(tmp_path, monkeypatch):
+    """Test a new process reuses the listings of search path directories."""
+    site, project = tmp_path / "site", tmp_path / "project"
+    _make_site_packages(site)
+    project.mkdir()
+    main_file = project / "main.py"
+    main_file.write_text("from mylib import transform\n")
+    disk_cache = DiskCache(tmp_path / "cache")
+
+    first = ImportResolver(project, ParseCache(disk_cache=disk_cache), search_paths=[site])
+    first.get_imports(main_file)
+
+    listed = []
+    real_listdir = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: listed.append(path) or real_listdir(path))
+    resolver = ImportResolver(project, ParseCache(disk_cache=disk_cache), search_paths=[site])
+    assert resolver.resolve_import("mylib", main_file) == site / "mylib" / "__init__.py"
+    assert not [path for path in listed if str(path).startswith(str(site))]
@@ -0,0 +1,82 @@
+"""Unit tests for flowslice.core.parallel."""
+
+from flowslice.core.models import SliceCriterion, SliceDirection
+from flowslice.core.parallel import chunk_criteria, slice_parallel
+from flowslice.core.slicer import Slicer
+
+
+def _write_files(tmpdir, count):
+    criteria = []
+    for i in range(count):
+        path = tmpdir / f"mod{i}.py"
+        path.write_text("a = 1\nb = a + 1\nfor c in [a, b]:\n    d = c * 2\n")
+        criteria.append(SliceCriterion(str(path), 4, "d", SliceDirection.BACKWARD))
+        criteria.append(SliceCriterion(str(path), 1, "a", SliceDirection.FORWARD))
+    return criteria
+
+
+class TestChunkCriteria:
+    """Test how criteria are split into work items."""
+
+    def test_chunks_hold_one_file(self):
+        """Test chunks never mix files and keep the grouped order."""
+        groups = [
+            [SliceCriterion("a.py", line, "x") for line in range(1, 9)],
+            [SliceCriterion("b.py", 1, "y")],
+        ]
+        chunks = chunk_criteria(groups, jobs=2)
+
+        assert [c for chunk in chunks for c in chunk] == groups[0] + groups[1]
+        assert all(len({c.file_path for c in chunk}) == 1 for chunk in chunks)
+        assert [len(chunk) for chunk in chunks] == [2, 2, 2, 2, 1]
+
+
+class TestSliceParallel:
+    """Test slicing in a process pool."""
+
+    def test_matches_sequential_order(self, tmp_path):
+        """Test parallel results equal slice_many results, in the same order."""
+        criteria = _write_files(tmp_path, 4)
+
+        expected = list(Slicer().slice_many(criteria))
+        results = list(slice_parallel(Slicer(), criteria, jobs=2))
+
+        assert results == expected
+        assert results[0].backward_slice[0].context is None
+
+    def test_workers_share_disk_cache(self, tmp_path):
+        """Test workers read and write the parent's on-disk cache."""
+        criteria = _write_files(tmp_path, 2)
+        cache_dir = tmp_path / "cache"
+
+        list(slice_parallel(Slicer(cache_dir=str(cache_dir)), criteria, jobs=2))
+        assert len(list(cache_dir.glob("*/*/*"))) == 2
+
+    def test_single_job_runs_in_process(self, tmp_path):
+        """Test one job slices in this process, using the slicer's cache."""
+        criteria = _write_files(tmp_path, 1)
+        slicer = Slicer()
+
+        assert len(list(slice_parallel(slicer, criteria, jobs=1))) == 2
+        assert slicer.parse_cache.cache_info().parses == 1
+
+    def test_hooks_run_only_in_process(self, tmp_path):
+        """Test hooks are not called for criteria sliced by worker processes."""
+        criteria = _write_files(tmp_path, 2)
+        slicer = Slicer()
+        events = []
+        log = tmp_path / "events.log"
+
+        def hook(event, arg):
+            events.append(event)
+            with open(log, "a") as f:  # Also seen if a worker called it
+                f.write(f"{event}\n")
+
+        slicer.hooks.add(hook)
+        list(slice_parallel(slicer, criteria, jobs=2))
+        assert events == [] and not log.exists()
+        assert slicer.hooks.active
+
+        list(slice_parallel(slicer, criteria, jobs=1))
+        assert "pass_finished" in events
+
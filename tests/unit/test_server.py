@@ -0,0 +1,196 @@
+"""Unit tests for flowslice.cli.server."""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from flowslice.cli.main import main
+from flowslice.cli.server import SliceServer, default_socket_path, send_request
+from flowslice.core.slicer import Slicer
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+CODE = "x = 10\ny = x + 5\nz = y * 2\n"
+
+
+@pytest.fixture
+def server():
+    """Run a server in a background thread on a short socket path."""
+    with tempfile.TemporaryDirectory() as socket_dir:
+        socket_path = os.path.join(socket_dir, "flowslice.sock")
+        server = SliceServer(socket_path)
+        thread = threading.Thread(target=server.serve_until_shutdown)
+        thread.start()
+        try:
+            yield server, socket_path
+        finally:
+            send_request(socket_path, {"command": "shutdown"})
+            thread.join()
+            server.server_close()
+
+
+def _slice_request(path: Path, line: int, variable: str) -> dict:
+    return {
+        "root": str(path.parent),
+        "direction": "backward",
+        "format": "json",
+        "batch": True,
+        "criteria": [{"file": path.name, "line": line, "variable": variable}],
+    }
+
+
+class TestSliceServer:
+    """Test requests answered by a running server."""
+
+    def test_cache_stays_warm(self, server, tmp_path):
+        """Test repeated requests are answered from the warm cache."""
+        slice_server, socket_path = server
+        path = tmp_path / "mod.py"
+        path.write_text(CODE)
+
+        first = send_request(socket_path, _slice_request(path, 3, "z"))
+        second = send_request(socket_path, _slice_request(path, 3, "z"))
+
+        assert first["ok"] and first == second
+        lines = {n["line"] for n in json.loads(first["output"])["backward_slice"]}
+        assert lines == {1, 2, 3}
+        info = send_request(socket_path, {"command": "stats"})["cache"]
+        assert info["parses"] == 1
+        assert info["hits"] >= 1
+
+    def test_modified_file_invalidated(self, server, tmp_path):
+        """Test a changed file is re-read on the next request."""
+        _, socket_path = server
+        path = tmp_path / "mod.py"
+        path.write_text(CODE)
+        send_request(socket_path, _slice_request(path, 3, "z"))
+
+        path.write_text("w = 1\nz = w\n")
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+        response = send_request(socket_path, _slice_request(path, 2, "z"))
+        lines = {n["line"] for n in json.loads(response["output"])["backward_slice"]}
+        assert lines == {1, 2}
+
+    def test_errors_are_reported(self, server, tmp_path):
+        """Test bad requests and missing files get an error response."""
+        _, socket_path = server
+
+        assert not send_request(socket_path, {"command": "unknown"})["ok"]
+        assert "Invalid request" in send_request(socket_path, {"command": "slice"})["error"]
+        missing = send_request(socket_path, _slice_request(tmp_path / "missing.py", 1, "x"))
+        assert not missing["ok"]
+
+    def test_unexpected_errors_are_reported(self, server, tmp_path, monkeypatch):
+        """Test an exception the slicer did not expect is answered, not a dropped connection."""
+        slice_server, socket_path = server
+        path = tmp_path / "mod.py"
+        path.write_text(CODE)
+
+        def fail(self, *args, **kwargs):
+            raise RecursionError("maximum recursion depth exceeded")
+
+        monkeypatch.setattr(Slicer, "slice_many", fail)
+        response = send_request(socket_path, _slice_request(path, 3, "z"))
+
+        assert not response["ok"]
+        assert "RecursionError: maximum recursion depth exceeded" in response["error"]
+        assert slice_server.running
+
+    def test_stats_requested(self, server, tmp_path):
+        """Test stats are returned only for the requests that ask for them."""
+        slice_server, socket_path = server
+        path = tmp_path / "mod.py"
+        path.write_text(CODE)
+
+        response = send_request(socket_path, {**_slice_request(path, 3, "z"), "stats": True})
+        assert "Stats for mod.py:3:z" in response["stats"]
+        assert "stats" not in send_request(socket_path, _slice_request(path, 3, "z"))
+        assert not any(slicer.collect_stats for slicer in slice_server.slicers.values())
+
+    def test_socket_is_private(self, server):
+        """Test only the user can connect to the socket."""
+        _, socket_path = server
+        assert os.stat(socket_path).st_mode & 0o777 == 0o600
+
+    def test_default_socket_path(self, tmp_path, monkeypatch):
+        """Test the socket defaults to the user's runtime directory."""
+        monkeypatch.delenv("FLOWSLICE_SOCKET", raising=False)
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        assert default_socket_path() == str(tmp_path / "flowslice.sock")
+
+        monkeypatch.delenv("XDG_RUNTIME_DIR")
+        assert default_socket_path() == os.path.join(
+            tempfile.gettempdir(), f"flowslice-{os.getuid()}.sock"
+        )
+        monkeypatch.setenv("FLOWSLICE_SOCKET", str(tmp_path / "other.sock"))
+        assert default_socket_path() == str(tmp_path / "other.sock")
+
+
+class TestClient:
+    """Test the CLI's --connect client mode."""
+
+    def test_connect_matches_local_output(self, server, tmp_path, capsys, monkeypatch):
+        """Test output forwarded from the server equals local output."""
+        _, socket_path = server
+        (tmp_path / "mod.py").write_text(CODE)
+        monkeypatch.chdir(tmp_path)
+
+        with patch.object(sys, "argv", ["flowslice", "mod.py:3:z", "backward"]):
+            main()
+        local = capsys.readouterr().out
+        argv = ["flowslice", "--connect", "--socket", socket_path, "mod.py:3:z", "backward"]
+        with patch.object(sys, "argv", argv):
+            main()
+
+        assert capsys.readouterr().out == local
+
+    def test_connect_falls_back_to_local(self, tmp_path, capsys, monkeypatch):
+        """Test the client slices locally when no server is running."""
+        (tmp_path / "mod.py").write_text(CODE)
+        monkeypatch.chdir(tmp_path)
+
+        argv = ["flowslice", "--connect", "--socket", str(tmp_path / "none.sock"), "mod.py:3:z"]
+        with patch.object(sys, "argv", argv):
+            main()
+
+        captured = capsys.readouterr()
+        assert "BACKWARD SLICE" in captured.out
+        assert "No flowslice server" in captured.err
+
+    def test_server_failure_is_reported(self, tmp_path, capsys, monkeypatch):
+        """Test a server dropping the connection is an error, not a local fallback."""
+        (tmp_path / "mod.py").write_text(CODE)
+        monkeypatch.chdir(tmp_path)
+        socket_path = str(tmp_path / "broken.sock")
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(socket_path)
+        listener.listen(1)
+
+        def drop_connection():
+            connection, _ = listener.accept()
+            connection.close()
+
+        thread = threading.Thread(target=drop_connection)
+        thread.start()
+        argv = ["flowslice", "--connect", "--socket", socket_path, "mod.py:3:z"]
+        try:
+            with patch.object(sys, "argv", argv), pytest.raises(SystemExit) as exc_info:
+                main()
+        finally:
+            thread.join()
+            listener.close()
+
+        captured = capsys.readouterr()
+        assert exc_info.value.code == 1
+        assert "server at" in captured.out and "failed" in captured.out
+        assert "BACKWARD SLICE" not in captured.out
+        assert "No flowslice server" not in captured.err
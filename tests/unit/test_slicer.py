@@ -5,7 +5,7 @@ from pathlib import Path
 
 import pytest
 
-from flowslice.core.models import SliceDirection
+from flowslice.core.models import SliceCriterion, SliceDirection
 from flowslice.core.slicer import Slicer
 
 
@@ -138,3 +138,151 @@ x = calculate(5, 10)
             assert result.target_file == Path(temp_path).name
         finally:
             Path(temp_path).unlink()
+
+    def test_backward_long_dependency_chain(self):
+        """Test backward slicing follows chains longer than any fixed pass limit."""
+        # v29 depends on v28 ... v0; each link needs its own discovery step
+        code = "v0 = 1\n" + "".join(f"v{i} = v{i - 1}\n" for i in range(1, 30))
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+            f.write(code)
+            f.flush()
+            temp_path = f.name
+
+        try:
+            slicer = Slicer()
+            result = slicer.slice(temp_path, 30, "v29", SliceDirection.BACKWARD)
+
+            backward_lines = {node.line for node in result.backward_slice}
+            assert backward_lines == set(range(1, 31))
+            # One iteration per variable in the chain
+            assert result.iterations == 30
+        finally:
+            Path(temp_path).unlink()
+
+    def test_backward_worklist_skips_later_definitions(self):
+        """Test the worklist ignores definitions after the target line."""
+        code = """
+a = 1
+b = a
+c = b
+a = 5
+"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+            f.write(code)
+            f.flush()
+            temp_path = f.name
+
+        try:
+            slicer = Slicer()
+            result = slicer.slice(temp_path, 4, "c", SliceDirection.BACKWARD)
+
+            backward_lines = [node.line for node in result.backward_slice]
+            assert backward_lines == [2, 3, 4]
+        finally:
+            Path(temp_path).unlink()
+
+
+class TestSliceMany:
+    """Test batch slicing with Slicer.slice_many."""
+
+    def test_matches_single_slices(self, tmp_path):
+        """Test batch results equal one-at-a-time results, grouped by file."""
+        first = tmp_path / "first.py"
+        first.write_text("a = 1\nb = a + 1\nc = b * 2\n")
+        second = tmp_path / "second.py"
+        second.write_text("x = 1\ny = x\n")
+        criteria = [
+            SliceCriterion(str(first), 3, "c", SliceDirection.BACKWARD),
+            SliceCriterion(str(second), 2, "y"),
+            SliceCriterion(str(first), 1, "a", SliceDirection.FORWARD),
+        ]
+
+        results = list(Slicer().slice_many(criteria))
+
+        expected = [
+            Slicer().slice(c.file_path, c.line, c.variable, c.direction)
+            for c in (criteria[0], criteria[2], criteria[1])
+        ]
+        assert results == expected
+        assert [r.target_file for r in results] == ["first.py", "first.py", "second.py"]
+
+    def test_file_prepared_once(self, tmp_path):
+        """Test criteria of one file share a single cache lookup."""
+        path = tmp_path / "mod.py"
+        path.write_text("".join(f"v{i} = {i}\n" for i in range(20)))
+        criteria = [SliceCriterion(str(path), i + 1, f"v{i}") for i in range(20)]
+
+        slicer = Slicer()
+        assert len(list(slicer.slice_many(criteria))) == 20
+
+        info = slicer.parse_cache.cache_info()
+        assert (info.misses, info.parses) == (1, 1)
+        assert info.hits <= 1
+
+    def test_is_lazy(self, tmp_path):
+        """Test results are yielded as they are computed."""
+        path = tmp_path / "mod.py"
+        path.write_text("x = 1\n")
+        results = Slicer().slice_many([SliceCriterion(str(path), 1, "x")])
+        assert next(results).target_variable == "x"
+
+
+class TestSliceStats:
+    """Test the timings and counters collected with collect_stats."""
+
+    def test_not_collected_by_default(self, tmp_path):
+        """Test results carry no stats unless asked for."""
+        path = tmp_path / "mod.py"
+        path.write_text("a = 1\nb = a + 1\n")
+        assert Slicer().slice(str(path), 2, "b").stats is None
+
+    def test_phases_and_counters(self, tmp_path):
+        """Test a slice records its phases, the work done and the nodes emitted."""
+        (tmp_path / "helper.py").write_text("def double(v):\n    w = v * 2\n    return w\n")
+        path = tmp_path / "main.py"
+        path.write_text("from helper import double\n\na = 1\nb = double(a)\nc = b + 1\n")
+
+        slicer = Slicer(str(tmp_path), collect_stats=True)
+        result = slicer.slice(str(path), 5, "c")
+
+        stats = result.stats
+        assert stats is not None
+        assert {"prepare.parse", "prepare.imports", "prepare.index"} <= stats.timings.keys()
+        assert {"backward", "forward", "cross_file", "total"} <= stats.timings.keys()
+        assert stats.timings["total"] >= stats.timings["backward"]
+        counters = stats.counters
+        assert counters["nodes_emitted"] == len(result.backward_slice) + len(
+            result.forward_slice
+        )
+        assert counters["iterations"] == result.iterations
+        assert counters["calls_followed"] >= 1
+        assert counters["files_entered"] == 1
+        assert counters["parses"] == 2
+        assert counters["slice_cache_hits"] == 0
+
+    def test_slice_cache_hit(self, tmp_path):
+        """Test a repeated slice reports the cache hit and no parsing."""
+        path = tmp_path / "mod.py"
+        path.write_text("a = 1\nb = a + 1\n")
+        slicer = Slicer(collect_stats=True)
+        first = slicer.slice(str(path), 2, "b")
+        second = slicer.slice(str(path), 2, "b")
+
+        assert second == first
+        assert second.stats is not first.stats
+        assert second.stats.counters["slice_cache_hits"] == 1
+        assert second.stats.counters["parses"] == 0
+        assert "backward" not in second.stats.timings
+
+    def test_slice_many_prepares_once(self, tmp_path):
+        """Test only the first slice of a file is charged with preparing it."""
+        path = tmp_path / "mod.py"
+        path.write_text("a = 1\nb = a + 1\nc = b\n")
+        criteria = [SliceCriterion(str(path), 2, "b"), SliceCriterion(str(path), 3, "c")]
+
+        first, second = Slicer(collect_stats=True).slice_many(criteria)
+
+        assert "prepare.parse" in first.stats.timings
+        assert "prepare.parse" not in second.stats.timings
+        assert first.stats.counters["parses"] == 1
+        assert second.stats.counters["parses"] == 0
@@ -0,0 +1,97 @@
+"""Unit tests for flowslice.core.summaries."""
+
+import ast
+import gc
+
+from flowslice.core.models import SliceDirection
+from flowslice.core.slicer import Slicer
+from flowslice.core.summaries import SummaryCache, summarize
+from flowslice.formatters.tree import TreeFormatter
+
+SOURCE = """\
+def normalize(value, scale):
+    shifted = value - 1
+    log(shifted)
+    return shifted * 2
+
+
+def main(a, b):
+    x = normalize(a, b)
+    y = normalize(x, b)
+    z = normalize(y, b)
+    return z
+"""
+
+
+class TestSummarize:
+    """Test building function summaries."""
+
+    def test_returns_and_calls(self):
+        """Test a summary records flows to return values and calls."""
+        func_def = ast.parse(SOURCE).body[0]
+
+        summary = summarize(func_def, [], {"value", "shifted"})
+        assert summary.returns
+        assert summary.calls == ("log",)
+
+        summary = summarize(func_def, [], {"scale"})
+        assert not summary.returns
+        assert summary.calls == ()
+
+
+class TestSummaryCache:
+    """Test memoization of function summaries."""
+
+    def test_summary_is_computed_once_per_parameter_set(self, tmp_path):
+        """Test every call site after the first reuses the summary."""
+        (tmp_path / "mod.py").write_text(SOURCE)
+        slicer = Slicer(str(tmp_path), enable_cross_file=False)
+
+        slicer.slice("mod.py", 10, "z", SliceDirection.BACKWARD)
+
+        assert slicer.summaries.misses == 1
+        assert slicer.summaries.hits >= 2
+        assert len(slicer.summaries) == 1
+
+    def test_results_match_unmemoized_slicing(self, tmp_path):
+        """Test applying summaries gives the same slices as re-walking callees."""
+        (tmp_path / "mod.py").write_text(SOURCE)
+        memoized = Slicer(str(tmp_path), enable_cross_file=False)
+        plain = Slicer(str(tmp_path), enable_cross_file=False)
+        plain.summaries = None
+
+        for line, variable in [(10, "z"), (11, "z"), (8, "a")]:
+            expected = plain.slice("mod.py", line, variable)
+            assert memoized.slice("mod.py", line, variable) == expected
+
+    def test_results_do_not_share_summary_nodes(self, tmp_path):
+        """Test changing the nodes of a result leaves the summaries it applied alone."""
+        (tmp_path / "mod.py").write_text(SOURCE)
+        memoized = Slicer(str(tmp_path), enable_cross_file=False)
+        plain = Slicer(str(tmp_path), enable_cross_file=False)
+        plain.summaries = None
+
+        first = memoized.slice("mod.py", 10, "z", SliceDirection.BACKWARD)
+        TreeFormatter.format(first)
+        for node in first.backward_slice:
+            node.context = "changed"
+            node.dependencies.append("changed")
+        hits = memoized.summaries.hits
+
+        second = memoized.slice("mod.py", 9, "y", SliceDirection.BACKWARD)
+        assert memoized.summaries.hits > hits
+        assert second == plain.slice("mod.py", 9, "y", SliceDirection.BACKWARD)
+
+    def test_summaries_are_dropped_with_the_ast(self):
+        """Test summaries do not outlive the function definition they describe."""
+        cache = SummaryCache()
+        tree = ast.parse(SOURCE)
+        func_def = tree.body[0]
+        summary = summarize(func_def, [], {"value"})
+        cache.store(func_def, SliceDirection.FORWARD, frozenset({"value"}), summary)
+        assert cache.get(func_def, SliceDirection.FORWARD, frozenset({"value"})) is not None
+        assert cache.get(func_def, SliceDirection.BACKWARD, frozenset({"value"})) is None
+
+        del tree, func_def, summary
+        gc.collect()
+        assert len(cache) == 0
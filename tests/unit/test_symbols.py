@@ -0,0 +1,111 @@
+"""Unit tests for flowslice.core.symbols."""
+
+import ast
+
+from flowslice.core.cache import ParseCache
+from flowslice.core.models import SliceDirection
+from flowslice.core.slicer import Slicer
+from flowslice.core.symbols import ASYNC_FUNCTION, CLASS, FUNCTION, SymbolTable, get_symbol_table
+
+SOURCE = """\
+def helper(value):
+    doubled = value * 2
+    return doubled
+
+
+class Reader:
+    def helper(self, value):
+        scaled = value * 100
+        return scaled
+
+    class Options:
+        def helper(self):
+            pass
+
+
+class Writer:
+    async def helper(self, value):
+        return value
+
+
+def outer():
+    def inner(x):
+        return x
+    return inner
+
+
+def main(a):
+    b = helper(a)
+    return b
+"""
+
+
+class TestSymbolTable:
+    """Test building and querying symbol tables."""
+
+    def test_qualified_names(self):
+        """Test methods, nested classes and nested functions get qualified names."""
+        table = SymbolTable.build(ast.parse(SOURCE))
+
+        assert list(table) == [
+            "helper",
+            "Reader",
+            "Reader.helper",
+            "Reader.Options",
+            "Reader.Options.helper",
+            "Writer",
+            "Writer.helper",
+            "outer",
+            "outer.<locals>.inner",
+            "main",
+        ]
+        assert table["Reader"].kind == CLASS
+        assert table["Writer.helper"].kind == ASYNC_FUNCTION
+        assert table["Reader.helper"] == ("Reader.helper", 7, FUNCTION)
+
+    def test_duplicate_names_resolve_to_the_right_definition(self):
+        """Test same-named methods of different classes are kept apart."""
+        table = SymbolTable.build(ast.parse(SOURCE))
+
+        assert table.function("Reader.helper").lineno == 7
+        assert table.function("Writer.helper").lineno == 17
+        assert table.function("Reader") is None
+        # Bare calls never resolve to methods
+        assert table.resolve_call("helper").lineno == 1
+        assert table.resolve_call("inner").lineno == 22
+        assert table.resolve_call("missing") is None
+
+    def test_facts_round_trip_with_lazy_nodes(self):
+        """Test a table rebuilt from facts only parses the module when a node is needed."""
+        tree = ast.parse(SOURCE)
+        loads = []
+        table = SymbolTable.from_facts(
+            SymbolTable.build(tree).to_facts(), lambda: loads.append(1) or tree
+        )
+
+        assert "Reader.Options.helper" in table
+        assert not loads
+        assert table.function("Reader.Options.helper").lineno == 12
+        assert table.resolve_call("main").name == "main"
+        assert loads == [1]
+
+    def test_table_is_cached_with_the_entry(self, tmp_path):
+        """Test the table is built once per cache entry."""
+        path = tmp_path / "mod.py"
+        path.write_text(SOURCE)
+        entry = ParseCache().get_entry(path)
+
+        assert get_symbol_table(entry) is get_symbol_table(entry)
+        assert entry.facts["symbols"]["callables"]["helper"] == "helper"
+
+
+def test_local_call_ignores_same_named_method(tmp_path):
+    """Test a call to a module-level function is not followed into a method of that name."""
+    (tmp_path / "mod.py").write_text(SOURCE)
+    slicer = Slicer(str(tmp_path), enable_cross_file=False)
+
+    result = slicer.slice("mod.py", 29, "b", SliceDirection.BACKWARD)
+
+    lines = {node.line for node in result.backward_slice}
+    assert 2 in lines
+    assert 8 not in lines